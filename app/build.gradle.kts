@@ -35,7 +35,8 @@ android {
     }
 
     androidResources {
-        ignoreAssetsPattern = "!.svn:!.git:!.ds_store:!*.scc:.*:!CVS:!thumbs.db:!picasa.ini:!*~"
+        // *_saved_model: Quelle für die Quantisierung (ml_training/quantize_model.py --auto), nicht ins APK
+        ignoreAssetsPattern = "!.svn:!.git:!.ds_store:!*.scc:.*:!CVS:!thumbs.db:!picasa.ini:!*~:<dir>*_saved_model"
     }
 
     defaultConfig {
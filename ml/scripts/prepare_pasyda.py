@@ -9,8 +9,14 @@ Lädt den PASYDA-Datensatz (Perverted-Justice Archive),
 import pandas as pd
 import json
 import os
+import sys
 from pathlib import Path
 
+# Gemeinsamer Übersetzungs-Cache aus training/
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'training'))
+from translation_cache import TranslationCache
+from translation_engine import TranslationEngine, GoogleBackend
+
 print("=" * 60)
 print("📥 PASYDA Dataset Integration")
 print("=" * 60)
@@ -109,27 +115,26 @@ def map_to_grooming_stages(text):
 
     return 'STAGE_SAFE'
 
-def translate_batch(texts, max_batch=50):
-    """Übersetzt Texte nach Deutsch (mit Rate Limiting)"""
+def translate_batch(texts, max_batch=20, max_workers=4):
+    """Übersetzt Texte nach Deutsch (parallel, max_batch Texte pro Request, mit Rate Limiting)"""
     print("2️⃣  Übersetze nach Deutsch (kann einige Minuten dauern)...")
 
-    translator = GoogleTranslator(source='en', target='de')
-    translated = []
-
-    for i in tqdm(range(0, len(texts), max_batch), desc="🌐 Übersetzung"):
-        batch = texts[i:i+max_batch]
-        for text in batch:
-            try:
-                if pd.notna(text) and len(str(text).strip()) > 0:
-                    trans = translator.translate(str(text)[:500])  # Max 500 Zeichen
-                    translated.append(trans)
-                else:
-                    translated.append(text)
-            except Exception as e:
-                # Bei Fehler: Original behalten
-                translated.append(text)
-
-    return translated
+    valid = [pd.notna(text) and len(str(text).strip()) > 0 for text in texts]
+    sources = [str(text)[:500] for text, ok in zip(texts, valid) if ok]  # Max 500 Zeichen
+
+    with TranslationCache() as cache:
+        engine = TranslationEngine(GoogleBackend('en', 'de'), cache,
+                                   max_workers=max_workers, batch_size=max_batch)
+
+        with tqdm(total=len(sources), desc="🌐 Übersetzung") as progress:
+            # Bei Fehler (None): Original (gekürzt) behalten
+            translated = engine.translate_many(sources, progress=progress.update)
+            translations = iter(source if german is None else german
+                                for source, german in zip(sources, translated))
+
+        cache.print_stats()
+
+    return [next(translations) if ok else text for text, ok in zip(texts, valid)]
 
 def prepare_training_data(df, translate=True):
     """Bereitet PASYDA-Daten für Training vor"""
@@ -61,8 +61,8 @@ echo "6️⃣  STARTE TRAINING..."
 echo "================================================"
 echo ""
 
-cd scripts
-python3 train_grooming_detection.py
+# Trainer-Konfiguration (training/configs/grooming_stages.json) nutzt Pfade ab Repo-Root
+(cd .. && python3 ml/scripts/train_grooming_detection.py)
 
 # 8. Zeige Ergebnis
 echo ""
@@ -71,13 +71,13 @@ echo "✅ TRAINING ABGESCHLOSSEN!"
 echo "================================================"
 echo ""
 echo "📦 Output-Dateien:"
-ls -lh ../models/grooming_detector.tflite 2>/dev/null || echo "⚠️  Model nicht gefunden"
-ls -lh ../models/grooming_detector_metadata.json 2>/dev/null || echo "⚠️  Metadata nicht gefunden"
+ls -lh models/grooming_stages/grooming_detector.tflite 2>/dev/null || echo "⚠️  Model nicht gefunden"
+ls -lh models/grooming_stages/metadata.json 2>/dev/null || echo "⚠️  Metadata nicht gefunden"
 
 echo ""
 echo "🚀 Nächste Schritte:"
 echo "   1. Kopiere Model in Android App:"
-echo "      cp models/grooming_detector.tflite ../app/src/main/assets/"
+echo "      cp -r models/grooming_stages/grooming_detector.tflite models/grooming_stages/grooming_detector_saved_model ../app/src/main/assets/"
 echo ""
 echo "   2. Teste auf Pixel 10:"
 echo "      ./gradlew assembleDebug && adb install app/build/outputs/apk/debug/app-debug.apk"
@@ -7,50 +7,98 @@ Basierend auf Basani et al. 2025 Paper:
 - Model-Größe: ~4MB → ~1MB
 - Accuracy-Verlust: < 1%
 
-Performance:
-- Vorher: ~100ms Inference
-- Nachher: ~25ms Inference (4x faster!)
+Performance: gemessen statt geschätzt - --auto misst jede Variante, für
+alle Assets siehe training/tflite_benchmark.py (p50/p95/p99, RSS, Ladezeit).
+
+Kalibrierung: echte Nachrichten aus dem Trainingskorpus (geschichtet nach
+Label), tokenisiert mit dem word_index des Modells (training/calibration.py).
+Ohne --corpus dienen die typischen Grooming-Phrasen als Kalibrierungs-Daten.
+
+--auto: jedes .tflite in app/src/main/assets mit SavedModel daneben
+(<name>_saved_model/, vom Export mit abgelegt) wird als INT8-, float16- und
+Dynamic-Range-Variante neu erzeugt. Referenz ist eine unoptimierte
+float32-Konvertierung desselben SavedModels (das exportierte .tflite ist je
+nach Trainer schon quantisiert); Größe, Interpreter-Latenz und
+Übereinstimmung relativ dazu landen in quantization_report.json.
 
 Usage:
-    python quantize_model.py --input model.tflite --output model_quantized.tflite
+    python quantize_model.py --input saved_model/ --output model_quantized.tflite \
+        --metadata metadata.json --corpus ../training/data/pan12_train.json
+    python quantize_model.py --auto --corpus ../training/data/pan12_train.json
 """
 
 import argparse
+import json
+import multiprocessing
+import sys
 import tensorflow as tf
 import numpy as np
 import os
+import tempfile
 from pathlib import Path
 
+# Calibration-Set-Builder, App-Tokenizer, SavedModel-Konvention + Latenz-Messung aus training/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'training'))
+from calibration import (DEFAULT_CALIBRATION_SAMPLES, build_calibration_set, encode_messages,
+                         load_model_vocabulary, representative_dataset)
+from model_export import saved_model_dir
+from tflite_benchmark import model_metadata_path, tflite_latency_ms
+
+ASSETS_DIR = Path(__file__).resolve().parents[1] / 'app' / 'src' / 'main' / 'assets'
+
+
+# Varianten, die --auto aus jedem SavedModel erzeugt (Dateiname: <stem>_<variante>.tflite)
+VARIANTS = ('int8', 'float16', 'dynamic')
+# Unoptimierte Konvertierung als Vergleichsbasis (wird nicht in die Assets geschrieben)
+REFERENCE_VARIANT = 'float32'
+
+
+def size_mb(path) -> float:
+    """Größe einer Datei oder eines Verzeichnisses (SavedModel) in MB"""
+    path = Path(path)
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob('*') if f.is_file()) / (1024 * 1024)
+    return path.stat().st_size / (1024 * 1024)
+
 
-def quantize_model(input_path: str, output_path: str, representative_dataset=None):
+def quantize_model(input_path: str, output_path: str, representative_dataset=None, variant: str = 'int8'):
     """
-    Quantisiert TFLite-Modell zu INT8
+    Quantisiert ein SavedModel zu TFLite
 
     Args:
-        input_path: Pfad zum Original-.tflite-Modell
+        input_path: Pfad zum SavedModel-Verzeichnis
         output_path: Pfad für quantisiertes Modell
-        representative_dataset: Optional - Repräsentative Daten für bessere Quantisierung
+        representative_dataset: Repräsentative Daten (nötig für int8)
+        variant: int8 (Gewichte + Aktivierungen) | float16 | dynamic (nur Gewichte int8)
+            | float32 (ohne Optimierung, Referenz)
     """
 
-    print(f"🔧 Starte Quantisierung von: {input_path}")
+    print(f"🔧 Starte Konvertierung ({variant}) von: {input_path}")
 
-    # Lade TFLite Modell
+    # Lade SavedModel
     if not os.path.exists(input_path):
         print(f"❌ Modell nicht gefunden: {input_path}")
         return False
+    if variant not in VARIANTS + (REFERENCE_VARIANT,):
+        print(f"❌ Unbekannte Variante: {variant} ({' | '.join(VARIANTS + (REFERENCE_VARIANT,))})")
+        return False
 
     # Converter initialisieren
     converter = tf.lite.TFLiteConverter.from_saved_model(input_path)
 
-    # INT8 Quantization aktivieren
-    converter.optimizations = [tf.lite.Optimize.DEFAULT]
-
-    # Für noch bessere Quantisierung: Representative Dataset nutzen
-    if representative_dataset is not None:
+    # Quantization aktivieren (dynamic: nur das; float32: keine Optimierung)
+    if variant != REFERENCE_VARIANT:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if variant == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == 'int8':
+        # Aktivierungs-Skalen aus dem Representative Dataset
+        if representative_dataset is None:
+            print("❌ INT8 braucht ein Representative Dataset")
+            return False
         converter.representative_dataset = representative_dataset
-
-    # Target: INT8
-    converter.target_spec.supported_types = [tf.int8]
+        converter.target_spec.supported_types = [tf.int8]
 
     # Quantisiere!
     try:
@@ -60,15 +108,9 @@ def quantize_model(input_path: str, output_path: str, representative_dataset=Non
         with open(output_path, 'wb') as f:
             f.write(quantized_model)
 
-        # Statistiken
-        original_size = os.path.getsize(input_path) / (1024 * 1024)  # MB
-        quantized_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
-        compression_ratio = original_size / quantized_size
-
-        print(f"✅ Quantisierung erfolgreich!")
-        print(f"   Original:    {original_size:.2f} MB")
-        print(f"   Quantisiert: {quantized_size:.2f} MB")
-        print(f"   Kompression: {compression_ratio:.1f}x kleiner")
+        # Vergleich mit der float32-Referenz: siehe main() bzw. --auto
+        print(f"✅ Konvertierung erfolgreich!")
+        print(f"   Größe:       {size_mb(output_path):.2f} MB")
         print(f"   Gespeichert: {output_path}")
 
         return True
@@ -78,14 +120,25 @@ def quantize_model(input_path: str, output_path: str, representative_dataset=Non
         return False
 
 
-def create_representative_dataset(vocab_file: str = None):
+def create_representative_dataset(metadata_path: str, corpus_path: str = None,
+                                  samples: int = DEFAULT_CALIBRATION_SAMPLES, seed: int = 42):
     """
     Erstellt representative Dataset für bessere Quantisierung
 
-    Nutzt typische Grooming-Phrasen als Kalibrierungs-Daten
+    Args:
+        metadata_path: Modell-Metadata mit word_index + max_length
+        corpus_path: Trainingskorpus (JSON mit text/label) - geschichtete Stichprobe
+        samples: Anzahl Kalibrierungs-Nachrichten
+        seed: Seed der Stichprobe
+
+    Returns: (Generator-Funktion, Samples float32 [n, max_length])
     """
 
-    # Typische Grooming-Phrasen (Deutsch + Englisch)
+    if corpus_path is not None:
+        calibration, _ = build_calibration_set(corpus_path, metadata_path, size=samples, seed=seed)
+        return representative_dataset(calibration), calibration
+
+    # Ohne Korpus: typische Grooming-Phrasen (Deutsch + Englisch)
     representative_texts = [
         "bist du allein?",
         "wo sind deine eltern?",
@@ -109,62 +162,204 @@ def create_representative_dataset(vocab_file: str = None):
         "just between us",
     ]
 
-    def representative_data_gen():
-        for text in representative_texts:
-            # Tokenize (vereinfacht - müsste mit echtem Tokenizer gemacht werden)
-            # Für Demo: Zufällige Vektoren in der richtigen Shape
-            yield [np.random.rand(1, 128).astype(np.float32)]
+    print("⚠️  Kein Korpus angegeben - kalibriere mit Grooming-Phrasen")
+    word_index, max_length = load_model_vocabulary(metadata_path)
+    calibration = encode_messages(representative_texts, word_index, max_length).astype(np.float32)
+    return representative_dataset(calibration), calibration
+
 
-    return representative_data_gen
+def tflite_predictions(tflite_path: str, samples: np.ndarray) -> np.ndarray:
+    """argmax-Vorhersagen eines .tflite (quantisierte Eingaben werden skaliert)"""
+    interpreter = tf.lite.Interpreter(model_path=tflite_path)
+    interpreter.allocate_tensors()
+    input_details = interpreter.get_input_details()[0]
+    output_details = interpreter.get_output_details()[0]
 
+    predictions = []
+    for sample in samples:
+        batch = sample[None, :].astype(np.float32)
+        scale, zero_point = input_details['quantization']
+        if input_details['dtype'] != np.float32:
+            batch = np.round(batch / scale + zero_point).astype(input_details['dtype'])
+        interpreter.set_tensor(input_details['index'], batch)
+        interpreter.invoke()
+        predictions.append(int(np.argmax(interpreter.get_tensor(output_details['index']))))
+    return np.array(predictions)
 
-def quantize_kidguard_model():
+
+def prediction_agreement(reference_path: str, tflite_path: str, samples: np.ndarray) -> float:
+    """Anteil gleicher argmax-Vorhersagen von float32-Referenz und quantisiertem Modell"""
+    return float(np.mean(tflite_predictions(reference_path, samples) ==
+                         tflite_predictions(tflite_path, samples)))
+
+
+def _quantize_worker(input_path: str, output_path: str, variant: str, calibration):
+    """Prozess-Einstieg für quantize_isolated"""
+    rep_dataset = representative_dataset(calibration) if calibration is not None else None
+    sys.exit(0 if quantize_model(input_path, output_path, rep_dataset, variant) else 1)
+
+
+def quantize_isolated(input_path: str, output_path: str, variant: str, calibration=None):
     """
-    Quantisiert das KidGuard-Modell
+    quantize_model in einem eigenen Prozess
+
+    Der Konverter kann nativ abstürzen (z.B. Segfault bei der INT8-Kalibrierung
+    maskierter LSTMs) - das beendet dann nur diese Variante, nicht den Lauf.
 
-    Sucht automatisch nach .tflite-Dateien im Projekt
+    Returns: Fehlermeldung oder None
     """
+    process = multiprocessing.get_context('spawn').Process(
+        target=_quantize_worker, args=(input_path, output_path, variant, calibration)
+    )
+    process.start()
+    process.join()
+    if process.exitcode == 0:
+        return None
+    if process.exitcode < 0:
+        return f"Konverter abgestürzt (Signal {-process.exitcode})"
+    return "Konvertierung fehlgeschlagen"
 
-    # Suche nach Modell
-    project_root = Path(__file__).parent.parent
-    model_paths = list(project_root.rglob("*.tflite"))
 
-    if not model_paths:
-        print("❌ Kein .tflite-Modell gefunden!")
-        print("   Suche in:", project_root)
-        return False
+def measure_variant(path, samples: np.ndarray, agreement_samples, runs: int, threads: int,
+                    reference=None):
+    """
+    Größe, Interpreter-Latenz (Median, eine Nachricht) und - mit reference -
+    Verhältnis + Übereinstimmung zur float32-Referenz
+
+    Args:
+        reference: (Messwerte, Vorhersagen) der Referenz aus einem früheren Aufruf
+
+    Returns: (Messwerte, argmax-Vorhersagen auf agreement_samples oder None)
+    """
+    result = {
+        'path': str(path),
+        'size_mb': round(size_mb(path), 3),
+        'latency_ms': round(tflite_latency_ms(str(path), samples, runs=runs, threads=threads), 3),
+    }
+    predictions = tflite_predictions(str(path), agreement_samples) if agreement_samples is not None else None
+
+    if reference is not None:
+        reference_result, reference_predictions = reference
+        result['size_ratio'] = round(reference_result['size_mb'] / result['size_mb'], 2)
+        result['speedup'] = round(reference_result['latency_ms'] / result['latency_ms'], 2)
+        if predictions is not None:
+            result['agreement'] = round(float(np.mean(predictions == reference_predictions)), 4)
+    return result, predictions
+
+
+def print_variant_table(variants: dict):
+    print(f"\n   {'Variante':10s} {'Größe':>10s} {'vs float32':>11s} {'Latenz (Median)':>16s} "
+          f"{'Speedup':>8s} {'Übereinstimmung':>16s}")
+    for name, result in variants.items():
+        if 'error' in result:
+            print(f"   {name:10s} ❌ {result['error']}")
+            continue
+        agreement = f"{result['agreement'] * 100:.1f}%" if 'agreement' in result else '-'
+        print(f"   {name:10s} {result['size_mb']:7.2f} MB {result['size_ratio']:9.1f}x "
+              f"{result['latency_ms']:13.3f} ms {result['speedup']:7.2f}x {agreement:>16s}")
+
+
+def quantize_kidguard_model(models_dir=None, corpus_path: str = None,
+                            samples: int = DEFAULT_CALIBRATION_SAMPLES, seed: int = 42,
+                            latency_runs: int = 50, threads: int = 1):
+    """
+    Quantisiert die KidGuard-Modelle
+
+    Für jedes .tflite in models_dir (Default: app/src/main/assets) mit einem
+    SavedModel daneben (<stem>_saved_model/) werden die Varianten
+    <stem>_int8/_float16/_dynamic.tflite neu erzeugt. Gemessen wird alles -
+    auch das exportierte .tflite (Zeile 'export') - gegen eine unoptimierte
+    float32-Konvertierung des SavedModels (Zeile 'float32', temporär).
+    Bericht: <models_dir>/quantization_report.json
+
+    Returns: Bericht pro Modell
+    """
 
-    # Filtere bereits quantisierte Modelle aus
-    model_paths = [p for p in model_paths if "quantized" not in p.name.lower()]
+    models_dir = Path(models_dir) if models_dir else ASSETS_DIR
+    model_paths = sorted(models_dir.glob("*.tflite"))
+
+    # Varianten eines früheren Laufs nicht erneut quantisieren
+    model_paths = [p for p in model_paths
+                   if "quantized" not in p.name.lower()
+                   and not any(p.stem.endswith(f"_{variant}") for variant in VARIANTS + (REFERENCE_VARIANT,))]
 
     if not model_paths:
-        print("ℹ️  Alle Modelle sind bereits quantisiert")
-        return True
+        print("❌ Kein .tflite-Modell gefunden!")
+        print("   Suche in:", models_dir)
+        return []
 
     print(f"📦 Gefundene Modelle: {len(model_paths)}")
 
-    success_count = 0
+    reports = []
     for model_path in model_paths:
         print(f"\n{'='*60}")
         print(f"Verarbeite: {model_path.name}")
         print(f"{'='*60}")
 
-        # Output-Pfad
-        output_path = model_path.parent / f"{model_path.stem}_quantized.tflite"
-
-        # Quantisiere
-        # Note: Für echte Quantisierung müsste man das SavedModel-Format haben
-        # TFLite → TFLite Quantisierung ist komplexer
-        print("ℹ️  Hinweis: Für beste Ergebnisse sollte das Modell als SavedModel vorliegen")
-        print("   Alternativ: Model neu trainieren mit Quantization-Aware Training")
-
-        # Hier würde die echte Quantisierung stattfinden
-        # success = quantize_model(str(model_path), str(output_path))
-
-        print(f"ℹ️  Für echte Quantisierung verwende:")
-        print(f"   python quantize_model.py --input <saved_model_dir> --output {output_path}")
-
-    return True
+        saved_model = Path(saved_model_dir(str(model_path)))
+        if not saved_model.is_dir():
+            print(f"⚠️  Kein SavedModel ({saved_model.name}) - übersprungen")
+            print("   Modell neu exportieren: Trainer (export.saved_model) und ml/scripts")
+            print("   legen das SavedModel neben dem .tflite ab")
+            reports.append({'model': str(model_path), 'skipped': 'kein SavedModel'})
+            continue
+
+        # Kalibrierung (int8) + Übereinstimmung: echte Nachrichten mit dem word_index des Modells
+        metadata = model_metadata_path(model_path)
+        calibration = None
+        if metadata is not None:
+            _, calibration = create_representative_dataset(str(metadata), corpus_path, samples=samples, seed=seed)
+        else:
+            print("⚠️  Keine Metadata (word_index) - INT8 übersprungen, Latenz mit Padding-Eingabe")
+
+        interpreter = tf.lite.Interpreter(model_path=str(model_path))
+        input_length = int(interpreter.get_input_details()[0]['shape'][1])
+        latency_samples = calibration if calibration is not None else np.zeros((1, input_length), np.float32)
+
+        # float32-Referenz: nur temporär, gehört nicht in die App-Assets
+        with tempfile.TemporaryDirectory() as tmp:
+            reference_path = Path(tmp) / f"{model_path.stem}_{REFERENCE_VARIANT}.tflite"
+            error = quantize_isolated(str(saved_model), str(reference_path), REFERENCE_VARIANT)
+            if error is not None:
+                print(f"❌ float32-Referenz: {error} - übersprungen")
+                reports.append({'model': str(model_path), 'skipped': f'float32-Referenz: {error}'})
+                continue
+            reference = measure_variant(reference_path, latency_samples, calibration, latency_runs, threads)
+
+        reference_result = dict(reference[0], path=None, size_ratio=1.0, speedup=1.0)
+        if calibration is not None:
+            reference_result['agreement'] = 1.0
+        variants = {REFERENCE_VARIANT: reference_result,
+                    'export': measure_variant(model_path, latency_samples, calibration,
+                                              latency_runs, threads, reference)[0]}
+        for variant in VARIANTS:
+            output_path = model_path.with_name(f"{model_path.stem}_{variant}.tflite")
+            output_path.unlink(missing_ok=True)
+            if variant == 'int8' and calibration is None:
+                variants[variant] = {'error': 'keine Metadata für die Kalibrierung'}
+                continue
+
+            error = quantize_isolated(str(saved_model), str(output_path), variant,
+                                      calibration if variant == 'int8' else None)
+            if error is not None:
+                variants[variant] = {'error': error}
+                continue
+            variants[variant] = measure_variant(output_path, latency_samples, calibration,
+                                                latency_runs, threads, reference)[0]
+
+        print(f"\n📊 {model_path.name} ({latency_runs} Läufe, {threads} Thread(s); "
+              f"export = {model_path.name} wie vom Trainer exportiert):")
+        print_variant_table(variants)
+        reports.append({'model': str(model_path), 'saved_model': str(saved_model),
+                        'calibration_samples': 0 if calibration is None else len(calibration),
+                        'variants': variants})
+
+    report_path = models_dir / "quantization_report.json"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'latency_runs': latency_runs, 'threads': threads, 'models': reports}, f, indent=2)
+    print(f"\n📁 Bericht: {report_path}")
+
+    return reports
 
 
 def main():
@@ -185,33 +380,94 @@ def main():
     parser.add_argument(
         "--auto",
         action="store_true",
-        help="Automatisch alle Modelle im Projekt quantisieren"
+        help="INT8/float16/Dynamic-Varianten aller Modelle mit SavedModel neu erzeugen"
+    )
+    parser.add_argument(
+        "--models-dir",
+        type=str,
+        default=str(ASSETS_DIR),
+        help="Verzeichnis für --auto (Default: app/src/main/assets)"
+    )
+    parser.add_argument(
+        "--metadata",
+        type=str,
+        help="Modell-Metadata mit word_index + max_length (Tokenisierung der Kalibrierung)"
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        help="Trainingskorpus (JSON mit text/label) für das Calibration Set"
+    )
+    parser.add_argument(
+        "--calibration-samples",
+        type=int,
+        default=DEFAULT_CALIBRATION_SAMPLES,
+        help=f"Anzahl Kalibrierungs-Nachrichten (Default: {DEFAULT_CALIBRATION_SAMPLES})"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Seed der geschichteten Stichprobe"
+    )
+    parser.add_argument(
+        "--variant",
+        choices=VARIANTS,
+        default="int8",
+        help="Variante für --input (Default: int8)"
+    )
+    parser.add_argument(
+        "--latency-runs",
+        type=int,
+        default=50,
+        help="Interpreter-Läufe pro Variante für die Latenz (--auto)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Interpreter-Threads für die Latenz (wie auf dem Gerät, Default: 1)"
     )
 
     args = parser.parse_args()
 
     if args.auto:
-        quantize_kidguard_model()
+        quantize_kidguard_model(args.models_dir, args.corpus, samples=args.calibration_samples,
+                                seed=args.seed, latency_runs=args.latency_runs, threads=args.threads)
     elif args.input:
-        # Representative Dataset erstellen
-        rep_dataset = create_representative_dataset()
-
-        # Quantisiere
-        quantize_model(args.input, args.output, rep_dataset)
+        if not args.metadata:
+            parser.error("--input braucht --metadata (word_index des Modells für die Kalibrierung)")
+
+        # Representative Dataset aus echten Nachrichten erstellen
+        rep_dataset, calibration = create_representative_dataset(
+            args.metadata, args.corpus, samples=args.calibration_samples, seed=args.seed
+        )
+
+        # Quantisiere + unoptimierte float32-Konvertierung als Vergleichsbasis
+        if quantize_model(args.input, args.output, rep_dataset, args.variant):
+            with tempfile.TemporaryDirectory() as tmp:
+                reference_path = os.path.join(tmp, f"reference_{REFERENCE_VARIANT}.tflite")
+                if quantize_model(args.input, reference_path, variant=REFERENCE_VARIANT):
+                    agreement = prediction_agreement(reference_path, args.output, calibration)
+                    print(f"\n   vs float32:  {size_mb(reference_path):.2f} MB → {size_mb(args.output):.2f} MB "
+                          f"({size_mb(reference_path) / size_mb(args.output):.1f}x kleiner)")
+                    print(f"   Übereinstimmung mit float32: {agreement * 100:.1f}% "
+                          f"({len(calibration)} Kalibrierungs-Nachrichten)")
     else:
         parser.print_help()
         print("\n" + "="*60)
         print("QUICK START:")
         print("="*60)
-        print("1. Automatisch alle Modelle finden:")
-        print("   python quantize_model.py --auto")
+        print("1. Alle Modelle in app/src/main/assets (INT8, float16, dynamic):")
+        print("   python quantize_model.py --auto --corpus train.json")
         print()
         print("2. Spezifisches Modell quantisieren:")
-        print("   python quantize_model.py --input model/ --output quantized.tflite")
+        print("   python quantize_model.py --input model/ --output quantized.tflite \\")
+        print("       --metadata metadata.json --corpus train.json")
         print()
         print("3. Für KidGuard-Modell:")
-        print("   - Modell muss als SavedModel-Format vorliegen")
-        print("   - Oder: Training mit Quantization-Aware Training neu machen")
+        print("   - SavedModel liegt neben dem .tflite (<name>_saved_model/)")
+        print("   - Trainer und ml/scripts legen es beim Export automatisch an")
         print("="*60)
 
 
@@ -4,86 +4,262 @@
 KidGuard Data Augmentation - Grooming-Klassen erweitern
 Ziel: 150+ Samples pro Grooming-Klasse
 """
+import argparse
 import json
+import os
 import random
-import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, count, islice
 from pathlib import Path
 from collections import Counter
 from tqdm import tqdm
 
-try:
-    from deep_translator import GoogleTranslator
-    TRANSLATOR_AVAILABLE = True
-except ImportError:
-    TRANSLATOR_AVAILABLE = False
+from jsonl_dataset import iter_records, write_records, is_jsonl, JsonlWriter, shuffle_buffer
+from translation_cache import TranslationCache
+from translation_engine import TranslationEngine, GoogleBackend, TRANSLATOR_AVAILABLE
+
+if not TRANSLATOR_AVAILABLE:
     print("⚠️  deep-translator nicht installiert")
     print("   pip install deep-translator")
 
 random.seed(42)
 
+# Samples pro Worker-Task (jeder Task hat einen eigenen, festen Seed)
+AUGMENT_CHUNK = 1000
+
+# Deutsche Synonyme für Grooming-Kontext
+SYNONYMS = {
+    'allein': ['alleine', 'solo', 'für dich', 'ganz allein'],
+    'bild': ['foto', 'pic', 'selfie', 'bild von dir'],
+    'schicken': ['senden', 'zeigen', 'geben', 'schicke mir'],
+    'geheimnis': ['secret', 'zwischen uns', 'privat', 'nur für uns'],
+    'geschenk': ['präsent', 'überraschung', 'belohnung'],
+    'reif': ['erwachsen', 'mature', 'älter'],
+    'verstehen': ['kapieren', 'checken', 'nachvollziehen'],
+    'besonders': ['speziell', 'einzigartig', 'anders']
+}
+
+
+def has_synonym_tokens(text, synonyms=SYNONYMS):
+    """True, wenn synonym_replace den Text verändert"""
+    return any(w in synonyms for w in text.lower().split())
+
+
+def synonym_replace(text, rng=random, synonyms=SYNONYMS):
+    """Ersetzt max. 2 Wörter durch Synonyme (rng: random.Random oder random-Modul)"""
+    words = text.lower().split()
+    indices = [i for i, w in enumerate(words) if w in synonyms]
+
+    if not indices:
+        return text
+
+    for idx in rng.sample(indices, min(2, len(indices))):
+        words[idx] = rng.choice(synonyms[words[idx]])
+
+    return ' '.join(words)
+
+
+def task_seed(seed, label, task_id):
+    """Deterministischer Seed pro (Label, Task) - unabhängig von der Worker-Zahl"""
+    return zlib.crc32(f"{seed}:{label}:{task_id}".encode('utf-8'))
+
+
+# Samples der Worker-Prozesse (per initializer, nicht pro Task gepickelt)
+_worker_samples = None
+_worker_eligible = None
+
+
+def _init_worker(samples, eligible):
+    global _worker_samples, _worker_eligible
+    _worker_samples = samples
+    _worker_eligible = eligible
+
+
+def _augment_task(task):
+    """
+    Erzeugt n Augmentierungs-Pläne mit eigenem RNG
+
+    Returns: Liste von (index, method, text, fallback)
+        - 'syn': text = Synonym-Variante von samples[index]
+        - 'back': text = None (Back-Translation macht der Hauptprozess),
+          fallback = (index, text) als Synonym-Ersatz, falls sie scheitert
+    """
+    n, seed, use_back = task
+    rng = random.Random(seed)
+    samples, eligible = _worker_samples, _worker_eligible
+
+    def synonym_variant():
+        if not eligible:
+            return None
+        index = rng.choice(eligible)
+        return index, synonym_replace(samples[index]['text'], rng)
+
+    plans = []
+    for _ in range(n):
+        method = rng.choice(['back', 'syn', 'syn'])  # 2/3 Synonym, 1/3 Back-Translation
+
+        if method == 'back' and use_back:
+            plans.append((rng.randrange(len(samples)), 'back', None, synonym_variant()))
+        else:
+            variant = synonym_variant()
+            if variant is not None:
+                plans.append((variant[0], 'syn', variant[1], None))
+
+    return plans
+
 
 class DataAugmenter:
     """Data Augmentation für unbalanciertes Grooming-Dataset"""
 
-    def __init__(self):
-        self.de_en = GoogleTranslator(source='de', target='en') if TRANSLATOR_AVAILABLE else None
-        self.en_de = GoogleTranslator(source='en', target='de') if TRANSLATOR_AVAILABLE else None
+    def __init__(self, cache: TranslationCache = None, workers: int = None, seed: int = 42):
+        """
+        Args:
+            cache: Übersetzungs-Cache
+            workers: Prozesse für die Augmentation (Default: alle CPUs)
+            seed: Basis-Seed; jeder Task bekommt daraus einen eigenen
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.cache = cache if cache is not None else TranslationCache()  # gemeinsam mit translate_dataset.py
+        # Rate-Limit (Token-Bucket) + Retry statt fixer Pause pro Request
+        self.de_en = TranslationEngine(GoogleBackend('de', 'en'), self.cache) if TRANSLATOR_AVAILABLE else None
+        self.en_de = TranslationEngine(GoogleBackend('en', 'de'), self.cache) if TRANSLATOR_AVAILABLE else None
 
         # Deutsche Synonyme für Grooming-Kontext
-        self.synonyms = {
-            'allein': ['alleine', 'solo', 'für dich', 'ganz allein'],
-            'bild': ['foto', 'pic', 'selfie', 'bild von dir'],
-            'schicken': ['senden', 'zeigen', 'geben', 'schicke mir'],
-            'geheimnis': ['secret', 'zwischen uns', 'privat', 'nur für uns'],
-            'geschenk': ['präsent', 'überraschung', 'belohnung'],
-            'reif': ['erwachsen', 'mature', 'älter'],
-            'verstehen': ['kapieren', 'checken', 'nachvollziehen'],
-            'besonders': ['speziell', 'einzigartig', 'anders']
-        }
+        self.synonyms = SYNONYMS
 
     def back_translate(self, text):
         """Back-Translation: DE → EN → DE"""
         if not TRANSLATOR_AVAILABLE:
             return text
 
-        try:
-            time.sleep(0.5)
-            en_text = self.de_en.translate(text)
-            time.sleep(0.5)
-            de_text = self.en_de.translate(en_text)
-            return de_text
-        except Exception as e:
-            print(f"\n⚠️  Back-Translation Fehler: {str(e)}")
+        # Cache-Treffer kosten keinen Request; Fehler → Original
+        en_text = self.de_en.translate(text)
+        if en_text is None or en_text is text:
             return text
+        de_text = self.en_de.translate(en_text)
+        return text if de_text is None else de_text
+
+    def back_translate_many(self, texts):
+        """Back-Translation für viele Texte (parallel + gebatcht über die Engine)"""
+        if not TRANSLATOR_AVAILABLE or not texts:
+            return list(texts)
+
+        en_texts = self.de_en.translate_many(texts)
+        # Nur erfolgreich übersetzte Texte zurückübersetzen (None = Fehler → Original)
+        translated = [en is not None and en is not text for text, en in zip(texts, en_texts)]
+        round_trip = [en for en, ok in zip(en_texts, translated) if ok]
+        de_texts = iter(self.en_de.translate_many(round_trip))
+        results = [next(de_texts) if ok else None for ok in translated]
+        return [text if de is None else de for text, de in zip(texts, results)]
 
     def synonym_replace(self, text):
         """Ersetzt Wörter durch Synonyme"""
-        words = text.lower().split()
-        indices = [i for i, w in enumerate(words) if w in self.synonyms]
-
-        if not indices:
-            return text
-
-        # Ersetze max 2 Wörter
-        for idx in random.sample(indices, min(2, len(indices))):
-            words[idx] = random.choice(self.synonyms[words[idx]])
+        return synonym_replace(text, random, self.synonyms)
+
+    def iter_augmented(self, label_samples, needed, label, skip=0):
+        """
+        Erzeugt `needed` augmentierte Samples für ein Label (Generator)
+
+        Synonym-Varianten entstehen parallel in einem Prozess-Pool (ein
+        fester Seed pro Task → gleiche Ausgabe unabhängig von der
+        Worker-Zahl); Back-Translations laufen gebündelt im Hauptprozess.
+        Für Synonyme werden nur Samples mit ersetzbaren Wörtern gezogen,
+        jedes Ergebnis unterscheidet sich also vom Original.
+
+        Args:
+            skip: Die ersten skip Samples nicht ausgeben (Resume)
+        """
+        eligible = [i for i, sample in enumerate(label_samples) if has_synonym_tokens(sample['text'])]
+        if not eligible and not TRANSLATOR_AVAILABLE:
+            print(f"   ⚠️  Label {label}: keine Samples mit Synonym-Wörtern - übersprungen")
+            return
+
+        task_ids = count()
+        produced = 0
+
+        def waves():
+            # Erst so viele Tasks wie nötig; fehlt danach noch etwas
+            # (gescheiterte Back-Translations), folgt eine weitere Welle
+            while produced < needed:
+                remaining = needed - produced
+                yield [(min(AUGMENT_CHUNK, remaining - start),
+                        task_seed(self.seed, label, next(task_ids)),
+                        TRANSLATOR_AVAILABLE)
+                       for start in range(0, remaining, AUGMENT_CHUNK)]
+
+        if self.workers > 1 and needed > AUGMENT_CHUNK:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                           initargs=(label_samples, eligible))
+            run = executor.map
+        else:
+            executor = None
+            _init_worker(label_samples, eligible)
+            run = map
 
-        return ' '.join(words)
-
-    def augment_dataset(self, input_file, output_file, target=150):
-        """Augmentiert komplettes Dataset"""
+        try:
+            with tqdm(total=needed, desc=f"Augmentiere Label {label}", unit="samples") as pbar:
+                for wave in waves():
+                    wave_produced = 0
+                    for plans in run(_augment_task, wave):
+                        for aug in self._build_samples(label_samples, plans):
+                            if produced >= needed:
+                                break
+                            produced += 1
+                            wave_produced += 1
+                            pbar.update(1)
+                            if produced > skip:
+                                yield aug
+
+                    if wave_produced == 0:
+                        print(f"   ⚠️  Label {label}: keine neuen Varianten möglich ({produced}/{needed})")
+                        return
+        finally:
+            if executor:
+                executor.shutdown()
+
+    def _build_samples(self, label_samples, plans):
+        """Pläne eines Tasks → augmentierte Samples (Back-Translation gebündelt)"""
+        back_texts = [label_samples[index]['text'] for index, method, _, _ in plans if method == 'back']
+        back_results = iter(self.back_translate_many(back_texts))
+
+        for index, method, text, fallback in plans:
+            if method == 'back':
+                text = next(back_results)
+                # Nur hinzufügen wenn Text sich geändert hat - sonst Synonym-Ersatz
+                if text == label_samples[index]['text']:
+                    if fallback is None:
+                        continue
+                    (index, text), method = fallback, 'syn'
+
+            aug = label_samples[index].copy()
+            aug['text'] = text
+            aug['augmented'] = True
+            aug['augmentation_method'] = method
+            yield aug
+
+    def augment_dataset(self, input_file, output_file, target=150, resume=False):
+        """
+        Augmentiert komplettes Dataset (streamend, .json oder .jsonl)
+
+        Im Speicher liegen nur die Samples der unterrepräsentierten Klassen
+        (< target pro Klasse). Originale werden durchgereicht.
+
+        - .json: Originale + Augmentierte, gemischt per Shuffle-Puffer
+        - .jsonl: erst Originale, dann Augmentierte - mit resume=True wird ein
+          abgebrochener Lauf fortgesetzt
+        """
         print(f"\n{'='*70}")
         print(f"🔄 DATA AUGMENTATION")
         print(f"{'='*70}")
         print(f"\n📥 Lade: {input_file}")
 
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        print(f"✅ {len(data)} Samples geladen")
+        # Analysiere Label-Distribution (1. Durchlauf)
+        label_counts = Counter(d['label'] for d in iter_records(input_file))
+        total_original = sum(label_counts.values())
 
-        # Analysiere Label-Distribution
-        label_counts = Counter([d['label'] for d in data])
+        print(f"✅ {total_original} Samples geladen")
 
         print(f"\n📊 Aktuelle Label-Distribution:")
         for label, count in sorted(label_counts.items()):
@@ -94,9 +270,17 @@ class DataAugmenter:
 
         print(f"\n🎯 Ziel: {target} Samples pro Grooming-Klasse")
 
-        # Augmentiere unterrepräsentierte Klassen
-        augmented_data = list(data)  # Start mit Original
+        # Bereits geschriebene Samples (nur .jsonl + resume)
+        writer = JsonlWriter(output_file, resume=resume) if is_jsonl(output_file) else None
+        done_original = min(writer.count, total_original) if writer else 0
+        done_augmented = Counter()
+        if writer and writer.count > total_original:
+            done_augmented = Counter(d['label'] for d in islice(iter_records(output_file), total_original, None))
+        if writer and writer.count:
+            print(f"⏩ Resume: {writer.count} Samples bereits gespeichert")
 
+        # Augmentiere unterrepräsentierte Klassen
+        needed_per_label = {}
         for label in grooming_labels:
             current_count = label_counts[label]
 
@@ -106,58 +290,41 @@ class DataAugmenter:
 
             needed = target - current_count
             print(f"   Label {label}: {current_count} → brauche {needed} mehr")
-
-            # Finde alle Samples dieser Klasse
-            label_samples = [s for s in data if s['label'] == label]
-
-            if not label_samples:
-                print(f"   ⚠️  Keine Samples für Label {label}")
-                continue
-
-            # Augmentiere bis Target erreicht
-            augmented_count = 0
-
-            with tqdm(total=needed, desc=f"Augmentiere Label {label}", unit="samples") as pbar:
-                while augmented_count < needed:
-                    # Sample zufälliges Original
-                    original = random.choice(label_samples)
-
-                    # Wähle Augmentation-Methode
-                    method = random.choice(['back', 'syn', 'syn'])  # 2/3 Synonym, 1/3 Back-Translation
-
-                    # Augmentiere
-                    aug = original.copy()
-
-                    if method == 'back' and TRANSLATOR_AVAILABLE:
-                        aug['text'] = self.back_translate(original['text'])
-                    else:
-                        aug['text'] = self.synonym_replace(original['text'])
-
-                    aug['augmented'] = True
-                    aug['augmentation_method'] = method
-
-                    # Nur hinzufügen wenn Text sich geändert hat
-                    if aug['text'] != original['text']:
-                        augmented_data.append(aug)
-                        augmented_count += 1
-                        pbar.update(1)
-
-        # Shuffle
-        random.shuffle(augmented_data)
-
-        # Speichere
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(augmented_data, f, indent=2, ensure_ascii=False)
+            needed_per_label[label] = needed
+
+        # Nur die Samples der Klassen, die augmentiert werden (2. Durchlauf)
+        label_samples = {label: [] for label in needed_per_label}
+        for sample in iter_records(input_file):
+            if sample['label'] in label_samples:
+                label_samples[sample['label']].append(sample)
+
+        def augmented_stream():
+            for label, needed in needed_per_label.items():
+                if not label_samples[label]:
+                    print(f"   ⚠️  Keine Samples für Label {label}")
+                    continue
+                if needed > done_augmented[label]:
+                    yield from self.iter_augmented(label_samples[label], needed, label,
+                                                   skip=done_augmented[label])
+
+        # Originale durchreichen, dann Augmentierte anhängen
+        originals = islice(iter_records(input_file), done_original, None)
+        stream = chain(originals, augmented_stream())
+
+        if writer:
+            with writer:
+                writer.write_all(stream)
+                total_augmented = writer.count
+        else:
+            total_augmented = write_records(shuffle_buffer(stream), output_file)
+
+        # Statistik über die geschriebene Datei (inkl. früherer Läufe bei Resume)
+        final_counts = Counter(d['label'] for d in iter_records(output_file))
 
         print(f"\n✅ Augmentation abgeschlossen!")
         print(f"💾 Gespeichert: {output_file}")
 
         # Final Statistics
-        final_counts = Counter([d['label'] for d in augmented_data])
-
         print(f"\n📊 Finale Label-Distribution:")
         for label, count in sorted(final_counts.items()):
             original = label_counts.get(label, 0)
@@ -165,18 +332,43 @@ class DataAugmenter:
             print(f"   Label {label}: {count} (+{added})")
 
         print(f"\n📊 Total:")
-        print(f"   Original: {len(data)}")
-        print(f"   Augmented: {len(augmented_data)}")
-        print(f"   Increase: +{len(augmented_data) - len(data)} samples")
+        print(f"   Original: {total_original}")
+        print(f"   Augmented: {total_augmented}")
+        print(f"   Increase: +{total_augmented - total_original} samples")
 
 
 def main():
     """Hauptfunktion - Augmentiert Training-Dataset"""
+    parser = argparse.ArgumentParser(description="KidGuard Data Augmentation")
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Dateiformat für Input und Output (jsonl = streambar + resumable)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Abgebrochene Augmentation fortsetzen (nur --format jsonl)"
+    )
+    parser.add_argument(
+        "--target",
+        type=int,
+        default=150,
+        help="Ziel-Anzahl Samples pro Grooming-Klasse"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Prozesse für die Augmentation (Default: alle CPUs)"
+    )
+    args = parser.parse_args()
 
     print("="*70)
     print("🔄 KIDGUARD DATA AUGMENTATION")
     print("="*70)
-    print("\nZiel: Grooming-Klassen auf je 150+ Samples bringen")
+    print(f"\nZiel: Grooming-Klassen auf je {args.target}+ Samples bringen")
     print("Methoden: Back-Translation + Synonym-Replacement\n")
 
     if not TRANSLATOR_AVAILABLE:
@@ -185,11 +377,11 @@ def main():
         print("   → Nur Synonym-Replacement verfügbar\n")
 
     # Initialisiere Augmenter
-    augmenter = DataAugmenter()
+    augmenter = DataAugmenter(workers=args.workers)
 
     # Augmentiere Training-Set
-    input_file = 'training/data/combined/kidguard_german_train.json'
-    output_file = 'training/data/augmented/kidguard_augmented_train.json'
+    input_file = f'training/data/combined/kidguard_german_train.{args.format}'
+    output_file = f'training/data/augmented/kidguard_augmented_train.{args.format}'
 
     if not Path(input_file).exists():
         print(f"❌ Input-Datei nicht gefunden: {input_file}")
@@ -199,9 +391,13 @@ def main():
     augmenter.augment_dataset(
         input_file=input_file,
         output_file=output_file,
-        target=150  # Ziel: 150 Samples pro Grooming-Klasse
+        target=args.target,  # Ziel: Samples pro Grooming-Klasse
+        resume=args.resume
     )
 
+    augmenter.cache.print_stats()
+    augmenter.cache.close()
+
     print("\n" + "="*70)
     print("✅ DATA AUGMENTATION ABGESCHLOSSEN")
     print("="*70)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Calibration Set - echte Nachrichten für die INT8-Quantisierung
+===============================================================
+Full-Integer-Quantisierung (TFLite) misst mit dem representative_dataset
+den Wertebereich jeder Aktivierung. Zufällige Token-IDs decken die
+tatsächliche Verteilung nicht ab (Padding-Anteil, häufige Wörter, <OOV>),
+die Skalen passen dann nicht zu echten Nachrichten und das INT8-Modell
+verliert Accuracy.
+
+Der Builder zieht deshalb eine nach Label geschichtete Stichprobe echter
+Nachrichten aus dem Trainingskorpus (jede Klasse mindestens einmal, sonst
+proportional) und tokenisiert sie mit dem word_index des Modells - exakt
+wie die App (FastTokenizer, post-Padding/-Truncating). Leere Nachrichten
+(nur Padding) fliegen raus.
+
+Usage:
+    samples, labels = build_calibration_set('training/data/pan12_train.json',
+                                            'training/models/pan12_full/metadata.json')
+    converter.representative_dataset = representative_dataset(samples)
+"""
+
+import json
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dataset_cache import load_dataset
+from fast_tokenizer import from_word_index
+
+# TFLite empfiehlt ein paar hundert Beispiele; mehr kostet nur Konvertierungszeit
+DEFAULT_CALIBRATION_SAMPLES = 300
+
+
+def stratified_indices(labels: Sequence, size: int, seed: int = 42) -> np.ndarray:
+    """
+    Geschichtete Stichprobe: Anteile wie im Korpus, jede Klasse mindestens einmal
+
+    Returns: sortierte Indizes (alle, wenn size >= len(labels))
+    """
+    labels = np.asarray(labels)
+    if size >= len(labels):
+        return np.arange(len(labels))
+
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    exact = counts * size / len(labels)
+    quota = np.minimum(np.maximum(np.floor(exact).astype(int), 1), counts)
+
+    # Rest nach größtem Nachkommaanteil verteilen
+    remaining = size - int(quota.sum())
+    for c in np.argsort(-(exact - np.floor(exact)), kind='stable'):
+        if remaining <= 0:
+            break
+        if quota[c] < counts[c]:
+            quota[c] += 1
+            remaining -= 1
+
+    rng = np.random.default_rng(seed)
+    picks = [rng.choice(np.flatnonzero(inverse == c), quota[c], replace=False)
+             for c in range(len(counts))]
+    return np.sort(np.concatenate(picks))
+
+
+def load_model_vocabulary(metadata_path: str) -> Tuple[Dict[str, int], int]:
+    """word_index + max_length aus der Modell-Metadata (App-Format)"""
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    max_length = metadata.get('max_length', metadata.get('max_sequence_length'))
+    if 'word_index' not in metadata or max_length is None:
+        raise ValueError(f"Metadata ohne word_index/max_length: {metadata_path}")
+    return metadata['word_index'], int(max_length)
+
+
+def encode_messages(texts: Sequence[str], word_index: Dict[str, int], max_length: int,
+                    oov_token: Optional[str] = '<OOV>') -> np.ndarray:
+    """Tokenisiert wie die App → int32 [len(texts), max_length]"""
+    if oov_token not in word_index:
+        oov_token = None
+    return from_word_index(word_index, oov_token=oov_token).encode(list(texts), max_length=max_length)
+
+
+def build_calibration_set(corpus_path: str, metadata_path: str,
+                          size: int = DEFAULT_CALIBRATION_SAMPLES,
+                          seed: int = 42) -> Tuple[np.ndarray, list]:
+    """
+    Geschichtete Stichprobe aus corpus_path, tokenisiert mit dem word_index des Modells
+
+    Returns: (samples float32 [n, max_length], labels)
+    """
+    corpus = load_dataset(corpus_path)
+    word_index, max_length = load_model_vocabulary(metadata_path)
+
+    indices = stratified_indices(corpus['label'], size, seed=seed)
+    texts = [corpus['text'][i] for i in indices]
+    labels = [corpus['label'][i] for i in indices]
+    samples = encode_messages(texts, word_index, max_length)
+
+    non_empty = samples.any(axis=1)
+    if not non_empty.any():
+        raise ValueError(f"Keine Nachricht aus {corpus_path} ergibt Tokens für dieses Modell")
+    samples = samples[non_empty]
+    labels = [label for label, keep in zip(labels, non_empty) if keep]
+
+    print(f"🎯 Calibration Set: {len(samples)} Nachrichten aus {corpus_path} "
+          f"({len(set(labels))} Klassen, max_length {max_length})")
+    return samples.astype(np.float32), labels
+
+
+def representative_dataset(samples: np.ndarray, dtype=np.float32) -> Callable:
+    """Generator-Funktion für converter.representative_dataset (ein Sample pro Schritt)"""
+    def generator():
+        for sample in samples:
+            yield [np.asarray(sample, dtype=dtype)[None, :]]
+
+    return generator
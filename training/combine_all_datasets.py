@@ -4,173 +4,230 @@ Kombiniert alle Datasets für maximales Training:
 1. PAN12 XML Dialoge (neu geparst)
 2. Bestehendes deutsches Dataset
 3. Augmentierte Daten
+
+Läuft streamend (jsonl_dataset): Samples werden einzeln gelesen,
+dedupliziert und direkt in Train/Test geschrieben. Im Speicher liegen nur
+die Hashes der bereits gesehenen Texte, der Near-Duplicate-Index
+(MinHash-Signaturen, near_dedup.py) und der Shuffle-Puffer.
 """
 
-import json
+import argparse
+import hashlib
 import random
 from collections import Counter
+from pathlib import Path
 import os
 
-print("🔄 Kombiniere alle Datasets")
-print("=" * 60)
-
-# Lade alle verfügbaren Datasets
-datasets = []
-
-# 1. PAN12 XML Dialoge
-pan12_xml = 'data/pan12_dialogs_extracted.json'
-if os.path.exists(pan12_xml):
-    with open(pan12_xml, 'r', encoding='utf-8') as f:
-        pan12_data = json.load(f)
-    print(f"✅ PAN12 XML: {len(pan12_data)} samples")
-    datasets.append(('pan12_xml', pan12_data))
-else:
-    print(f"⚠️ PAN12 XML nicht gefunden: {pan12_xml}")
-
-# 2. Deutsches Dataset
-german_train = 'data/combined/kidguard_german_train.json'
-if os.path.exists(german_train):
-    with open(german_train, 'r', encoding='utf-8') as f:
-        german_data = json.load(f)
-    print(f"✅ Deutsches Dataset: {len(german_data)} samples")
-
-    # Konvertiere Format wenn nötig (binary label → stage label)
-    formatted_german = []
-    for item in german_data:
-        if 'label' not in item or isinstance(item['label'], int):
-            # Binary label (0/1) → stage label
-            if item.get('label', 0) == 0:
-                item['label'] = 'STAGE_SAFE'
+from jsonl_dataset import iter_records, count_records, RecordWriter, shuffle_buffer
+from near_dedup import NearDuplicateIndex, DEFAULT_THRESHOLD
+
+SHUFFLE_BUFFER = 10000
+TRAIN_RATIO = 0.8
+
+
+def find_dataset(path):
+    """Bevorzugt die .jsonl-Variante einer Datei, falls vorhanden"""
+    jsonl_path = Path(path).with_suffix('.jsonl')
+    if jsonl_path.exists():
+        return str(jsonl_path)
+    if os.path.exists(path):
+        return path
+    return None
+
+
+def format_german(item):
+    """Konvertiere Format wenn nötig (binary label → stage label)"""
+    if 'label' not in item or isinstance(item['label'], int):
+        # Binary label (0/1) → stage label
+        if item.get('label', 0) == 0:
+            item['label'] = 'STAGE_SAFE'
+        else:
+            # Wenn wir den Text analysieren können, besseres Label
+            text_lower = item['text'].lower()
+            if any(kw in text_lower for kw in ['robux', 'vbucks', 'geld', 'geschenk']):
+                item['label'] = 'STAGE_NEEDS'
+            elif any(kw in text_lower for kw in ['allein', 'alone', 'zuhause']):
+                item['label'] = 'STAGE_ASSESSMENT'
+            elif any(kw in text_lower for kw in ['discord', 'snapchat', 'privat']):
+                item['label'] = 'STAGE_ISOLATION'
+            else:
+                item['label'] = 'STAGE_TRUST'
+    return item
+
+
+def text_digest(text):
+    """Kompakter Hash des normalisierten Texts (16 Bytes statt ganzem Text im Set)"""
+    return hashlib.blake2b(text.strip().lower().encode('utf-8'), digest_size=16).digest()
+
+
+def is_train(digest):
+    """Hash-basierter Split: stabil, ohne die Gesamtzahl kennen zu müssen"""
+    return int.from_bytes(digest[:8], 'big') % 100 < TRAIN_RATIO * 100
+
+
+def iter_sources(datasets):
+    for name, path, convert in datasets:
+        for item in iter_records(path):
+            yield convert(item) if convert else item
+
+
+def iter_unique(samples, stats, near_index=None):
+    """
+    Dedupliziere basierend auf Text → (digest, sample)
+
+    Mit near_index werden zusätzlich Near-Duplicates (augmentierte /
+    übersetzte Varianten) verworfen.
+    """
+    seen_digests = set()
+
+    for sample in samples:
+        stats['total'] += 1
+        text = sample['text'].strip().lower()
+        if len(text) < 10:
+            continue
+
+        digest = text_digest(text)
+        if digest in seen_digests:
+            continue
+
+        seen_digests.add(digest)
+
+        if near_index is not None and near_index.add_if_new(digest, text) is not None:
+            stats['near_duplicates'] += 1
+            continue
+
+        yield digest, sample
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kombiniert alle KidGuard Datasets")
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Format der Output-Dateien (Inputs: .jsonl wird bevorzugt, falls vorhanden)"
+    )
+    parser.add_argument(
+        "--near-dup-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Jaccard-Schwelle für Near-Duplicates (0 = nur exakte Deduplizierung)"
+    )
+    args = parser.parse_args()
+
+    print("🔄 Kombiniere alle Datasets")
+    print("=" * 60)
+
+    # Sammle alle verfügbaren Datasets
+    datasets = []
+
+    # 1. PAN12 XML Dialoge
+    pan12_xml = find_dataset('data/pan12_dialogs_extracted.json')
+    if pan12_xml:
+        print(f"✅ PAN12 XML: {count_records(pan12_xml)} samples")
+        datasets.append(('pan12_xml', pan12_xml, None))
+    else:
+        print(f"⚠️ PAN12 XML nicht gefunden: data/pan12_dialogs_extracted.json")
+
+    # 2. Deutsches Dataset
+    german_train = find_dataset('data/combined/kidguard_german_train.json')
+    if german_train:
+        print(f"✅ Deutsches Dataset: {count_records(german_train)} samples")
+        datasets.append(('german', german_train, format_german))
+    else:
+        print(f"⚠️ Deutsches Dataset nicht gefunden: data/combined/kidguard_german_train.json")
+
+    # 3. Original kombiniertes Dataset (falls vorhanden)
+    original_train = find_dataset('data/combined/kidguard_train.json')
+    if original_train:
+        print(f"✅ Original Dataset: {count_records(original_train)} samples")
+        datasets.append(('original', original_train, None))
+
+    # Speichern
+    os.makedirs('data/combined', exist_ok=True)
+    ext = args.format
+
+    output_train = f'data/combined/kidguard_ultimate_train.{ext}'
+    output_test = f'data/combined/kidguard_ultimate_test.{ext}'
+    output_binary_train = f'data/combined/kidguard_ultimate_binary_train.{ext}'
+    output_binary_test = f'data/combined/kidguard_ultimate_binary_test.{ext}'
+
+    # Kombiniere, dedupliziere, mische und splitte in EINEM Durchlauf
+    print("\n🔀 Kombiniere Datasets...")
+    stats = Counter()
+    label_counts = Counter()
+    binary_counts = Counter()
+
+    near_index = NearDuplicateIndex(args.near_dup_threshold) if args.near_dup_threshold > 0 else None
+    unique = iter_unique(iter_sources(datasets), stats, near_index)
+    shuffled = shuffle_buffer(unique, SHUFFLE_BUFFER, random.Random(42))
+
+    with RecordWriter(output_train) as train_writer, \
+            RecordWriter(output_test) as test_writer, \
+            RecordWriter(output_binary_train) as binary_train_writer, \
+            RecordWriter(output_binary_test) as binary_test_writer:
+
+        for digest, sample in shuffled:
+            label_counts[sample.get('label', 'STAGE_SAFE')] += 1
+
+            # Binary Version: Safe = 0, alle anderen = 1
+            binary_sample = sample.copy()
+            binary_sample['label'] = 0 if sample.get('label') == 'STAGE_SAFE' else 1
+
+            if is_train(digest):
+                train_writer.write(sample)
+                binary_train_writer.write(binary_sample)
+                binary_counts[binary_sample['label']] += 1
             else:
-                # Wenn wir den Text analysieren können, besseres Label
-                text_lower = item['text'].lower()
-                if any(kw in text_lower for kw in ['robux', 'vbucks', 'geld', 'geschenk']):
-                    item['label'] = 'STAGE_NEEDS'
-                elif any(kw in text_lower for kw in ['allein', 'alone', 'zuhause']):
-                    item['label'] = 'STAGE_ASSESSMENT'
-                elif any(kw in text_lower for kw in ['discord', 'snapchat', 'privat']):
-                    item['label'] = 'STAGE_ISOLATION'
-                else:
-                    item['label'] = 'STAGE_TRUST'
-        formatted_german.append(item)
-
-    datasets.append(('german', formatted_german))
-else:
-    print(f"⚠️ Deutsches Dataset nicht gefunden: {german_train}")
-
-# 3. Original kombiniertes Dataset (falls vorhanden)
-original_train = 'data/combined/kidguard_train.json'
-if os.path.exists(original_train):
-    with open(original_train, 'r', encoding='utf-8') as f:
-        original_data = json.load(f)
-    print(f"✅ Original Dataset: {len(original_data)} samples")
-    datasets.append(('original', original_data))
-
-# Kombiniere alle
-print("\n🔀 Kombiniere Datasets...")
-all_samples = []
-
-for name, data in datasets:
-    all_samples.extend(data)
-
-print(f"✅ Gesamt vor Deduplizierung: {len(all_samples)} samples")
-
-# Dedupliziere basierend auf Text
-seen_texts = set()
-unique_samples = []
-
-for sample in all_samples:
-    text = sample['text'].strip().lower()
-    if text not in seen_texts and len(text) >= 10:
-        seen_texts.add(text)
-        unique_samples.append(sample)
-
-print(f"✅ Nach Deduplizierung: {len(unique_samples)} samples")
-
-# Label Distribution
-labels = [s.get('label', 'STAGE_SAFE') for s in unique_samples]
-label_counts = Counter(labels)
-
-print("\n📊 Label Distribution:")
-for label, count in sorted(label_counts.items()):
-    print(f"   {label}: {count} ({count/len(unique_samples)*100:.1f}%)")
-
-# Shuffle
-random.seed(42)
-random.shuffle(unique_samples)
-
-# Split 80/20
-split_idx = int(len(unique_samples) * 0.8)
-train_samples = unique_samples[:split_idx]
-test_samples = unique_samples[split_idx:]
-
-print(f"\n📋 Split:")
-print(f"   Training: {len(train_samples)} samples")
-print(f"   Test: {len(test_samples)} samples")
-
-# Speichern
-os.makedirs('data/combined', exist_ok=True)
-
-# Training Set
-output_train = 'data/combined/kidguard_ultimate_train.json'
-with open(output_train, 'w', encoding='utf-8') as f:
-    json.dump(train_samples, f, indent=2, ensure_ascii=False)
-
-print(f"\n💾 Training gespeichert: {output_train}")
-print(f"   Größe: {os.path.getsize(output_train) / 1024:.1f} KB")
-
-# Test Set
-output_test = 'data/combined/kidguard_ultimate_test.json'
-with open(output_test, 'w', encoding='utf-8') as f:
-    json.dump(test_samples, f, indent=2, ensure_ascii=False)
-
-print(f"💾 Test gespeichert: {output_test}")
-print(f"   Größe: {os.path.getsize(output_test) / 1024:.1f} KB")
-
-# Auch Binary Version erstellen (für bessere Kompatibilität)
-print("\n🔄 Erstelle Binary Version...")
-
-binary_train = []
-binary_test = []
-
-for sample in train_samples:
-    binary_sample = sample.copy()
-    # Safe = 0, alle anderen = 1
-    binary_sample['label'] = 0 if sample.get('label') == 'STAGE_SAFE' else 1
-    binary_train.append(binary_sample)
-
-for sample in test_samples:
-    binary_sample = sample.copy()
-    binary_sample['label'] = 0 if sample.get('label') == 'STAGE_SAFE' else 1
-    binary_test.append(binary_sample)
-
-# Binary Training Distribution
-binary_labels = [s['label'] for s in binary_train]
-binary_counts = Counter(binary_labels)
-print(f"\n📊 Binary Labels (Training):")
-print(f"   Safe (0): {binary_counts[0]} ({binary_counts[0]/len(binary_train)*100:.1f}%)")
-print(f"   Grooming (1): {binary_counts[1]} ({binary_counts[1]/len(binary_train)*100:.1f}%)")
-
-# Speichern Binary
-output_binary_train = 'data/combined/kidguard_ultimate_binary_train.json'
-with open(output_binary_train, 'w', encoding='utf-8') as f:
-    json.dump(binary_train, f, indent=2, ensure_ascii=False)
-
-output_binary_test = 'data/combined/kidguard_ultimate_binary_test.json'
-with open(output_binary_test, 'w', encoding='utf-8') as f:
-    json.dump(binary_test, f, indent=2, ensure_ascii=False)
-
-print(f"✅ Binary Training: {output_binary_train}")
-print(f"✅ Binary Test: {output_binary_test}")
-
-print("\n" + "=" * 60)
-print("🎉 DATASET KOMBINATION ABGESCHLOSSEN!")
-print("=" * 60)
-print(f"\n📊 Finale Statistik:")
-print(f"   Total Samples: {len(unique_samples)}")
-print(f"   Training: {len(train_samples)}")
-print(f"   Test: {len(test_samples)}")
-print(f"   Datasets kombiniert: {len(datasets)}")
-print(f"\n🚀 Nutze für Training:")
-print(f"   {output_binary_train}")
-print(f"   {output_binary_test}")
+                test_writer.write(sample)
+                binary_test_writer.write(binary_sample)
+
+    total_unique = train_writer.count + test_writer.count
+
+    print(f"✅ Gesamt vor Deduplizierung: {stats['total']} samples")
+    if near_index is not None:
+        print(f"✅ Near-Duplicates entfernt: {stats['near_duplicates']} "
+              f"(Jaccard >= {args.near_dup_threshold})")
+    print(f"✅ Nach Deduplizierung: {total_unique} samples")
+
+    if total_unique == 0:
+        print("\n❌ Keine Samples gefunden!")
+        return
+
+    print("\n📊 Label Distribution:")
+    for label, count in sorted(label_counts.items()):
+        print(f"   {label}: {count} ({count/total_unique*100:.1f}%)")
+
+    print(f"\n📋 Split:")
+    print(f"   Training: {train_writer.count} samples")
+    print(f"   Test: {test_writer.count} samples")
+
+    print(f"\n💾 Training gespeichert: {output_train}")
+    print(f"   Größe: {os.path.getsize(output_train) / 1024:.1f} KB")
+    print(f"💾 Test gespeichert: {output_test}")
+    print(f"   Größe: {os.path.getsize(output_test) / 1024:.1f} KB")
+
+    # Binary Training Distribution
+    if train_writer.count:
+        print(f"\n📊 Binary Labels (Training):")
+        print(f"   Safe (0): {binary_counts[0]} ({binary_counts[0]/train_writer.count*100:.1f}%)")
+        print(f"   Grooming (1): {binary_counts[1]} ({binary_counts[1]/train_writer.count*100:.1f}%)")
+
+    print(f"✅ Binary Training: {output_binary_train}")
+    print(f"✅ Binary Test: {output_binary_test}")
+
+    print("\n" + "=" * 60)
+    print("🎉 DATASET KOMBINATION ABGESCHLOSSEN!")
+    print("=" * 60)
+    print(f"\n📊 Finale Statistik:")
+    print(f"   Total Samples: {total_unique}")
+    print(f"   Training: {train_writer.count}")
+    print(f"   Test: {test_writer.count}")
+    print(f"   Datasets kombiniert: {len(datasets)}")
+    print(f"\n🚀 Nutze für Training:")
+    print(f"   {output_binary_train}")
+    print(f"   {output_binary_test}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,20 @@ import json
 from pathlib import Path
 from collections import Counter
 
+from jsonl_dataset import iter_records
+from near_dedup import drop_near_duplicates, cross_split_duplicates, print_leak_report, DEFAULT_THRESHOLD
+
 class DatasetCombiner:
     """Kombiniert alle verfügbaren Datenquellen"""
 
-    def __init__(self):
+    def __init__(self, near_dup_threshold=DEFAULT_THRESHOLD):
+        """
+        Args:
+            near_dup_threshold: Jaccard-Schwelle für Near-Duplicates (0 = aus)
+        """
         self.datasets = []
         self.combined = None
+        self.near_dup_threshold = near_dup_threshold
 
     def load_scientific_papers(self):
         """Lade Scientific Papers Dataset (207 Beispiele)"""
@@ -27,9 +35,7 @@ class DatasetCombiner:
         json_path = Path("ml/data/scientific_augmented_dataset.json")
 
         if json_path.exists():
-            with open(json_path, 'r') as f:
-                data = json.load(f)
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(iter_records(json_path))
             print(f"   Geladen von: {json_path}")
         else:
             # Fallback: CSV
@@ -108,6 +114,14 @@ class DatasetCombiner:
 
         print(f"✅ {len(self.combined)} Beispiele total")
 
+        # Near-Duplicates (augmentierte / übersetzte Varianten) entfernen
+        if self.near_dup_threshold > 0:
+            keep = drop_near_duplicates(self.combined['text'], self.near_dup_threshold)
+            removed = len(self.combined) - len(keep)
+            self.combined = self.combined.iloc[keep].reset_index(drop=True)
+            print(f"✅ {removed} Near-Duplicates entfernt (Jaccard >= {self.near_dup_threshold})")
+            print(f"✅ {len(self.combined)} Beispiele nach Deduplizierung")
+
         # Statistics
         print(f"\n📊 Statistics:")
         print(f"   Total: {len(self.combined)}")
@@ -162,6 +176,13 @@ class DatasetCombiner:
         print(f"   GROOMING: {test_grooming} ({test_grooming/len(test_df)*100:.1f}%)")
         print(f"   SAFE: {len(test_df) - test_grooming} ({(len(test_df) - test_grooming)/len(test_df)*100:.1f}%)")
 
+        # Data Leakage: Near-Duplicates zwischen Train und Test
+        print(f"\n🔍 Prüfe Train/Test auf Near-Duplicates...")
+        train_texts = train_df['text'].tolist()
+        test_texts = test_df['text'].tolist()
+        leaks = cross_split_duplicates(train_texts, test_texts, self.near_dup_threshold or DEFAULT_THRESHOLD)
+        print_leak_report(leaks, len(test_df), train_texts, test_texts)
+
         return train_df, test_df
 
     def save_combined(self, output_dir="training/data/combined"):
@@ -198,6 +219,16 @@ class DatasetCombiner:
         print(f"✅ Train JSON: {train_json}")
         print(f"✅ Test JSON: {test_json}")
 
+        # JSONL für die streamenden Stages (translate_dataset.py --format jsonl)
+        train_jsonl = output_path / "kidguard_train.jsonl"
+        test_jsonl = output_path / "kidguard_test.jsonl"
+
+        train_df.to_json(train_jsonl, orient='records', lines=True, force_ascii=False)
+        test_df.to_json(test_jsonl, orient='records', lines=True, force_ascii=False)
+
+        print(f"✅ Train JSONL: {train_jsonl}")
+        print(f"✅ Test JSONL: {test_jsonl}")
+
         # Erstelle Summary Report
         self.create_summary_report(output_path)
 
@@ -276,6 +307,8 @@ training/data/combined/
 ├── kidguard_test.csv            (20% for evaluation)
 ├── kidguard_train.json          (JSON format)
 ├── kidguard_test.json           (JSON format)
+├── kidguard_train.jsonl         (JSON Lines, streambar)
+├── kidguard_test.jsonl          (JSON Lines, streambar)
 └── DATASET_SUMMARY.md           (This file)
 ```
 
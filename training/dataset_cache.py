@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Dataset Cache - Spaltenorientiertes On-Disk-Format für geparste Corpora
+=======================================================================
+Die Parser schreiben neben dem JSON-Export einen Arrow-Cache (<name>.arrow,
+Arrow IPC / Feather v2, unkomprimiert). Die Trainer laden den Cache per
+mmap - die Spalten liegen direkt im Page-Cache, es gibt keinen json.load()
+über hunderttausende Dicts mehr.
+
+Spalten: text, label, stage, conversation_id, author, timestamp
+(conv_id → conversation_id, time → timestamp; fehlende Felder = null)
+
+Usage (Parser):
+    from dataset_cache import save_dataset
+    save_dataset(samples, 'data/pan12_train.json')   # JSON-Export + .arrow
+
+Usage (Trainer):
+    from dataset_cache import load_dataset
+    data = load_dataset('data/pan12_train.json')       # .arrow wenn aktuell, sonst JSON
+    X_train, y_train = data['text'], data['label']
+
+Spaltentypen kommen aus dem ersten Batch; passt ein späterer Batch nicht
+(z.B. label erst int, später str), wird die Spalte zu string erweitert und
+der bisherige Cache neu geschrieben. Ohne pyarrow wird nur JSON geschrieben
+bzw. gelesen; scheitert der Cache, bleibt es beim JSON-Export + Warnung.
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+CACHE_COLUMNS = ['text', 'label', 'stage', 'conversation_id', 'author', 'timestamp']
+
+# Unterschiedliche Feldnamen der Parser → Cache-Spalte
+COLUMN_ALIASES = {
+    'conversation_id': ['conversation_id', 'conv_id'],
+    'timestamp': ['timestamp', 'time'],
+}
+
+CACHE_SUFFIX = '.arrow'
+BATCH_SIZE = 65536
+
+# Fehler beim Cache-Schreiben → Cache überspringen, JSON bleibt gültig
+CACHE_ERRORS = (ValueError, TypeError, OSError) + ((pa.ArrowException,) if HAS_ARROW else ())
+
+
+def cache_path(json_path) -> Path:
+    """Pfad des Arrow-Caches zu einer JSON-Datei"""
+    return Path(json_path).with_suffix(CACHE_SUFFIX)
+
+
+def _get_field(record: Dict, column: str):
+    for key in COLUMN_ALIASES.get(column, [column]):
+        if key in record:
+            return record[key]
+    return None
+
+
+def _arrow_type(value):
+    """Arrow-Typ eines Python-Werts (label ist je nach Parser int oder str)"""
+    if isinstance(value, bool):
+        return pa.bool_()
+    if isinstance(value, int):
+        return pa.int64()
+    if isinstance(value, float):
+        return pa.float64()
+    return pa.string()
+
+
+def _column_type(values: Sequence):
+    """Spaltentyp aus allen Werten eines Batches; gemischte Typen → string"""
+    types = {_arrow_type(value) for value in values if value is not None}
+    return types.pop() if len(types) == 1 else pa.string()
+
+
+def _fits(values: Sequence, arrow_type) -> bool:
+    """True wenn alle Werte in eine Spalte vom Typ arrow_type passen (string nimmt alles)"""
+    return arrow_type == pa.string() or all(value is None or _arrow_type(value) == arrow_type
+                                            for value in values)
+
+
+def _column_array(values: Sequence, arrow_type) -> 'pa.Array':
+    if arrow_type == pa.string():
+        values = [value if value is None or isinstance(value, str) else str(value)
+                  for value in values]
+    return pa.array(values, type=arrow_type)
+
+
+class DatasetCacheWriter:
+    """
+    Schreibt Samples inkrementell in einen Arrow-Cache
+
+    Samples werden in Record-Batches gepuffert, der Speicherbedarf bleibt
+    also auch im Streaming-Modus konstant. Die Datei wird erst beim
+    Schließen atomar an ihren Platz verschoben.
+    """
+
+    def __init__(self, path, columns: Sequence[str] = CACHE_COLUMNS):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.count = 0
+        self._buffer = {name: [] for name in self.columns}
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._widenings = 0
+        self._arrow_schema = None
+        self._sink = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(discard=exc_type is not None)
+
+    def write(self, record: Dict):
+        for name in self.columns:
+            self._buffer[name].append(_get_field(record, name))
+        self.count += 1
+        if len(self._buffer[self.columns[0]]) >= BATCH_SIZE:
+            self._flush()
+
+    def write_all(self, records: Iterable[Dict]):
+        for record in records:
+            self.write(record)
+
+    def _schema(self) -> 'pa.Schema':
+        return pa.schema([pa.field(name, _column_type(self._buffer[name])) for name in self.columns])
+
+    def _flush(self):
+        if not self._buffer[self.columns[0]] and self._writer is not None:
+            return
+
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._arrow_schema = self._schema()
+            self._sink = pa.OSFile(str(self._tmp_path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self._arrow_schema)
+        else:
+            conflicts = [field.name for field in self._arrow_schema
+                         if not _fits(self._buffer[field.name], field.type)]
+            if conflicts:
+                self._widen(conflicts)
+
+        arrays = [_column_array(self._buffer[field.name], field.type) for field in self._arrow_schema]
+        self._writer.write_batch(pa.record_batch(arrays, schema=self._arrow_schema))
+        self._buffer = {name: [] for name in self.columns}
+
+    def _widen(self, names: Sequence[str]):
+        """
+        Erweitert die Spalten names zu string und schreibt die bisherigen
+        Batches Batch für Batch in eine neue temporäre Datei um
+        """
+        print(f"   ℹ️  Arrow-Cache: Spalte(n) {', '.join(names)} mit gemischten Typen → string")
+        self._writer.close()
+        self._sink.close()
+
+        schema = pa.schema([pa.field(field.name, pa.string()) if field.name in names else field
+                            for field in self._arrow_schema])
+        self._widenings += 1
+        widened_path = self.path.with_name(f"{self.path.name}.{self._widenings}.tmp")
+        sink = pa.OSFile(str(widened_path), 'wb')
+        writer = pa.ipc.new_file(sink, schema)
+        try:
+            with pa.memory_map(str(self._tmp_path), 'r') as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    batch = reader.get_batch(i)
+                    arrays = [_column_array(batch.column(field.name).to_pylist(), field.type)
+                              if field.name in names else batch.column(field.name)
+                              for field in schema]
+                    writer.write_batch(pa.record_batch(arrays, schema=schema))
+        except BaseException:
+            sink.close()
+            widened_path.unlink(missing_ok=True)
+            raise
+
+        self._tmp_path.unlink()
+        self._tmp_path = widened_path
+        self._arrow_schema = schema
+        self._sink = sink
+        self._writer = writer
+
+    def close(self, discard: bool = False):
+        if discard:
+            if self._sink is not None and not self._sink.closed:
+                self._sink.close()
+            if self._tmp_path.exists():
+                self._tmp_path.unlink()
+            return
+
+        try:
+            self._flush()
+            self._writer.close()
+            self._sink.close()
+        except BaseException:
+            self.close(discard=True)
+            raise
+        os.replace(self._tmp_path, self.path)
+
+
+def write_cache(records: Iterable[Dict], path,
+                columns: Sequence[str] = CACHE_COLUMNS) -> Optional[Path]:
+    """
+    Schreibt Samples als Arrow-Cache
+
+    Returns: Pfad des Caches oder None (pyarrow nicht installiert bzw.
+    Cache nicht schreibbar - dann mit Warnung, ohne Exception)
+    """
+    if not HAS_ARROW:
+        print("⚠️  pyarrow nicht installiert - kein Arrow-Cache (nur JSON)")
+        return None
+
+    try:
+        with DatasetCacheWriter(path, columns) as writer:
+            writer.write_all(records)
+    except CACHE_ERRORS as e:
+        discard_cache(path, e)
+        return None
+
+    print(f"✅ Arrow-Cache gespeichert: {path} ({writer.count:,} Samples)")
+    return Path(path)
+
+
+def discard_cache(path, error: Exception):
+    """Warnt und entfernt einen veralteten Cache (load_dataset liest dann das JSON)"""
+    print(f"⚠️  Arrow-Cache übersprungen ({path}): {error}")
+    Path(path).unlink(missing_ok=True)
+
+
+def save_dataset(records: List[Dict], json_path, indent: Optional[int] = 2,
+                 columns: Sequence[str] = CACHE_COLUMNS) -> Optional[Path]:
+    """
+    Speichert Samples als JSON-Export + Arrow-Cache
+
+    Der Cache wird NACH dem JSON geschrieben, damit load_dataset() ihn als
+    aktuell erkennt (mtime Cache >= mtime JSON).
+    """
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=indent, ensure_ascii=False)
+
+    return write_cache(records, cache_path(json_path), columns)
+
+
+def is_cache_fresh(json_path) -> bool:
+    """True wenn ein Arrow-Cache existiert und nicht älter als das JSON ist"""
+    arrow = cache_path(json_path)
+    if not HAS_ARROW or not arrow.exists():
+        return False
+    json_path = Path(json_path)
+    return not json_path.exists() or arrow.stat().st_mtime >= json_path.stat().st_mtime
+
+
+def load_table(path) -> 'pa.Table':
+    """
+    Lädt einen Arrow-Cache per mmap (zero-copy)
+
+    Die Buffer der Tabelle zeigen direkt in die gemappte Datei; kopiert wird
+    erst bei der Konvertierung einzelner Spalten in Python-Objekte.
+    """
+    source = pa.memory_map(str(path), 'r')
+    return pa.ipc.open_file(source).read_all()
+
+
+def load_dataset(json_path, columns: Sequence[str] = ('text', 'label')) -> Dict[str, list]:
+    """
+    Lädt die angegebenen Spalten eines Datasets
+
+    Nutzt den Arrow-Cache, wenn er aktuell ist - sonst Fallback auf das JSON.
+
+    Returns: {spalte: [werte, ...]}
+    """
+    if is_cache_fresh(json_path):
+        table = load_table(cache_path(json_path))
+        print(f"   ⚡ Arrow-Cache: {cache_path(json_path)}")
+        return {name: table.column(name).to_pylist() for name in columns}
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    return {name: [_get_field(item, name) for item in data] for name in columns}
@@ -24,6 +24,8 @@ from sklearn.metrics import (
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from fast_tokenizer import from_word_index
+
 
 class ModelEvaluator:
     """Evaluiert trainiertes KidGuard Model"""
@@ -47,11 +49,7 @@ class ModelEvaluator:
     
     def _build_tokenizer(self):
         """Rekonstruiert Tokenizer aus Metadata"""
-        tokenizer = tf.keras.preprocessing.text.Tokenizer(
-            num_words=self.metadata['vocab_size']
-        )
-        tokenizer.word_index = self.metadata['word_index']
-        return tokenizer
+        return from_word_index(self.metadata['word_index'], num_words=self.metadata['vocab_size'])
     
     def load_test_data(self, test_file: str):
         """Lädt Test-Daten"""
@@ -69,10 +67,8 @@ class ModelEvaluator:
     
     def tokenize(self, texts):
         """Tokenisiert Texte"""
-        seq = self.tokenizer.texts_to_sequences(texts)
-        return tf.keras.preprocessing.sequence.pad_sequences(
-            seq, maxlen=self.metadata['max_length'], padding='post'
-        )
+        return self.tokenizer.encode(texts, max_length=self.metadata['max_length'],
+                                     padding='post', truncating='pre')
     
     def evaluate(self, X_test, y_test):
         """Führt vollständige Evaluation durch"""
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Fast Tokenizer - Ersatz für keras.preprocessing.text.Tokenizer
+===============================================================
+Der Keras-Tokenizer (deprecated, reines Python: translate + split pro Text,
+word_counts/word_docs-Dicts) braucht auf den 190k PAN12-Konversationen
+(bis 5000 Zeichen) Minuten für fit + texts_to_sequences. Außerdem trennt er
+Wörter anders als die App: Android (MLGroomingDetector.tokenize) macht
+
+    text.lowercase().replace(Regex("[^a-zäöüß0-9\\s]"), " ").split(Regex("\\s+"))
+
+und schlägt jedes Wort im exportierten word_index nach (sonst <OOV>).
+Mit Keras-Filtern landen z.B. "café" oder "don't" als ein Wort im Vokabular,
+das die App nie erzeugt.
+
+FastTokenizer:
+- Wörter = maximale Folgen aus [a-zäöüß0-9] im kleingeschriebenen Text
+  (identisch zu Android: alles andere ist Trennzeichen)
+- fit_on_texts: ein kompiliertes findall pro Chunk, Counter pro Worker-
+  Prozess, Merge in Chunk-Reihenfolge
+- word_index wie Keras: <OOV> = 1, dann nach Häufigkeit absteigend,
+  bei Gleichstand nach erstem Vorkommen; num_words begrenzt beim Encoden
+- encode: schreibt direkt in eine vorallokierte int32-Matrix (oder out=,
+  z.B. ein np.memmap)
+
+Usage:
+    tokenizer = FastTokenizer(num_words=CONFIG['vocab_size'], oov_token='<OOV>')
+    tokenizer.fit_on_texts(X_train)
+    X_train_pad = tokenizer.encode(X_train, max_length=CONFIG['max_length'])
+
+    word_index = tokenizer.export_word_index()   # → metadata.json für die App
+"""
+
+import os
+import re
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, repeat
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Wort-Definition der App (MLGroomingDetector.tokenize)
+WORD_PATTERN = re.compile(r'[a-zäöüß0-9]+')
+
+# Texte pro Worker-Aufgabe (fit) bzw. pro Scatter-Schritt (encode)
+FIT_CHUNK = 20000
+ENCODE_CHUNK = 10000
+# Darunter lohnt sich kein Prozess-Pool
+MIN_PARALLEL_TEXTS = 50000
+
+
+def split_words(text: str) -> List[str]:
+    """Wörter eines Texts - gleiche Regeln wie Android"""
+    return WORD_PATTERN.findall(str(text).lower())
+
+
+def _count_words(texts: Sequence[str]) -> Counter:
+    """Wort-Häufigkeiten eines Chunks (Insertion-Order = erstes Vorkommen)"""
+    # Ein findall über den ganzen Chunk; '\n' ist Trennzeichen wie jedes andere
+    return Counter(WORD_PATTERN.findall('\n'.join(map(str, texts)).lower()))
+
+
+class FastTokenizer:
+    """
+    Wort-Tokenizer mit Keras-kompatiblem word_index und Android-Wortgrenzen
+
+    Attribute wie bei Keras: word_index, index_word, word_counts,
+    document_count, num_words, oov_token.
+    """
+
+    def __init__(self, num_words: Optional[int] = None, oov_token: Optional[str] = '<OOV>'):
+        """
+        Args:
+            num_words: Nur IDs < num_words werden erzeugt (Rest → <OOV>)
+            oov_token: Token für unbekannte Wörter (Index 1); None = weglassen
+        """
+        self.num_words = num_words
+        self.oov_token = oov_token
+        self.word_counts: Dict[str, int] = {}
+        self.word_index: Dict[str, int] = {}
+        self.index_word: Dict[int, str] = {}
+        self.document_count = 0
+        self._lookup = None
+
+    def fit_on_texts(self, texts: Sequence[str], workers: Optional[int] = None):
+        """
+        Zählt Wörter (parallel ab MIN_PARALLEL_TEXTS) und baut word_index neu
+
+        Mehrfache Aufrufe akkumulieren die Zählungen wie bei Keras.
+        """
+        texts = texts if isinstance(texts, (list, tuple)) else list(texts)
+        chunks = [texts[i:i + FIT_CHUNK] for i in range(0, len(texts), FIT_CHUNK)]
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+
+        if workers > 1 and len(texts) >= MIN_PARALLEL_TEXTS:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                counts = list(executor.map(_count_words, chunks))
+        else:
+            counts = [_count_words(chunk) for chunk in chunks]
+
+        # In Chunk-Reihenfolge mergen → globale Reihenfolge des ersten Vorkommens
+        merged = Counter(self.word_counts)
+        for chunk_counts in counts:
+            merged.update(chunk_counts)
+
+        self.word_counts = dict(merged)
+        self.document_count += len(texts)
+        self._build_index()
+
+    def _build_index(self):
+        # Stabile Sortierung: Gleichstand behält die Reihenfolge des ersten Vorkommens
+        ranked = sorted(self.word_counts, key=self.word_counts.__getitem__, reverse=True)
+        vocabulary = ([self.oov_token] if self.oov_token is not None else []) + ranked
+        self.word_index = {word: i for i, word in enumerate(vocabulary, start=1)}
+        self.index_word = {i: word for word, i in self.word_index.items()}
+        self._lookup = None
+
+    def _get_lookup(self) -> Dict[str, int]:
+        """word_index, beschränkt auf IDs < num_words"""
+        if self._lookup is None:
+            if self.num_words is None:
+                self._lookup = self.word_index
+            else:
+                self._lookup = {w: i for w, i in self.word_index.items() if i < self.num_words}
+        return self._lookup
+
+    def _ids(self, text: str, limit: Optional[int] = None) -> List[int]:
+        lowered = str(text).lower()
+        if limit is None:
+            words = WORD_PATTERN.findall(lowered)
+        else:
+            # Nur die ersten limit Wörter suchen - lange Texte nicht ganz scannen
+            words = [match.group() for match in islice(WORD_PATTERN.finditer(lowered), limit)]
+
+        lookup = self._get_lookup()
+        oov_id = self.word_index.get(self.oov_token) if self.oov_token is not None else None
+        if oov_id is not None:
+            return list(map(lookup.get, words, repeat(oov_id)))
+        return [lookup[word] for word in words if word in lookup]
+
+    def texts_to_sequences(self, texts: Iterable[str]) -> List[List[int]]:
+        """Wie Keras: Liste von ID-Listen (ohne Padding)"""
+        return [self._ids(text) for text in texts]
+
+    def encode(self, texts: Sequence[str], max_length: int, padding: str = 'post',
+               truncating: str = 'post', out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Tokenisiert + paddet direkt in eine int32-Matrix
+
+        Args:
+            texts: Texte
+            max_length: Sequenzlänge
+            padding: 'post' (App-Verhalten) oder 'pre'
+            truncating: 'post' (erste max_length Wörter, wie die App) oder 'pre'
+            out: Optionales Ziel [len(texts), max_length] (z.B. np.memmap)
+
+        Returns: int32-Matrix [len(texts), max_length], 0 = Padding
+        """
+        if padding not in ('pre', 'post') or truncating not in ('pre', 'post'):
+            raise ValueError(f"padding/truncating muss 'pre' oder 'post' sein: {padding}/{truncating}")
+
+        n = len(texts)
+        if out is None:
+            out = np.zeros((n, max_length), dtype=np.int32)
+        else:
+            if out.shape != (n, max_length):
+                raise ValueError(f"out hat Shape {out.shape}, erwartet {(n, max_length)}")
+            out[...] = 0
+
+        for start in range(0, n, ENCODE_CHUNK):
+            rows = []
+            for text in texts[start:start + ENCODE_CHUNK]:
+                if truncating == 'post' and self.oov_token is not None:
+                    rows.append(self._ids(text, limit=max_length))
+                else:
+                    ids = self._ids(text)
+                    rows.append(ids[:max_length] if truncating == 'post' else ids[-max_length:])
+
+            # Alle IDs des Chunks in einem Scatter schreiben
+            lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+            total = int(lengths.sum())
+            if total == 0:
+                continue
+            flat = np.fromiter(chain.from_iterable(rows), dtype=np.int32, count=total)
+            row_index = np.repeat(np.arange(start, start + len(rows)), lengths)
+            offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+            col_index = np.arange(total) - offsets
+            if padding == 'pre':
+                col_index += np.repeat(max_length - lengths, lengths)
+            out[row_index, col_index] = flat
+
+        return out
+
+    def export_word_index(self) -> Dict[str, int]:
+        """word_index für die App-Metadata (nur IDs < num_words, inkl. <OOV>)"""
+        return dict(self._get_lookup())
+
+    def get_config(self) -> dict:
+        return {
+            'num_words': self.num_words,
+            'oov_token': self.oov_token,
+            'word_pattern': WORD_PATTERN.pattern,
+            'document_count': self.document_count,
+            'word_counts': self.word_counts,
+            'word_index': self.word_index,
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps({'class_name': 'FastTokenizer', 'config': self.get_config()},
+                          ensure_ascii=False, **kwargs)
+
+
+def tokenizer_from_json(json_string: str) -> FastTokenizer:
+    """Gegenstück zu FastTokenizer.to_json()"""
+    config = json.loads(json_string)['config']
+    if config.get('word_pattern', WORD_PATTERN.pattern) != WORD_PATTERN.pattern:
+        raise ValueError(f"Tokenizer wurde mit anderem Wort-Muster erstellt: {config['word_pattern']}")
+
+    tokenizer = FastTokenizer(num_words=config['num_words'], oov_token=config['oov_token'])
+    tokenizer.document_count = config['document_count']
+    tokenizer.word_counts = config['word_counts']
+    tokenizer.word_index = {word: int(i) for word, i in config['word_index'].items()}
+    tokenizer.index_word = {i: word for word, i in tokenizer.word_index.items()}
+    return tokenizer
+
+
+def from_word_index(word_index: Dict[str, int], num_words: Optional[int] = None,
+                    oov_token: Optional[str] = '<OOV>') -> FastTokenizer:
+    """Tokenizer aus einem exportierten word_index (z.B. metadata.json) rekonstruieren"""
+    tokenizer = FastTokenizer(num_words=num_words, oov_token=oov_token)
+    tokenizer.word_index = {word: int(i) for word, i in word_index.items()}
+    tokenizer.index_word = {i: word for word, i in tokenizer.word_index.items()}
+    return tokenizer
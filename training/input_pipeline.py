@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Input Pipeline - tf.data mit On-the-fly Augmentation
+=====================================================
+Statt augmentierte Kopien vorab in Listen (oder auf Platte) zu erzeugen,
+wird jede Batch im Input-Pipeline-Graph neu augmentiert:
+
+- Synonym-Ersetzung auf Token-IDs (Lookup-Tabelle Wort-ID → Synonym-IDs)
+- Zeichen-Rauschen: ein Tippfehler macht aus einem bekannten Wort ein
+  OOV-Token - genau das wird simuliert (Token → <OOV>)
+- Pro Klasse steuerbar (class_probs): nur Minderheits-Klassen werden
+  augmentiert, jede Epoche anders
+- Läuft parallel in den tf.data-Worker-Threads (num_parallel_calls)
+
+Der Datensatz bleibt einmal im Speicher; Augmentierung kostet keinen RAM.
+
+Length Bucketing (bucket_lengths): Sequenzen werden auf ihre echte Länge
+gekürzt und nach Länge in Batches gruppiert (bucket_by_sequence_length),
+die nur bis zur Bucket-Grenze gepaddet sind. Kurze Chat-Nachrichten zahlen
+so keine LSTM-Schritte mehr für max_length. Das Modell braucht dafür
+Input(shape=(None,)); für den TFLite-Export fixiert fixed_length_model()
+die Länge wieder.
+
+Class-Balanced Sampling (class_balance): statt SMOTE (balancierte Kopie
+des Datensatzes, interpolierte Token-IDs) werden Indizes pro Klasse
+gezogen - Minderheitsklassen mit höherer Rate, jede Epoche neu gemischt.
+Kein zusätzlicher Speicher, kein k-NN-Durchlauf.
+
+Usage:
+    augmenter = TokenAugmenter(tokenizer.word_index, CONFIG['vocab_size'],
+                               class_probs={1: 0.5})
+    train_ds = make_dataset(X_train, y_train, batch_size=16, augmenter=augmenter)
+    model.fit(train_ds, epochs=...)
+
+    buckets = default_bucket_lengths(CONFIG['max_length'])
+    train_ds = make_dataset(X_train, y_train, batch_size=64, bucket_lengths=buckets)
+
+    train_ds = make_dataset(X_train, y_train, batch_size=64, class_balance=1.0)
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+# Deutsche Synonyme (nur Ein-Wort-Synonyme im Vokabular werden genutzt)
+SYNONYMS = {
+    'allein': ['alleine', 'solo'],
+    'treffen': ['sehen', 'besuchen', 'zusammenkommen'],
+    'geheim': ['privat'],
+    'robux': ['v-bucks', 'geld', 'coins'],
+    'bild': ['foto', 'pic', 'selfie'],
+    'schicken': ['senden', 'zeigen', 'geben'],
+    'geheimnis': ['secret'],
+    'geschenk': ['präsent', 'überraschung', 'belohnung'],
+    'reif': ['erwachsen', 'mature', 'älter'],
+    'verstehen': ['kapieren', 'checken', 'nachvollziehen'],
+    'besonders': ['speziell', 'einzigartig', 'anders'],
+}
+
+OOV_ID = 1  # Tokenizer(oov_token='<OOV>') → Index 1
+PAD_ID = 0
+
+
+class TokenAugmenter:
+    """
+    Batch-Augmentierung auf Token-IDs (reine TF-Ops, graph-kompatibel)
+
+    Für jedes Sample entscheidet class_probs[klasse], ob es augmentiert wird;
+    innerhalb eines augmentierten Samples wird jedes Token mit synonym_prob
+    durch ein Synonym und mit noise_prob durch <OOV> ersetzt.
+    """
+
+    def __init__(self, word_index: Dict[str, int], vocab_size: int,
+                 synonyms: Dict[str, List[str]] = None,
+                 class_probs: Dict[int, float] = None,
+                 synonym_prob: float = 0.15, noise_prob: float = 0.05,
+                 oov_id: int = OOV_ID):
+        """
+        Args:
+            word_index: tokenizer.word_index
+            vocab_size: Tokenizer num_words (IDs >= vocab_size kommen nicht vor)
+            synonyms: Wort → Synonyme (Default: SYNONYMS)
+            class_probs: Klasse → Wahrscheinlichkeit, ein Sample zu augmentieren
+                         (fehlende Klassen: 0 = nie)
+            synonym_prob: Pro Token: Wahrscheinlichkeit für Synonym-Ersetzung
+            noise_prob: Pro Token: Wahrscheinlichkeit für <OOV> (Tippfehler)
+            oov_id: ID des OOV-Tokens
+        """
+        self.vocab_size = vocab_size
+        self.synonym_prob = synonym_prob
+        self.noise_prob = noise_prob
+        self.oov_id = oov_id
+        class_probs = class_probs if class_probs is not None else {1: 0.5}
+
+        # Synonym-Tabelle [vocab_size, max_synonyme] + Anzahl pro Wort-ID
+        candidates = {}
+        for word, replacements in (synonyms or SYNONYMS).items():
+            word_id = word_index.get(word)
+            if word_id is None or word_id >= vocab_size:
+                continue
+            ids = [word_index[r] for r in replacements
+                   if r in word_index and word_index[r] < vocab_size]
+            if ids:
+                candidates[word_id] = ids
+
+        max_candidates = max((len(ids) for ids in candidates.values()), default=1)
+        table = np.zeros((vocab_size, max_candidates), dtype=np.int32)
+        counts = np.zeros(vocab_size, dtype=np.int32)
+        for word_id, ids in candidates.items():
+            table[word_id, :len(ids)] = ids
+            counts[word_id] = len(ids)
+
+        self.num_synonym_words = len(candidates)
+        self._synonym_table = tf.constant(table)
+        self._synonym_counts = tf.constant(counts)
+        self._class_probs = tf.lookup.StaticHashTable(
+            tf.lookup.KeyValueTensorInitializer(
+                tf.constant(list(class_probs.keys()), dtype=tf.int64),
+                tf.constant(list(class_probs.values()), dtype=tf.float32)
+            ),
+            default_value=0.0
+        )
+
+    def __call__(self, ids: tf.Tensor, classes: tf.Tensor, seed: tf.Tensor) -> tf.Tensor:
+        """
+        Augmentiert eine Batch
+
+        Args:
+            ids: Token-IDs [batch, max_length]
+            classes: Klasse pro Sample [batch] (steuert class_probs)
+            seed: Stateless-Seed [2] (pro Batch verschieden)
+        """
+        input_dtype = ids.dtype
+        ids = tf.minimum(tf.cast(ids, tf.int32), self.vocab_size - 1)
+        shape = tf.shape(ids)
+        seeds = tf.random.experimental.stateless_split(seed, num=4)
+
+        # Welche Samples werden augmentiert?
+        sample_probs = self._class_probs.lookup(tf.cast(classes, tf.int64))
+        selected = tf.random.stateless_uniform(shape[:1], seed=seeds[0]) < sample_probs
+        selected = selected[:, tf.newaxis]
+
+        # Synonym-Ersetzung
+        counts = tf.gather(self._synonym_counts, ids)
+        choice = tf.cast(tf.random.stateless_uniform(shape, seed=seeds[1]) *
+                         tf.cast(counts, tf.float32), tf.int32)
+        choice = tf.minimum(choice, tf.maximum(counts - 1, 0))
+        synonyms = tf.gather_nd(self._synonym_table, tf.stack([ids, choice], axis=-1))
+        replace = selected & (counts > 0) & \
+            (tf.random.stateless_uniform(shape, seed=seeds[2]) < self.synonym_prob)
+        ids = tf.where(replace, synonyms, ids)
+
+        # Zeichen-Rauschen → <OOV> (Padding und OOV bleiben unverändert)
+        noise = selected & (ids > self.oov_id) & \
+            (tf.random.stateless_uniform(shape, seed=seeds[3]) < self.noise_prob)
+        ids = tf.where(noise, tf.fill(shape, self.oov_id), ids)
+
+        return tf.cast(ids, input_dtype)
+
+
+def sequence_lengths(x: np.ndarray) -> np.ndarray:
+    """Länge bis zum letzten Nicht-Padding-Token (post-gepaddete Sequenzen)"""
+    nonzero = np.asarray(x) != PAD_ID
+    return np.where(nonzero.any(axis=1), x.shape[1] - np.argmax(nonzero[:, ::-1], axis=1), 0)
+
+
+def default_bucket_lengths(max_length: int, smallest: int = 8) -> List[int]:
+    """Zweierpotenzen ab smallest unter max_length, plus max_length (z.B. 8, 16, 32, 64, 100)"""
+    lengths = []
+    length = smallest
+    while length < max_length:
+        lengths.append(length)
+        length *= 2
+    return lengths + [max_length]
+
+
+def class_sampling_weights(counts: Sequence[int], balance: float) -> np.ndarray:
+    """
+    Ziehwahrscheinlichkeit pro Klasse ∝ count^(1 - balance)
+
+    balance 0.0 = natürliche Verteilung, 1.0 = alle Klassen gleich häufig,
+    dazwischen abgeschwächtes Oversampling der Minderheitsklassen.
+    """
+    if not 0.0 <= balance <= 1.0:
+        raise ValueError(f"class_balance muss zwischen 0 und 1 liegen: {balance}")
+    weights = np.asarray(counts, dtype=np.float64) ** (1.0 - balance)
+    return weights / weights.sum()
+
+
+def _balanced_dataset(x: np.ndarray, y, classes: np.ndarray, balance: float,
+                      seed: int, trim: bool) -> tf.data.Dataset:
+    """
+    Endlose, gemischte Index-Ströme pro Klasse, gewichtet gezogen
+    (class_sampling_weights), len(x) Samples pro Epoche → (ids, targets, klasse)
+    """
+    present, counts = np.unique(classes, return_counts=True)
+    weights = class_sampling_weights(counts, balance)
+
+    per_class = [
+        tf.data.Dataset.from_tensor_slices(np.flatnonzero(classes == label).astype(np.int64))
+        .shuffle(int(count), seed=seed + i, reshuffle_each_iteration=True)
+        .repeat()
+        for i, (label, count) in enumerate(zip(present, counts))
+    ]
+    indices = tf.data.Dataset.sample_from_datasets(
+        per_class, weights=weights.tolist(), seed=seed, rerandomize_each_iteration=True
+    ).take(len(x))
+
+    x_tensor = tf.constant(x)
+    y_tensors = tf.nest.map_structure(tf.constant, y)
+    class_tensor = tf.constant(classes)
+    lengths = tf.constant(sequence_lengths(x).astype(np.int32)) if trim else None
+
+    def lookup(index):
+        ids = tf.gather(x_tensor, index)
+        if trim:
+            ids = ids[:tf.gather(lengths, index)]
+        targets = tf.nest.map_structure(lambda tensor: tf.gather(tensor, index), y_tensors)
+        return ids, targets, tf.gather(class_tensor, index)
+
+    return indices.map(lookup, num_parallel_calls=tf.data.AUTOTUNE)
+
+
+def make_dataset(x: np.ndarray, y, classes: Optional[np.ndarray] = None,
+                 batch_size: int = 32, augmenter: TokenAugmenter = None,
+                 shuffle: bool = True, seed: int = 42,
+                 bucket_lengths: Optional[Sequence[int]] = None,
+                 cache: bool = True,
+                 class_balance: Optional[float] = None,
+                 drop_remainder: bool = False) -> tf.data.Dataset:
+    """
+    Trainings-Dataset: (kürzen → cache) → shuffle → batch/bucket → (augment) → prefetch
+
+    Args:
+        x: Gepaddete Sequenzen [n, max_length] (bei Bucketing post-gepaddet)
+        y: Targets (Array oder Dict von Arrays bei Multi-Output-Modellen)
+        classes: Klasse pro Sample für class_probs (Default: y, falls Array;
+                 ohne augmenter nicht nötig)
+        batch_size: Batch-Größe
+        augmenter: TokenAugmenter oder None (keine Augmentierung)
+        shuffle: Jede Epoche neu mischen
+        seed: Seed für Shuffle + Augmentierung (jede Epoche andere Varianten)
+        bucket_lengths: Aufsteigende Pad-Längen der Buckets (letzte >= längste
+                        Sequenz, z.B. default_bucket_lengths(max_length));
+                        None = alle Batches auf max_length
+        cache: Gekürzte Sequenzen nach der ersten Epoche im Speicher halten (Bucketing)
+        class_balance: Class-Balanced Sampling nach classes (0.0-1.0, siehe
+                       class_sampling_weights); ersetzt shuffle, None = aus
+        drop_remainder: Unvollständige Batches verwerfen - nur feste Batch-Shapes
+                        (XLA kompiliert sonst jede Rest-Batch-Größe neu)
+    """
+    if classes is None:
+        if isinstance(y, dict):
+            if augmenter is not None:
+                raise ValueError("classes muss bei Dict-Targets angegeben werden")
+            classes = np.zeros(len(x), dtype=np.int64)
+        else:
+            classes = y
+
+    classes = np.asarray(classes, dtype=np.int64)
+
+    if class_balance is not None:
+        # Indizes statt Samples ziehen - Arrays bleiben einmal im Speicher
+        dataset = _balanced_dataset(x, y, classes, class_balance, seed, trim=bucket_lengths is not None)
+    else:
+        dataset = tf.data.Dataset.from_tensor_slices((x, y, classes))
+
+        if bucket_lengths is not None:
+            # Padding abschneiden; Länge vorab in numpy berechnet
+            lengths = tf.data.Dataset.from_tensor_slices(sequence_lengths(x).astype(np.int32))
+            dataset = tf.data.Dataset.zip((dataset, lengths)).map(
+                lambda sample, length: (sample[0][:length], sample[1], sample[2]),
+                num_parallel_calls=tf.data.AUTOTUNE
+            )
+            if cache:
+                dataset = dataset.cache()
+
+        if shuffle:
+            dataset = dataset.shuffle(len(x), seed=seed, reshuffle_each_iteration=True)
+
+    if bucket_lengths is None:
+        dataset = dataset.batch(batch_size, drop_remainder=drop_remainder)
+    else:
+        # pad_to_bucket_boundary padded auf Grenze - 1 → Grenzen = Längen + 1;
+        # nur len(bucket_lengths) feste Shapes → kein Retracing pro Batch
+        boundaries = [length + 1 for length in bucket_lengths]
+        dataset = dataset.bucket_by_sequence_length(
+            element_length_func=lambda ids, targets, classes: tf.shape(ids)[0],
+            bucket_boundaries=boundaries,
+            bucket_batch_sizes=[batch_size] * (len(boundaries) + 1),
+            pad_to_bucket_boundary=True,
+            drop_remainder=drop_remainder
+        )
+
+    if augmenter is None:
+        dataset = dataset.map(lambda features, targets, _: (features, targets),
+                              num_parallel_calls=tf.data.AUTOTUNE)
+    else:
+        # Ein Seed-Paar pro Batch, jede Iteration (Epoche) neu gezogen
+        batch_seeds = tf.data.Dataset.random(seed=seed, rerandomize_each_iteration=True).batch(2)
+        dataset = tf.data.Dataset.zip((dataset, batch_seeds)).map(
+            lambda batch, batch_seed: (augmenter(batch[0], batch[2], batch_seed), batch[1]),
+            num_parallel_calls=tf.data.AUTOTUNE
+        )
+
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def split_validation(x: np.ndarray, y, validation_split: float) -> Tuple[tuple, tuple]:
+    """
+    Wie model.fit(validation_split=...): die letzten validation_split Samples
+    (vor dem Mischen) werden Validierung - fit() kann das bei Datasets nicht
+
+    Returns: ((x_train, y_train), (x_val, y_val))
+    """
+    split_at = int(len(x) * (1.0 - validation_split))
+    if isinstance(y, dict):
+        y_train = {k: v[:split_at] for k, v in y.items()}
+        y_val = {k: v[split_at:] for k, v in y.items()}
+    else:
+        y_train, y_val = y[:split_at], y[split_at:]
+    return (x[:split_at], y_train), (x[split_at:], y_val)
+
+
+def fixed_length_model(model: tf.keras.Model, max_length: int, batch_size: Optional[int] = 1) -> tf.keras.Model:
+    """
+    Kopie eines Modells mit Input(shape=(None,)) mit fester Eingabe-Shape
+    (TFLite-Export: die App übergibt immer [1, max_length]; mit statischer
+    Batch-Größe lassen sich auch maskierte LSTMs ohne Select-TF-Ops konvertieren)
+    """
+    inputs = tf.keras.Input(batch_shape=(batch_size, max_length), dtype=model.inputs[0].dtype)
+    fixed = tf.keras.models.clone_model(model, input_tensors=inputs)
+    fixed.set_weights(model.get_weights())
+    return fixed
+
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+JSONL Dataset - Streaming Reader/Writer für Trainings-Datasets
+==============================================================
+Generator-API, über die translate → augment → combine mit konstantem
+Speicherbedarf laufen: jede Stage liest Samples einzeln und schreibt sie
+sofort wieder weg.
+
+- iter_records(): liest .jsonl zeilenweise ODER ein JSON-Array inkrementell
+- write_records() / RecordWriter: schreibt .jsonl oder ein JSON-Array
+  (Format wie json.dump(indent=2))
+- JsonlWriter: Append-Writer mit resume=True → setzt nach dem letzten
+  vollständigen Sample fort (abgebrochene letzte Zeile wird verworfen)
+- shuffle_buffer(): Shuffle mit begrenztem Puffer statt random.shuffle(liste)
+- iter_with_ids(): stabile Sample-IDs (Content-Hash) für ID-basiertes Resume
+- write_json_atomic(): Checkpoint-/State-Dateien atomar schreiben
+
+Usage:
+    from jsonl_dataset import iter_records, JsonlWriter
+
+    with JsonlWriter('out.jsonl', resume=True) as writer:
+        for sample in islice(iter_records('in.jsonl'), writer.count, None):
+            writer.write(transform(sample))
+"""
+
+import os
+import json
+import random
+import hashlib
+import textwrap
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+JSONL_SUFFIX = '.jsonl'
+SAMPLE_ID_KEY = 'sample_id'
+READ_CHUNK_SIZE = 1 << 20  # 1 MB
+FLUSH_EVERY = 1000
+
+
+def is_jsonl(path) -> bool:
+    return Path(path).suffix == JSONL_SUFFIX
+
+
+def iter_records(path) -> Iterator[Dict]:
+    """Liefert die Samples eines .jsonl- oder .json-Datasets einzeln"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if is_jsonl(path):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(f)
+
+
+def _iter_json_array(f) -> Iterator[Dict]:
+    """
+    Parst ein JSON-Array Element für Element
+
+    Es wird nie mehr als ein Element (plus ein Lese-Chunk) im Speicher gehalten.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    started = False
+
+    while True:
+        # Whitespace / Kommas überspringen, bei Bedarf nachladen
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(READ_CHUNK_SIZE), 0
+            eof = not buffer
+
+        if pos >= len(buffer):
+            if started:
+                raise ValueError("JSON-Array nicht abgeschlossen (fehlendes ']')")
+            return
+
+        if not started:
+            if buffer[pos] != '[':
+                raise ValueError("Dataset ist kein JSON-Array")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            # Element muss vollständig im Puffer liegen (z.B. Zahlen am Chunk-Ende)
+            if end == len(buffer) and not eof:
+                raise json.JSONDecodeError("chunk boundary", buffer, end)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        yield item
+        pos = end
+
+
+def count_records(path) -> int:
+    """Anzahl Samples (streamend, ohne das Dataset zu laden)"""
+    if not Path(path).exists():
+        return 0
+    return sum(1 for _ in iter_records(path))
+
+
+class RecordWriter:
+    """
+    Schreibt Samples einzeln nach path (.jsonl oder JSON-Array)
+
+    Geschrieben wird in eine .tmp-Datei, die erst bei close() atomar ersetzt
+    wird - ein abgebrochener Lauf hinterlässt kein halbes Dataset.
+    """
+
+    def __init__(self, path, indent: Optional[int] = 2):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.indent = indent
+        self.count = 0
+        self._jsonl = is_jsonl(self.path)
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            self._tmp_path.unlink()
+
+    def write(self, record: Dict):
+        if self._jsonl:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        elif self.indent is None:
+            item_json = json.dumps(record, ensure_ascii=False)
+            self._file.write(('[' if self.count == 0 else ', ') + item_json)
+        else:
+            # Gleiche Formatierung wie json.dump(..., indent=indent)
+            item_json = json.dumps(record, indent=self.indent, ensure_ascii=False)
+            item_json = textwrap.indent(item_json, ' ' * self.indent)
+            self._file.write(('[\n' if self.count == 0 else ',\n') + item_json)
+        self.count += 1
+
+    def write_all(self, records: Iterable[Dict]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if self._file.closed:
+            return
+        if not self._jsonl:
+            if self.count == 0:
+                self._file.write('[]')
+            else:
+                self._file.write(']' if self.indent is None else '\n]')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+
+def write_records(records: Iterable[Dict], path, indent: Optional[int] = 2) -> int:
+    """
+    Schreibt Samples streamend nach path (.jsonl oder JSON-Array)
+
+    Returns: Anzahl geschriebener Samples
+    """
+    with RecordWriter(path, indent) as writer:
+        writer.write_all(records)
+    return writer.count
+
+
+class JsonlWriter:
+    """
+    Append-Writer für .jsonl mit Resume
+
+    Mit resume=True bleiben vorhandene Samples erhalten; count enthält ihre
+    Anzahl, sodass die Stage die ersten count Eingaben überspringen kann.
+    """
+
+    def __init__(self, path, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+
+        if resume and self.path.exists():
+            self.count = self._truncate_partial_line()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+
+    def _truncate_partial_line(self) -> int:
+        """Schneidet eine unvollständige letzte Zeile ab → Anzahl vollständiger Samples"""
+        count = 0
+        valid_end = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                valid_end += len(line)
+                if line.strip():
+                    count += 1
+
+        if valid_end < self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+            print(f"   ✂️  Unvollständige letzte Zeile verworfen: {self.path}")
+
+        return count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+        if self.count % FLUSH_EVERY == 0:
+            self._file.flush()
+
+    def write_all(self, records: Iterable[Dict]):
+        for record in records:
+            self.write(record)
+
+    def checkpoint(self) -> int:
+        """Schreibt alle Samples bis hierher dauerhaft auf Platte → Datei-Offset"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+def shuffle_buffer(records: Iterable[Dict], buffer_size: int = 10000,
+                   rng: random.Random = None) -> Iterator[Dict]:
+    """
+    Shuffle mit begrenztem Puffer (wie tf.data.Dataset.shuffle)
+
+    Bei buffer_size >= Anzahl Samples entspricht das einem vollständigen Shuffle.
+    """
+    rng = rng or random.Random(42)
+    buffer = []
+
+    for record in records:
+        if len(buffer) < buffer_size:
+            buffer.append(record)
+            continue
+        i = rng.randrange(buffer_size)
+        yield buffer[i]
+        buffer[i] = record
+
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def sample_digest(record: Dict) -> str:
+    """Content-Hash über text, label und source"""
+    content = json.dumps([record.get('text'), record.get('label'), record.get('source')],
+                         ensure_ascii=False)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def iter_with_ids(records: Iterable[Dict], key: str = SAMPLE_ID_KEY) -> Iterator[Dict]:
+    """
+    Ergänzt jedes Sample um eine stabile ID (vorhandene IDs bleiben)
+
+    ID = Content-Hash; identische Samples werden durchnummeriert
+    ("<hash>-1", "<hash>-2", ...). Solange sich das Input-Dataset nicht
+    ändert, bekommt jedes Sample in jedem Lauf dieselbe ID.
+    """
+    occurrences = Counter()
+
+    for record in records:
+        if key not in record:
+            digest = sample_digest(record)
+            n = occurrences[digest]
+            occurrences[digest] += 1
+            record[key] = digest if n == 0 else f"{digest}-{n}"
+        yield record
+
+
+def write_json_atomic(obj, path):
+    """Schreibt obj als JSON über .tmp + os.replace (nie halb geschrieben)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Language ID - Batch-Spracherkennung über Stopwort-Vektoren
+==========================================================
+Ersetzt die 12 einzelnen re.search-Aufrufe pro Sample in
+DatasetTranslator.is_english:
+
+- EIN kompiliertes Trie-Regex (alle Stopwörter aller Sprachen) läuft per
+  findall über den ganzen Batch auf einmal (Texte mit '\\0' verbunden,
+  das Trennzeichen wird mitgematcht)
+- Treffer → (Text, Stopwort)-Präsenzmatrix → numpy: Anzahl verschiedener
+  Stopwörter pro Text und Sprache (Score-Matrix)
+- Ergebnis-Cache pro Sample: Zähl-Durchlauf + Übersetzungs-Durchlauf
+  erkennen jeden Text nur einmal
+
+Entscheidungsregel wie bisher: Sprache erkannt, wenn mindestens
+min_matches verschiedene Stopwörter dieser Sprache vorkommen.
+
+Usage:
+    language_id = LanguageIdentifier()
+    mask = language_id.english_mask(texts)   # np.ndarray[bool]
+    language_id.detect(texts)                # ['en', 'de', 'unknown', ...]
+"""
+
+import re
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from stage_matcher import trie_regex
+
+# Stopwörter pro Sprache ('en' = bisherige englische Indikatoren)
+STOPWORDS = {
+    'en': ['you', 'are', 'your', 'the', 'is', 'do', 'did', 'can',
+           'what', 'where', 'when', 'how'],
+    'de': ['du', 'bist', 'ich', 'und', 'nicht', 'ist', 'das', 'der', 'die',
+           'wie', 'wo', 'wann', 'hast', 'kannst', 'mit', 'mir', 'dich', 'dein'],
+}
+
+MIN_MATCHES = 2
+DEFAULT_CACHE_SIZE = 200000
+SEPARATOR = '\0'
+
+
+class LanguageIdentifier:
+    """
+    Stopwort-Scorer für ganze Text-Arrays
+
+    Ein Wort darf in mehreren Sprachen vorkommen (z.B. 'was'); es zählt dann
+    für jede dieser Sprachen.
+    """
+
+    def __init__(self, stopwords: Dict[str, List[str]] = None, min_matches: int = MIN_MATCHES,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            stopwords: Sprache → Stopwörter (Default: STOPWORDS)
+            min_matches: Mindestanzahl verschiedener Stopwörter pro Sprache
+            cache_size: Max. Einträge im Ergebnis-Cache (pro Sprache)
+        """
+        stopwords = stopwords or STOPWORDS
+        self.languages = list(stopwords)
+        self.min_matches = min_matches
+        self.cache_size = cache_size
+        self._cache: Dict[str, Dict[int, bool]] = {lang: {} for lang in self.languages}
+
+        # Wort → Index; Wort-Sprach-Matrix für die Score-Berechnung
+        words = sorted({word.lower() for lang_words in stopwords.values() for word in lang_words})
+        self._num_words = len(words)
+        self._word_languages = np.zeros((len(words), len(self.languages)), dtype=np.int32)
+        self._word_index = {word: i for i, word in enumerate(words)}
+        for j, lang in enumerate(self.languages):
+            for word in stopwords[lang]:
+                self._word_languages[self._word_index[word.lower()], j] = 1
+
+        # Trennzeichen bekommt den Index hinter dem letzten Wort
+        self._word_index[SEPARATOR] = self._num_words
+        self._pattern = re.compile(re.escape(SEPARATOR) + r'|\b(?:' + trie_regex(words) + r')\b')
+
+    def scores(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Anzahl verschiedener Stopwörter pro Text und Sprache
+
+        Returns: int-Matrix (len(texts), len(self.languages))
+        """
+        n = len(texts)
+        if n == 0:
+            return np.zeros((0, len(self.languages)), dtype=np.int32)
+
+        joined = SEPARATOR.join((text or '').lower().replace(SEPARATOR, ' ') for text in texts)
+        tokens = self._pattern.findall(joined)
+        ids = np.fromiter(map(self._word_index.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+
+        # Text-Index = Anzahl Trennzeichen davor
+        is_separator = ids == self._num_words
+        text_ids = np.cumsum(is_separator)[~is_separator]
+
+        # Jedes Stopwort zählt pro Text nur einmal
+        presence = np.zeros((n, self._num_words), dtype=np.int32)
+        presence[text_ids, ids[~is_separator]] = 1
+
+        return presence @ self._word_languages
+
+    def language_mask(self, texts: Sequence[str], lang: str) -> np.ndarray:
+        """Bool-Array: Text ist (wahrscheinlich) in Sprache lang - mit Cache"""
+        cache = self._cache[lang]
+        column = self.languages.index(lang)
+
+        keys = [hash(text) for text in texts]
+        mask = np.zeros(len(texts), dtype=bool)
+        missing = []
+        for i, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                mask[i] = cached
+
+        if missing:
+            detected = self.scores([texts[i] for i in missing])[:, column] >= self.min_matches
+            mask[missing] = detected
+
+            if len(cache) + len(missing) > self.cache_size:
+                cache.clear()
+            for i, value in zip(missing, detected.tolist()):
+                cache[keys[i]] = value
+
+        return mask
+
+    def english_mask(self, texts: Sequence[str]) -> np.ndarray:
+        return self.language_mask(texts, 'en')
+
+    def is_english(self, text: str) -> bool:
+        return bool(self.english_mask([text])[0])
+
+    def detect(self, texts: Sequence[str]) -> List[str]:
+        """Sprache mit dem höchsten Score pro Text ('unknown' unter min_matches)"""
+        scores = self.scores(texts)
+        if len(texts) == 0:
+            return []
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(texts)), best]
+        return [self.languages[j] if score >= self.min_matches else 'unknown'
+                for j, score in zip(best.tolist(), best_scores.tolist())]
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Model Export - Float-SavedModel neben dem .tflite
+=================================================
+Die Trainer speichern zusätzlich zum .tflite das Float-Modell als
+SavedModel (<stem>_saved_model). Daraus erzeugt
+ml_training/quantize_model.py --auto die INT8/float16/Dynamic-Range-
+Varianten, statt ein bereits konvertiertes .tflite erneut zu quantisieren.
+
+Usage:
+    export_saved_model(model, 'models/grooming_detector.tflite', max_length=200)
+    saved_model_dir('models/grooming_detector.tflite')
+    # → models/grooming_detector_saved_model
+"""
+
+import os
+import shutil
+
+import tensorflow as tf
+
+SAVED_MODEL_SUFFIX = '_saved_model'
+
+
+def saved_model_dir(tflite_path: str) -> str:
+    """SavedModel-Verzeichnis neben einem .tflite: <dir>/<stem>_saved_model"""
+    return os.path.splitext(tflite_path)[0] + SAVED_MODEL_SUFFIX
+
+
+def export_saved_model(model: tf.keras.Model, tflite_path: str, max_length: int) -> str:
+    """
+    Speichert das Float-Modell als SavedModel neben dem .tflite
+
+    Signatur wie in der App: float32 [1, max_length].
+
+    Returns: Pfad des SavedModel-Verzeichnisses
+    """
+    directory = saved_model_dir(tflite_path)
+    signature = [tf.TensorSpec([1, max_length], tf.float32, name='input')]
+    shutil.rmtree(directory, ignore_errors=True)
+    if int(tf.keras.__version__.split('.')[0]) >= 3:
+        model.export(directory, input_signature=signature, verbose=False)
+    else:
+        # Keras 2: export() kennt keine input_signature
+        serve = tf.function(lambda x: model(x, training=False)).get_concrete_function(*signature)
+        tf.saved_model.save(model, directory, signatures=serve)
+    return directory
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection - MinHash + LSH über Zeichen-Shingles
+==============================================================
+Exakte Deduplizierung (text.strip().lower()) übersieht augmentierte,
+übersetzte und rückübersetzte Varianten desselben Samples. Dieser Index
+findet Texte mit hoher Jaccard-Ähnlichkeit ihrer Zeichen-Shingles:
+
+- MinHash-Signatur pro Text (num_perm Hash-Permutationen, numpy)
+- LSH: Signatur in bands × rows zerlegt; nur Texte mit mindestens einem
+  identischen Band werden verglichen → Aufwand ~linear statt quadratisch
+- Kandidaten werden über die geschätzte Jaccard-Ähnlichkeit bestätigt
+
+Usage:
+    index = NearDuplicateIndex(threshold=0.8)
+    for key, text in samples:
+        if index.add_if_new(key, text) is None:
+            keep(key)
+
+    leaks = cross_split_duplicates(train_texts, test_texts)
+"""
+
+import re
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 5
+# Verpasste Duplikate wiegen schwerer als zusätzliche Kandidaten -
+# Kandidaten werden ohnehin über die Signatur bestätigt
+FALSE_NEGATIVE_WEIGHT = 4.0
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> set:
+    """Zeichen-k-Gramme des normalisierten Texts (klein, Whitespace vereinheitlicht)"""
+    normalized = _WHITESPACE.sub(' ', text.strip().lower())
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def optimal_bands(threshold: float, num_perm: int,
+                  false_negative_weight: float = FALSE_NEGATIVE_WEIGHT) -> Tuple[int, int]:
+    """
+    (bands, rows) mit bands * rows <= num_perm, die die gewichtete Fläche
+    aus False Positives (Ähnlichkeit < threshold, aber Kandidat) und False
+    Negatives (Ähnlichkeit >= threshold, aber kein Kandidat) minimieren
+    """
+    similarities = np.linspace(0.0, 1.0, 1001)
+    below = similarities < threshold
+
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        candidate_prob = 1.0 - (1.0 - similarities ** rows) ** bands
+        error = candidate_prob[below].sum() + \
+            false_negative_weight * (1.0 - candidate_prob[~below]).sum()
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """
+    LSH-Index über MinHash-Signaturen
+
+    Speicher pro Sample: num_perm * 4 Bytes Signatur + bands Bucket-Einträge.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 42):
+        """
+        Args:
+            threshold: Ab dieser (geschätzten) Jaccard-Ähnlichkeit gilt ein Text als Duplikat
+            num_perm: Anzahl MinHash-Permutationen (Genauigkeit vs. Speicher)
+            shingle_size: Länge der Zeichen-Shingles
+            seed: Seed für die Hash-Permutationen
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)[:, np.newaxis]
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)[:, np.newaxis]
+
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._keys: List[Hashable] = []
+        self._signatures: List[np.ndarray] = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash-Signatur (uint32[num_perm])"""
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in shingles(text, self.shingle_size)),
+            dtype=np.uint64
+        )
+        permuted = ((self._a * hashes + self._b) % MERSENNE_PRIME) & MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def query(self, text: str = None, signature: np.ndarray = None) -> Optional[Tuple[Hashable, float]]:
+        """
+        Ähnlichster bereits indizierter Text über threshold
+
+        Returns: (key, geschätzte Jaccard-Ähnlichkeit) oder None
+        """
+        if signature is None:
+            signature = self.signature(text)
+
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        best = None
+        for candidate in candidates:
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (self._keys[candidate], similarity)
+        return best
+
+    def add(self, key: Hashable, text: str = None, signature: np.ndarray = None):
+        """Nimmt einen Text in den Index auf"""
+        if signature is None:
+            signature = self.signature(text)
+
+        position = len(self._keys)
+        self._keys.append(key)
+        self._signatures.append(signature)
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(position)
+
+    def add_if_new(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """
+        Dedup-Stage: fügt text nur hinzu, wenn es kein Near-Duplicate gibt
+
+        Returns: None (neu, aufgenommen) oder Key des gefundenen Duplikats
+        """
+        signature = self.signature(text)
+        match = self.query(signature=signature)
+        if match is not None:
+            return match[0]
+        self.add(key, signature=signature)
+        return None
+
+
+def drop_near_duplicates(texts: Iterable[str], threshold: float = DEFAULT_THRESHOLD,
+                         **index_kwargs) -> List[int]:
+    """Indizes der zu behaltenden Texte (jeweils das erste Vorkommen)"""
+    index = NearDuplicateIndex(threshold, **index_kwargs)
+    return [i for i, text in enumerate(texts) if index.add_if_new(i, text) is None]
+
+
+def cross_split_duplicates(train_texts: Iterable[str], test_texts: Iterable[str],
+                           threshold: float = DEFAULT_THRESHOLD,
+                           **index_kwargs) -> List[Tuple[int, int, float]]:
+    """
+    Near-Duplicates zwischen Train und Test (Data Leakage)
+
+    Returns: Liste von (test_index, train_index, Ähnlichkeit)
+    """
+    index = NearDuplicateIndex(threshold, **index_kwargs)
+    for i, text in enumerate(train_texts):
+        index.add(i, text)
+
+    leaks = []
+    for j, text in enumerate(test_texts):
+        match = index.query(text)
+        if match is not None:
+            leaks.append((j, match[0], match[1]))
+    return leaks
+
+
+def print_leak_report(leaks: List[Tuple[int, int, float]], test_size: int,
+                      train_texts=None, test_texts=None, examples: int = 3):
+    """Zusammenfassung der Train/Test-Duplikate"""
+    if not leaks:
+        print(f"✅ Keine Near-Duplicates zwischen Train und Test")
+        return
+
+    print(f"⚠️  {len(leaks)} Test-Samples ({len(leaks) / test_size * 100:.1f}%) "
+          f"haben ein Near-Duplicate im Train-Set")
+    if train_texts is not None and test_texts is not None:
+        for test_index, train_index, similarity in leaks[:examples]:
+            print(f"   [{similarity:.2f}] Test:  {str(test_texts[test_index])[:60]}")
+            print(f"          Train: {str(train_texts[train_index])[:60]}")
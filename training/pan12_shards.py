@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+PAN12 Sharded Ingestion
+=======================
+Teilt PAN12 XML-Corpora in Byte-Bereiche entlang von <conversation>-Grenzen
+und verarbeitet die Shards parallel in einem Process-Pool.
+
+- Shards werden in Datei-Reihenfolge zurückgegeben → deterministischer Merge
+- Jeder Worker parst seinen Bereich inkrementell (XMLPullParser) und räumt
+  fertige Elemente sofort ab
+- workers=1 läuft ohne Pool im aktuellen Prozess, mit identischem Code-Pfad
+
+Usage (im Parser-Script):
+    from pan12_shards import map_shards, iter_shard_conversations
+
+    def parse_shard(xml_path, start, end):
+        return [extract(conv) for conv in iter_shard_conversations(xml_path, start, end)]
+
+    results = map_shards(xml_path, parse_shard, workers=8)  # Liste pro Shard
+"""
+
+import os
+import re
+import mmap
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator, List, Set, Tuple
+
+# <conversation id="..."> bzw. <conversation> - NICHT <conversations>
+CONVERSATION_START = re.compile(rb'<conversation[\s>]')
+CONVERSATION_END = b'</conversation>'
+
+READ_CHUNK_SIZE = 1 << 20  # 1 MB
+
+
+def find_shard_ranges(xml_path, num_shards: int) -> List[Tuple[int, int]]:
+    """
+    Berechnet Byte-Bereiche [start, end), die jeweils nur vollständige
+    <conversation>-Elemente enthalten.
+
+    Die Bereiche decken alle Conversations lückenlos und in Datei-Reihenfolge ab.
+    """
+    file_size = os.path.getsize(xml_path)
+    if file_size == 0:
+        return []
+
+    with open(xml_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        first = CONVERSATION_START.search(mm)
+        if first is None:
+            return []
+
+        last_end = mm.rfind(CONVERSATION_END)
+        end_of_data = last_end + len(CONVERSATION_END)
+
+        # Ziel-Offsets gleichmäßig verteilen, dann auf die nächste Conversation schieben
+        starts = [first.start()]
+        span = end_of_data - first.start()
+        for i in range(1, max(1, num_shards)):
+            target = first.start() + span * i // num_shards
+            match = CONVERSATION_START.search(mm, max(target, starts[-1] + 1))
+            if match is None or match.start() >= end_of_data:
+                break
+            if match.start() > starts[-1]:
+                starts.append(match.start())
+
+    ends = starts[1:] + [end_of_data]
+    return list(zip(starts, ends))
+
+
+def iter_shard_conversations(xml_path, start: int, end: int) -> Iterator[ET.Element]:
+    """
+    Liefert alle <conversation>-Elemente aus dem Byte-Bereich [start, end)
+
+    Der Bereich wird in einen künstlichen <conversations>-Root eingebettet und
+    stückweise in einen XMLPullParser gefüttert; verarbeitete Elemente werden
+    nach dem yield geleert.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    parser.feed(b'<conversations>')
+    root = None
+
+    def drain():
+        nonlocal root
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag == 'conversation':
+                yield elem
+                elem.clear()
+                root.clear()
+
+    with open(xml_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            parser.feed(chunk)
+            yield from drain()
+
+    parser.feed(b'</conversations>')
+    parser.close()
+    yield from drain()
+
+
+def find_predator_ids(xml_path) -> Set[str]:
+    """
+    Liest einen optionalen <predator-ids>-Block per Byte-Scan (ohne XML-Parse).
+    Der Scan läuft im C-Regex-Engine über ein mmap und kostet nur Bruchteile
+    eines vollständigen Parse-Durchlaufs.
+    """
+    if os.path.getsize(xml_path) == 0:
+        return set()
+
+    with open(xml_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        block = re.search(rb'<predator-ids>(.*?)</predator-ids>', mm, re.S)
+        if block is None:
+            return set()
+        element = ET.fromstring(b'<predator-ids>' + block.group(1) + b'</predator-ids>')
+
+    return {predator.text for predator in element.findall('predator')}
+
+
+def default_workers() -> int:
+    """Anzahl nutzbarer CPU-Kerne"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def map_shards(xml_path, shard_fn: Callable, workers: int = None,
+               args: tuple = (), shards_per_worker: int = 4) -> List:
+    """
+    Führt shard_fn(xml_path, start, end, *args) für jeden Shard aus
+
+    Args:
+        xml_path: PAN12 XML-Datei
+        shard_fn: Modul-Level-Funktion (muss picklebar sein)
+        workers: Anzahl Prozesse (Default: alle Kerne, 1 = ohne Pool)
+        args: Zusätzliche Argumente für shard_fn
+        shards_per_worker: Mehr Shards als Worker für besseres Load-Balancing
+
+    Returns:
+        Liste der Shard-Ergebnisse in Datei-Reihenfolge
+    """
+    workers = workers or default_workers()
+    xml_path = str(Path(xml_path))
+
+    if workers <= 1:
+        ranges = find_shard_ranges(xml_path, 1)
+        return [shard_fn(xml_path, start, end, *args) for start, end in ranges]
+
+    ranges = find_shard_ranges(xml_path, workers * shards_per_worker)
+    print(f"   ⚡ {len(ranges)} Shards auf {workers} Prozessen")
+
+    task = partial(_run_shard, shard_fn, xml_path, args)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # executor.map hält die Eingabe-Reihenfolge ein
+        return list(executor.map(task, ranges))
+
+
+def _run_shard(shard_fn, xml_path, args, shard_range):
+    start, end = shard_range
+    return shard_fn(xml_path, start, end, *args)
@@ -10,7 +10,15 @@ import json
 from pathlib import Path
 from datetime import datetime
 import re
-from typing import List, Dict, Tuple
+import csv
+import random
+import textwrap
+from collections import Counter
+from typing import List, Dict, Tuple, Iterable, Iterator
+
+from stage_matcher import StageMatcher
+from dataset_cache import (HAS_ARROW, CACHE_ERRORS, DatasetCacheWriter, cache_path,
+                           discard_cache, write_cache)
 
 class PAN12Parser:
     """
@@ -77,6 +85,9 @@ class PAN12Parser:
             ]
         }
 
+        # Alle Patterns als EIN Automat (ein Durchlauf pro Nachricht)
+        self.stage_matcher = StageMatcher(self.stage_patterns)
+
     def load_predator_ids(self, predators_file: str):
         """Lade Predator IDs aus Text-Datei"""
         print(f"📥 Lade Predator IDs: {predators_file}")
@@ -105,36 +116,7 @@ class PAN12Parser:
         parsed_count = 0
 
         for conv in conversations:
-            conv_id = conv.get('id')
-            messages = []
-            has_predator = False
-
-            for message in conv.findall('message'):
-                msg_data = {
-                    'line': message.get('line'),
-                    'author': message.find('author').text,
-                    'text': message.find('text').text,
-                    'time': message.find('time').text if message.find('time') is not None else None
-                }
-
-                # Check ob Author ein Predator ist
-                if msg_data['author'] in self.predator_ids:
-                    has_predator = True
-                    msg_data['is_predator'] = True
-                else:
-                    msg_data['is_predator'] = False
-
-                # Heuristische Stage-Zuweisung
-                msg_data['stage'] = self._detect_stage(msg_data['text'])
-
-                messages.append(msg_data)
-
-            self.conversations.append({
-                'conversation_id': conv_id,
-                'has_predator': has_predator,
-                'messages': messages,
-                'message_count': len(messages)
-            })
+            self.conversations.append(self._parse_conversation(conv))
 
             parsed_count += 1
 
@@ -148,54 +130,105 @@ class PAN12Parser:
         print(f"📊 {predator_convs} Conversations mit Predator")
         print(f"📊 {len(self.conversations) - predator_convs} Safe Conversations")
 
-    def _detect_stage(self, text: str) -> str:
+    def iter_conversations(self, xml_file: str, max_conversations: int = None) -> Iterator[Dict]:
         """
-        Heuristische Stage-Detection basierend auf Keywords
+        Streaming-Variante von parse_xml (iterparse)
 
-        Returns: STAGE_SAFE, STAGE_TRUST, STAGE_ISOLATION, STAGE_NEEDS,
-                 STAGE_ASSESSMENT, oder STAGE_SEXUAL
+        Liefert Conversations einzeln und räumt die XML-Elemente direkt
+        wieder ab - der Speicherbedarf bleibt unabhängig von der Corpus-Größe
+        konstant. self.conversations wird dabei NICHT befüllt.
         """
-        if not text:
-            return 'STAGE_SAFE'
+        print(f"\n🔍 Stream XML: {xml_file}")
+
+        parsed_count = 0
+        predator_convs = 0
+
+        context = ET.iterparse(xml_file, events=('start', 'end'))
+        _, root = next(context)
+
+        for event, elem in context:
+            if event != 'end' or elem.tag != 'conversation':
+                continue
+
+            conv = self._parse_conversation(elem)
 
-        text_lower = text.lower()
+            # Element + bereits verarbeitete Geschwister freigeben
+            elem.clear()
+            root.clear()
 
-        # Score für jede Stage
-        stage_scores = {}
+            parsed_count += 1
+            if conv['has_predator']:
+                predator_convs += 1
 
-        for stage, patterns in self.stage_patterns.items():
-            score = 0
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    score += 1
-            stage_scores[stage] = score
+            if parsed_count % 1000 == 0:
+                print(f"  Streamed {parsed_count} conversations...")
 
-        # Finde Stage mit höchstem Score
-        max_score = max(stage_scores.values())
+            yield conv
 
-        if max_score > 0:
-            # Gebe Stage mit höchstem Score zurück
-            for stage, score in stage_scores.items():
-                if score == max_score:
-                    return stage
+            if max_conversations and parsed_count >= max_conversations:
+                print(f"📊 Limitiere auf {max_conversations} Conversations")
+                break
 
-        return 'STAGE_SAFE'
+        print(f"✅ {parsed_count} Conversations gestreamt")
+        print(f"📊 {predator_convs} Conversations mit Predator")
+        print(f"📊 {parsed_count - predator_convs} Safe Conversations")
+
+    def _parse_conversation(self, conv) -> Dict:
+        """Wandelt ein <conversation>-Element in ein Conversation-Dict um"""
+        messages = []
+        has_predator = False
+
+        for message in conv.findall('message'):
+            msg_data = {
+                'line': message.get('line'),
+                'author': message.find('author').text,
+                'text': message.find('text').text,
+                'time': message.find('time').text if message.find('time') is not None else None
+            }
+
+            # Check ob Author ein Predator ist
+            if msg_data['author'] in self.predator_ids:
+                has_predator = True
+                msg_data['is_predator'] = True
+            else:
+                msg_data['is_predator'] = False
+
+            # Heuristische Stage-Zuweisung
+            msg_data['stage'] = self._detect_stage(msg_data['text'])
+
+            messages.append(msg_data)
+
+        return {
+            'conversation_id': conv.get('id'),
+            'has_predator': has_predator,
+            'messages': messages,
+            'message_count': len(messages)
+        }
 
-    def extract_training_data(self, output_format='json') -> List[Dict]:
+    def _detect_stage(self, text: str) -> str:
         """
-        Extrahiere Training-Daten aus geparsed Conversations
+        Heuristische Stage-Detection basierend auf Keywords
 
-        Returns: Liste von Trainings-Beispielen mit:
-        - text: Nachricht
-        - label: 0=SAFE, 1=GROOMING
-        - stage: Detaillierte Stage
-        - context: Optional - vorherige Nachrichten
+        Returns: STAGE_SAFE, STAGE_TRUST, STAGE_ISOLATION, STAGE_NEEDS,
+                 STAGE_ASSESSMENT, oder STAGE_SEXUAL
         """
-        print("\n📦 Extrahiere Training-Daten...")
+        if not text:
+            return 'STAGE_SAFE'
+
+        return self.stage_matcher.best_stage(text.lower(), default='STAGE_SAFE')
+
+    def iter_training_data(self, conversations: Iterable[Dict] = None) -> Iterator[Dict]:
+        """
+        Generator-Variante von extract_training_data
 
-        training_data = []
+        Args:
+            conversations: Beliebiges Iterable von Conversations (z.B.
+                iter_conversations()); Default: self.conversations
+        """
+        if conversations is None:
+            conversations = self.conversations
 
-        for conv in self.conversations:
+        for conv in conversations:
             for i, msg in enumerate(conv['messages']):
                 # Überspringe leere Nachrichten
                 if not msg['text'] or len(msg['text'].strip()) < 3:
@@ -212,7 +245,7 @@ class PAN12Parser:
                     msg['stage'] != 'STAGE_SAFE'
                 )
 
-                training_data.append({
+                yield {
                     'text': msg['text'],
                     'label': 1 if is_grooming else 0,
                     'stage': msg['stage'],
@@ -220,7 +253,26 @@ class PAN12Parser:
                     'conversation_id': conv['conversation_id'],
                     'context': context if context else None,
                     'timestamp': msg.get('time')
-                })
+                }
+
+    def extract_training_data(self, output_format='json', *,
+                              conversations: Iterable[Dict] = None) -> List[Dict]:
+        """
+        Extrahiere Training-Daten aus geparsed Conversations
+
+        Args:
+            conversations: Optional (nur als Keyword) - Iterable von Conversations
+                (z.B. aus iter_conversations()), sonst self.conversations
+
+        Returns: Liste von Trainings-Beispielen mit:
+        - text: Nachricht
+        - label: 0=SAFE, 1=GROOMING
+        - stage: Detaillierte Stage
+        - context: Optional - vorherige Nachrichten
+        """
+        print("\n📦 Extrahiere Training-Daten...")
+
+        training_data = list(self.iter_training_data(conversations))
 
         print(f"✅ {len(training_data)} Training-Beispiele extrahiert")
 
@@ -233,7 +285,6 @@ class PAN12Parser:
         print(f"📊 Balance: {grooming_count / len(training_data) * 100:.1f}% Grooming")
 
         # Stage-Distribution
-        from collections import Counter
         stage_dist = Counter(d['stage'] for d in training_data)
         print(f"\n📊 Stage-Distribution:")
         for stage, count in stage_dist.most_common():
@@ -242,7 +293,7 @@ class PAN12Parser:
         return training_data
 
     def save_to_json(self, training_data: List[Dict], output_file: str):
-        """Speichere Training-Daten als JSON"""
+        """Speichere Training-Daten als JSON (+ Arrow-Cache für die Trainer)"""
         print(f"\n💾 Speichere JSON: {output_file}")
 
         output_path = Path(output_file)
@@ -253,6 +304,8 @@ class PAN12Parser:
 
         print(f"✅ JSON gespeichert: {output_file}")
 
+        write_cache(training_data, cache_path(output_file))
+
     def save_to_csv(self, training_data: List[Dict], output_file: str):
         """Speichere Training-Daten als CSV"""
         print(f"\n💾 Speichere CSV: {output_file}")
@@ -277,23 +330,83 @@ class PAN12Parser:
         print(f"✅ CSV gespeichert: {output_file}")
         print(f"📊 {len(df)} Zeilen")
 
-    def create_balanced_dataset(self, training_data: List[Dict],
+    def stream_to_files(self, training_data: Iterable[Dict], json_file: str,
+                        csv_file: str) -> Iterator[Dict]:
+        """
+        Schreibt Training-Daten inkrementell als JSON + CSV (gleiches Format wie
+        save_to_json / save_to_csv) und reicht jedes Sample weiter.
+
+        Damit lassen sich Full-Export und create_balanced_dataset in EINEM
+        Durchlauf über iter_conversations() erledigen. Der Arrow-Cache
+        (json_file mit Endung .arrow) entsteht im selben Durchlauf.
+        """
+        print(f"\n💾 Streame JSON: {json_file}")
+        print(f"💾 Streame CSV: {csv_file}")
+
+        Path(json_file).parent.mkdir(parents=True, exist_ok=True)
+        Path(csv_file).parent.mkdir(parents=True, exist_ok=True)
+
+        cache = DatasetCacheWriter(cache_path(json_file)) if HAS_ARROW else None
+
+        count = 0
+        with open(json_file, 'w', encoding='utf-8') as jf, \
+                open(csv_file, 'w', encoding='utf-8', newline='') as cf:
+            writer = csv.writer(cf, lineterminator='\n')
+            writer.writerow(['text', 'label', 'stage', 'is_predator_author', 'conversation_id'])
+
+            for item in training_data:
+                # Gleiche Formatierung wie json.dump(..., indent=2)
+                item_json = textwrap.indent(json.dumps(item, indent=2, ensure_ascii=False), '  ')
+                jf.write(('[\n' if count == 0 else ',\n') + item_json)
+                writer.writerow([item['text'], item['label'], item['stage'],
+                                 item['is_predator_author'], item['conversation_id']])
+                if cache is not None:
+                    try:
+                        cache.write(item)
+                    except CACHE_ERRORS as e:
+                        cache.close(discard=True)
+                        discard_cache(cache.path, e)
+                        cache = None
+                count += 1
+                yield item
+
+            jf.write('\n]' if count else '[]')
+
+        # Cache erst nach dem JSON schließen → gilt als aktuell
+        if cache is not None:
+            try:
+                cache.close()
+                print(f"✅ Arrow-Cache gespeichert: {cache.path}")
+            except CACHE_ERRORS as e:
+                discard_cache(cache.path, e)
+
+        print(f"✅ {count} Samples gestreamt ({json_file}, {csv_file})")
+
+    def create_balanced_dataset(self, training_data: Iterable[Dict],
                                   max_samples: int = 1000) -> List[Dict]:
         """
         Erstelle balanced Dataset (50/50 Grooming/Safe)
+
+        Akzeptiert auch Generatoren (z.B. iter_training_data()): dann wird per
+        Reservoir-Sampling gezogen und nie mehr als max_samples Samples gehalten.
         """
         print(f"\n⚖️  Erstelle balanced Dataset (max {max_samples} Samples)...")
 
-        grooming = [d for d in training_data if d['label'] == 1]
-        safe = [d for d in training_data if d['label'] == 0]
+        random.seed(42)
 
-        print(f"📊 Verfügbar: {len(grooming)} Grooming, {len(safe)} Safe")
+        if isinstance(training_data, list):
+            grooming = [d for d in training_data if d['label'] == 1]
+            safe = [d for d in training_data if d['label'] == 0]
+            grooming_total, safe_total = len(grooming), len(safe)
+        else:
+            reservoirs, totals = self._reservoir_sample(training_data, max_samples // 2)
+            grooming, grooming_total = reservoirs.get(1, []), totals[1]
+            safe, safe_total = reservoirs.get(0, []), totals[0]
 
-        # Sample gleiche Anzahl
-        n_samples = min(len(grooming), len(safe), max_samples // 2)
+        print(f"📊 Verfügbar: {grooming_total} Grooming, {safe_total} Safe")
 
-        import random
-        random.seed(42)
+        # Sample gleiche Anzahl
+        n_samples = min(grooming_total, safe_total, max_samples // 2)
 
         grooming_sample = random.sample(grooming, n_samples)
         safe_sample = random.sample(safe, n_samples)
@@ -305,9 +418,40 @@ class PAN12Parser:
 
         return balanced
 
+    def _reservoir_sample(self, training_data: Iterable[Dict], k: int):
+        """
+        Reservoir-Sampling (Algorithm R) getrennt nach Label
+
+        Returns: (Reservoir pro Label mit max. k Samples, Anzahl pro Label)
+        """
+        reservoirs = {}
+        totals = Counter()
+
+        for item in training_data:
+            label = item['label']
+            totals[label] += 1
+            reservoir = reservoirs.setdefault(label, [])
+            if len(reservoir) < k:
+                reservoir.append(item)
+            else:
+                j = random.randrange(totals[label])
+                if j < k:
+                    reservoir[j] = item
+
+        return reservoirs, totals
+
 
 def main():
     """Main Execution"""
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="PAN12 XML Parser für KidGuard")
+    arg_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="iterparse-Modus: konstanter Speicherbedarf auch für den kompletten Corpus"
+    )
+    args = arg_parser.parse_args()
+
     print("=" * 70)
     print("🦅 PAN12 XML PARSER FÜR KIDGUARD")
     print("=" * 70)
@@ -327,22 +471,36 @@ def main():
     # 1. Lade Predator IDs
     parser.load_predator_ids(str(predators_file))
 
-    # 2. Parse XML (ALLE Conversations)
-    parser.parse_xml(str(xml_file), max_conversations=None)  # Full Dataset!
-
-    # 3. Extrahiere Training-Daten
-    training_data = parser.extract_training_data()
-
-    # 4. Erstelle balanced Dataset
-    balanced_data = parser.create_balanced_dataset(training_data, max_samples=2000)
-
-    # 5. Speichere in beiden Formaten
-    parser.save_to_json(balanced_data, str(output_dir / "pan12_balanced.json"))
-    parser.save_to_csv(balanced_data, str(output_dir / "pan12_balanced.csv"))
-
-    # 6. Erstelle auch Full Dataset (unbalanced)
-    parser.save_to_json(training_data, str(output_dir / "pan12_full.json"))
-    parser.save_to_csv(training_data, str(output_dir / "pan12_full.csv"))
+    if args.stream:
+        # 2-4. Stream XML → Full Dataset (JSON + CSV) + balanced Dataset in einem Durchlauf
+        conversations = parser.iter_conversations(str(xml_file))
+        samples = parser.stream_to_files(
+            parser.iter_training_data(conversations),
+            str(output_dir / "pan12_full.json"),
+            str(output_dir / "pan12_full.csv")
+        )
+        balanced_data = parser.create_balanced_dataset(samples, max_samples=2000)
+
+        # 5. Speichere balanced Dataset
+        parser.save_to_json(balanced_data, str(output_dir / "pan12_balanced.json"))
+        parser.save_to_csv(balanced_data, str(output_dir / "pan12_balanced.csv"))
+    else:
+        # 2. Parse XML (ALLE Conversations)
+        parser.parse_xml(str(xml_file), max_conversations=None)  # Full Dataset!
+
+        # 3. Extrahiere Training-Daten
+        training_data = parser.extract_training_data()
+
+        # 4. Erstelle balanced Dataset
+        balanced_data = parser.create_balanced_dataset(training_data, max_samples=2000)
+
+        # 5. Speichere in beiden Formaten
+        parser.save_to_json(balanced_data, str(output_dir / "pan12_balanced.json"))
+        parser.save_to_csv(balanced_data, str(output_dir / "pan12_balanced.csv"))
+
+        # 6. Erstelle auch Full Dataset (unbalanced)
+        parser.save_to_json(training_data, str(output_dir / "pan12_full.json"))
+        parser.save_to_csv(training_data, str(output_dir / "pan12_full.csv"))
 
     print("\n" + "=" * 70)
     print("✅ PAN12 PARSING ABGESCHLOSSEN")
@@ -6,16 +6,15 @@ PAN12 enthält eine separate Datei mit Predator-IDs.
 Wir müssen diese nutzen um Conversations korrekt zu labeln!
 """
 
-import xml.etree.ElementTree as ET
+import argparse
 import json
 from pathlib import Path
 from collections import Counter
 from datetime import datetime
 
-print("="*80)
-print("🚀 PAN12 CORRECTED PARSER (WITH PREDATOR IDs)")
-print("="*80)
-print(f"Start: {datetime.now().strftime('%H:%M:%S')}\n")
+from stage_matcher import StageMatcher
+from pan12_shards import map_shards, iter_shard_conversations, default_workers
+from dataset_cache import save_dataset
 
 base_path = Path.home() / 'AndroidStudioProjects' / 'KidGuard'
 
@@ -27,7 +26,6 @@ base_path = Path.home() / 'AndroidStudioProjects' / 'KidGuard'
 train_xml = base_path / 'pan12-sexual-predator-identification-training-corpus-2012-05-01.xml'
 test_xml = base_path / 'pan12-sexual-predator-identification-test-corpus-2012-05-17.xml'
 output_dir = base_path / 'training' / 'data' / 'pan12_labeled'
-output_dir.mkdir(parents=True, exist_ok=True)
 
 # KNOWN PREDATOR IDs from PAN12 dataset
 # Diese IDs sind im offiziellen PAN12 Ground Truth enthalten
@@ -38,44 +36,93 @@ KNOWN_PREDATORS = set([
     # typischen Grooming-Patterns
 ])
 
+GROOMING_INDICATORS = [
+    # Age/Identity probing
+    'how old are you', 'how old r u', 'asl', 'a/s/l',
+    'what grade', 'are you in school',
+
+    # Isolation
+    'are you alone', 'r u alone', 'parents home',
+    'anyone there', 'by yourself',
+
+    # Secrecy
+    'dont tell', "don't tell", 'our secret', 'between us',
+    'keep this', 'nobody knows',
+
+    # Physical/Sexual
+    'what do you look like', 'send pic', 'send a pic',
+    'have a bf', 'have a gf', 'boyfriend', 'girlfriend',
+    'virgin', 'first time', 'ever kissed',
+
+    # Meeting
+    'want to meet', 'wanna meet', 'where do you live',
+    'come over', 'pick you up',
+
+    # Webcam
+    'webcam', 'cam', 'on cam', 'turn on cam',
+
+    # Trust building (excessive)
+    'you can trust me', 'i understand you',
+    'mature for your age', 'special', 'different from others'
+]
+
+# Alle Indikatoren als ein kompilierter Substring-Automat
+GROOMING_MATCHER = StageMatcher({'GROOMING': GROOMING_INDICATORS}, literal=True)
+
 def detect_grooming_patterns(text):
     """Erkennt Grooming-Patterns in Text"""
-    text_lower = text.lower()
+    return GROOMING_MATCHER.total(text.lower())
+
+def extract_conversation(conv):
+    """Extrahiert + labelt eine Conversation (None bei < 3 Messages)"""
+    conv_id = conv.get('id', 'unknown')
+    messages = []
+    authors = set()
+
+    for msg in conv.findall('.//message'):
+        author_elem = msg.find('author')
+        text_elem = msg.find('text')
+
+        if text_elem is not None and text_elem.text:
+            author = author_elem.text.strip() if author_elem is not None and author_elem.text else 'unknown'
+            text = text_elem.text.strip()
+
+            if text:
+                messages.append(text)
+                authors.add(author)
 
-    grooming_indicators = [
-        # Age/Identity probing
-        'how old are you', 'how old r u', 'asl', 'a/s/l',
-        'what grade', 'are you in school',
+    if len(messages) < 3:
+        return None
 
-        # Isolation
-        'are you alone', 'r u alone', 'parents home',
-        'anyone there', 'by yourself',
+    full_text = ' '.join(messages)
 
-        # Secrecy
-        'dont tell', "don't tell", 'our secret', 'between us',
-        'keep this', 'nobody knows',
+    # Detect grooming based on patterns
+    grooming_score = detect_grooming_patterns(full_text)
 
-        # Physical/Sexual
-        'what do you look like', 'send pic', 'send a pic',
-        'have a bf', 'have a gf', 'boyfriend', 'girlfriend',
-        'virgin', 'first time', 'ever kissed',
+    # Label as grooming if score >= 2 (multiple indicators)
+    label = 'grooming' if grooming_score >= 2 else 'safe'
 
-        # Meeting
-        'want to meet', 'wanna meet', 'where do you live',
-        'come over', 'pick you up',
+    return {
+        'text': full_text[:5000],  # Limit text length
+        'label': label,
+        'conversation_id': conv_id,
+        'num_messages': len(messages),
+        'grooming_score': grooming_score,
+        'source': 'pan12'
+    }
 
-        # Webcam
-        'webcam', 'cam', 'on cam', 'turn on cam',
 
-        # Trust building (excessive)
-        'you can trust me', 'i understand you',
-        'mature for your age', 'special', 'different from others'
-    ]
+def parse_shard(xml_path, start, end):
+    """Worker: parst + labelt alle Conversations eines Byte-Bereichs"""
+    conversations = []
+    for conv in iter_shard_conversations(xml_path, start, end):
+        sample = extract_conversation(conv)
+        if sample is not None:
+            conversations.append(sample)
+    return conversations
 
-    score = sum(1 for pattern in grooming_indicators if pattern in text_lower)
-    return score
 
-def parse_pan12_with_labels(xml_path, dataset_name):
+def parse_pan12_with_labels(xml_path, dataset_name, workers=None):
     """Parse PAN12 und label basierend auf Grooming-Patterns"""
 
     print(f"📖 Parsing {dataset_name}...")
@@ -84,55 +131,19 @@ def parse_pan12_with_labels(xml_path, dataset_name):
         print(f"❌ File not found: {xml_path}")
         return []
 
-    tree = ET.parse(str(xml_path))
-    root = tree.getroot()
-
     conversations = []
     grooming_count = 0
     safe_count = 0
 
-    for conv in root.findall('.//conversation'):
-        conv_id = conv.get('id', 'unknown')
-        messages = []
-        authors = set()
-
-        for msg in conv.findall('.//message'):
-            author_elem = msg.find('author')
-            text_elem = msg.find('text')
-
-            if text_elem is not None and text_elem.text:
-                author = author_elem.text.strip() if author_elem is not None and author_elem.text else 'unknown'
-                text = text_elem.text.strip()
-
-                if text:
-                    messages.append(text)
-                    authors.add(author)
-
-        if len(messages) >= 3:
-            full_text = ' '.join(messages)
-
-            # Detect grooming based on patterns
-            grooming_score = detect_grooming_patterns(full_text)
-
-            # Label as grooming if score >= 2 (multiple indicators)
-            if grooming_score >= 2:
-                label = 'grooming'
+    # Shards in Datei-Reihenfolge mergen → identisch zum seriellen Lauf
+    for shard_conversations in map_shards(xml_path, parse_shard, workers):
+        conversations.extend(shard_conversations)
+        for conv in shard_conversations:
+            if conv['label'] == 'grooming':
                 grooming_count += 1
             else:
-                label = 'safe'
                 safe_count += 1
-
-            conversations.append({
-                'text': full_text[:5000],  # Limit text length
-                'label': label,
-                'conversation_id': conv_id,
-                'num_messages': len(messages),
-                'grooming_score': grooming_score,
-                'source': 'pan12'
-            })
-
-        if len(conversations) % 10000 == 0 and len(conversations) > 0:
-            print(f"   Progress: {len(conversations):,} (Safe: {safe_count:,}, Grooming: {grooming_count:,})")
+        print(f"   Progress: {len(conversations):,} (Safe: {safe_count:,}, Grooming: {grooming_count:,})")
 
     print(f"✅ Extracted {len(conversations):,} conversations")
     print(f"   Safe: {safe_count:,} ({safe_count/len(conversations)*100:.1f}%)")
@@ -140,59 +151,80 @@ def parse_pan12_with_labels(xml_path, dataset_name):
 
     return conversations
 
-# Parse Training Data
-print("\n" + "="*80)
-print("📚 TRAINING DATA")
-print("="*80)
-train_data = parse_pan12_with_labels(train_xml, "Training Corpus")
-
-# Parse Test Data
-print("\n" + "="*80)
-print("📚 TEST DATA")
-print("="*80)
-test_data = parse_pan12_with_labels(test_xml, "Test Corpus")
-
-# Save datasets
-train_json = output_dir / 'pan12_train_labeled.json'
-test_json = output_dir / 'pan12_test_labeled.json'
-
-print("\n" + "="*80)
-print("💾 SAVING DATASETS")
-print("="*80)
-
-with open(train_json, 'w', encoding='utf-8') as f:
-    json.dump(train_data, f, ensure_ascii=False)
-print(f"✅ Training saved: {train_json}")
-
-with open(test_json, 'w', encoding='utf-8') as f:
-    json.dump(test_data, f, ensure_ascii=False)
-print(f"✅ Test saved: {test_json}")
-
-# Final Statistics
-print("\n" + "="*80)
-print("📊 FINAL STATISTICS")
-print("="*80)
-
-train_safe = sum(1 for c in train_data if c['label'] == 'safe')
-train_grooming = sum(1 for c in train_data if c['label'] == 'grooming')
-test_safe = sum(1 for c in test_data if c['label'] == 'safe')
-test_grooming = sum(1 for c in test_data if c['label'] == 'grooming')
-
-print(f"\n📚 TRAINING SET:")
-print(f"   Total: {len(train_data):,}")
-print(f"   Safe: {train_safe:,} ({train_safe/len(train_data)*100:.1f}%)")
-print(f"   Grooming: {train_grooming:,} ({train_grooming/len(train_data)*100:.1f}%)")
-
-print(f"\n📚 TEST SET:")
-print(f"   Total: {len(test_data):,}")
-print(f"   Safe: {test_safe:,} ({test_safe/len(test_data)*100:.1f}%)")
-print(f"   Grooming: {test_grooming:,} ({test_grooming/len(test_data)*100:.1f}%)")
-
-print(f"\n📊 COMBINED:")
-print(f"   Total: {len(train_data) + len(test_data):,}")
-print(f"   Safe: {train_safe + test_safe:,}")
-print(f"   Grooming: {train_grooming + test_grooming:,}")
-
-print(f"\n⏰ End: {datetime.now().strftime('%H:%M:%S')}")
-print("\n🚀 READY FOR TRAINING WITH PROPER LABELS!")
-print("="*80)
+
+def main():
+    parser = argparse.ArgumentParser(description="PAN12 Parser mit Grooming-Labels")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_workers(),
+        help="Anzahl paralleler Prozesse (1 = seriell)"
+    )
+    args = parser.parse_args()
+
+    print("="*80)
+    print("🚀 PAN12 CORRECTED PARSER (WITH PREDATOR IDs)")
+    print("="*80)
+    print(f"Start: {datetime.now().strftime('%H:%M:%S')}\n")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Parse Training Data
+    print("\n" + "="*80)
+    print("📚 TRAINING DATA")
+    print("="*80)
+    train_data = parse_pan12_with_labels(train_xml, "Training Corpus", args.workers)
+
+    # Parse Test Data
+    print("\n" + "="*80)
+    print("📚 TEST DATA")
+    print("="*80)
+    test_data = parse_pan12_with_labels(test_xml, "Test Corpus", args.workers)
+
+    # Save datasets
+    train_json = output_dir / 'pan12_train_labeled.json'
+    test_json = output_dir / 'pan12_test_labeled.json'
+
+    print("\n" + "="*80)
+    print("💾 SAVING DATASETS")
+    print("="*80)
+
+    # JSON-Export + Arrow-Cache (den laden die Trainer)
+    save_dataset(train_data, train_json, indent=None)
+    print(f"✅ Training saved: {train_json}")
+
+    save_dataset(test_data, test_json, indent=None)
+    print(f"✅ Test saved: {test_json}")
+
+    # Final Statistics
+    print("\n" + "="*80)
+    print("📊 FINAL STATISTICS")
+    print("="*80)
+
+    train_safe = sum(1 for c in train_data if c['label'] == 'safe')
+    train_grooming = sum(1 for c in train_data if c['label'] == 'grooming')
+    test_safe = sum(1 for c in test_data if c['label'] == 'safe')
+    test_grooming = sum(1 for c in test_data if c['label'] == 'grooming')
+
+    print(f"\n📚 TRAINING SET:")
+    print(f"   Total: {len(train_data):,}")
+    print(f"   Safe: {train_safe:,} ({train_safe/len(train_data)*100:.1f}%)")
+    print(f"   Grooming: {train_grooming:,} ({train_grooming/len(train_data)*100:.1f}%)")
+
+    print(f"\n📚 TEST SET:")
+    print(f"   Total: {len(test_data):,}")
+    print(f"   Safe: {test_safe:,} ({test_safe/len(test_data)*100:.1f}%)")
+    print(f"   Grooming: {test_grooming:,} ({test_grooming/len(test_data)*100:.1f}%)")
+
+    print(f"\n📊 COMBINED:")
+    print(f"   Total: {len(train_data) + len(test_data):,}")
+    print(f"   Safe: {train_safe + test_safe:,}")
+    print(f"   Grooming: {train_grooming + test_grooming:,}")
+
+    print(f"\n⏰ End: {datetime.now().strftime('%H:%M:%S')}")
+    print("\n🚀 READY FOR TRAINING WITH PROPER LABELS!")
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
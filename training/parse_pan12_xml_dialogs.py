@@ -4,15 +4,16 @@ PAN12 XML Dialog Parser für KidGuard Training
 Extrahiert komplette Chat-Dialoge und labelt sie intelligent
 """
 
-import xml.etree.ElementTree as ET
+import argparse
 import json
 import re
 from collections import defaultdict
 from typing import List, Dict, Tuple
 import os
 
-print("🔍 PAN12 XML Dialog Parser")
-print("=" * 60)
+from stage_matcher import StageMatcher
+from pan12_shards import map_shards, iter_shard_conversations, find_predator_ids, default_workers
+from dataset_cache import save_dataset, CACHE_COLUMNS
 
 # Pfade zu den XML-Dateien
 XML_FILES = [
@@ -54,48 +55,37 @@ GROOMING_PATTERNS = {
     ]
 }
 
+# Substring-Keywords aller Stages als ein kompilierter Automat
+GROOMING_MATCHER = StageMatcher(GROOMING_PATTERNS, literal=True)
+
 def classify_message(text: str, is_predator: bool) -> str:
     """Klassifiziert Nachricht basierend auf Content"""
     if not is_predator:
         return 'STAGE_SAFE'
 
-    text_lower = text.lower()
-
-    # Zähle Matches pro Stage
-    stage_scores = defaultdict(int)
-    for stage, patterns in GROOMING_PATTERNS.items():
-        for pattern in patterns:
-            if pattern in text_lower:
-                stage_scores[stage] += 1
+    # Zähle Matches pro Stage (ein Durchlauf über den Text)
+    stage = GROOMING_MATCHER.best_stage(text.lower())
 
-    if not stage_scores:
+    if stage is None:
         return 'STAGE_TRUST'  # Default für Predator ohne spezifische Keywords
 
     # Returniere Stage mit meisten Matches
-    return max(stage_scores.items(), key=lambda x: x[1])[0]
+    return stage
 
-def parse_xml_file(filepath: str) -> Tuple[List[Dict], Dict]:
-    """Parst PAN12 XML und extrahiert Dialoge"""
-    print(f"\n📂 Parse: {os.path.basename(filepath)}")
+def parse_shard(xml_path: str, start: int, end: int, predator_ids: set) -> List[Tuple[str, List]]:
+    """
+    Worker: extrahiert alle Messages eines Byte-Bereichs
 
-    try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-    except Exception as e:
-        print(f"❌ Fehler beim Parsen: {e}")
-        return [], {}
+    Klassifikation und Cleaning passieren bereits hier (parallel), damit der
+    Haupt-Prozess nur noch zusammenführt.
 
-    # Extrahiere Conversations
-    conversations = root.find('conversations')
-    if conversations is None:
-        print("⚠️ Keine Conversations gefunden")
-        return [], {}
+    Returns: [(conv_id, [(msg_data, label, cleaned_text), ...]), ...]
+    """
+    shard = []
 
-    # Sammle Messages pro Conversation
-    conv_messages = defaultdict(list)
-
-    for conv in conversations.findall('conversation'):
+    for conv in iter_shard_conversations(xml_path, start, end):
         conv_id = conv.get('id')
+        entries = []
 
         for message in conv.findall('message'):
             line = message.find('text')
@@ -109,28 +99,51 @@ def parse_xml_file(filepath: str) -> Tuple[List[Dict], Dict]:
                     'time': time.text if time is not None else '',
                     'conv_id': conv_id
                 }
-                conv_messages[conv_id].append(msg_data)
+                label = classify_message(msg_data['text'], msg_data['author'] in predator_ids)
+                entries.append((msg_data, label, clean_text(msg_data['text'])))
 
-    print(f"✅ {len(conv_messages)} Conversations gefunden")
+        shard.append((conv_id, entries))
+
+    return shard
+
+
+def parse_xml_file(filepath: str, workers: int = None) -> Tuple[List[Dict], Dict, List[str]]:
+    """
+    Parst PAN12 XML und extrahiert Dialoge
+
+    Returns: (samples, stats, cleaned_texts) - cleaned_texts[i] gehört zu samples[i]
+    """
+    print(f"\n📂 Parse: {os.path.basename(filepath)}")
 
     # Identifiziere Predators aus <predator-ids>
-    predator_ids = set()
-    predator_element = root.find('.//predator-ids')
-    if predator_element is not None:
-        for predator in predator_element.findall('predator'):
-            predator_ids.add(predator.text)
+    predator_ids = find_predator_ids(filepath)
 
+    try:
+        shards = map_shards(filepath, parse_shard, workers, args=(predator_ids,))
+    except Exception as e:
+        print(f"❌ Fehler beim Parsen: {e}")
+        return [], {}, []
+
+    # Sammle Messages pro Conversation (Shards in Datei-Reihenfolge)
+    conv_messages = defaultdict(list)
+    for shard in shards:
+        for conv_id, entries in shard:
+            conv_messages[conv_id].extend(entries)
+
+    if not conv_messages:
+        print("⚠️ Keine Conversations gefunden")
+        return [], {}, []
+
+    print(f"✅ {len(conv_messages)} Conversations gefunden")
     print(f"⚠️ {len(predator_ids)} Predators identifiziert")
 
     # Extrahiere Training Samples
     samples = []
+    cleaned_texts = []
     stats = {'safe': 0, 'grooming': 0, 'stages': defaultdict(int)}
 
-    for conv_id, messages in conv_messages.items():
-        # Check ob Predator in Conversation
-        has_predator = any(msg['author'] in predator_ids for msg in messages)
-
-        for msg in messages:
+    for conv_id, entries in conv_messages.items():
+        for msg, label, cleaned in entries:
             text = msg['text']
 
             # Filtere zu kurze Messages
@@ -141,22 +154,17 @@ def parse_xml_file(filepath: str) -> Tuple[List[Dict], Dict]:
             if 'http' in text.lower() or 'www.' in text.lower():
                 continue
 
-            # Check ob Message von Predator
-            is_predator_msg = msg['author'] in predator_ids
-
-            # Klassifiziere
-            label = classify_message(text, is_predator_msg)
-
             sample = {
                 'text': text,
                 'label': label,
                 'source': 'pan12_xml',
                 'conv_id': conv_id,
                 'author': msg['author'],
-                'is_predator': is_predator_msg
+                'is_predator': msg['author'] in predator_ids
             }
 
             samples.append(sample)
+            cleaned_texts.append(cleaned)
 
             if label == 'STAGE_SAFE':
                 stats['safe'] += 1
@@ -170,7 +178,7 @@ def parse_xml_file(filepath: str) -> Tuple[List[Dict], Dict]:
     for stage, count in stats['stages'].items():
         print(f"     {stage}: {count}")
 
-    return samples, stats
+    return samples, stats, cleaned_texts
 
 def clean_text(text: str) -> str:
     """Reinigt Text von Sonderzeichen"""
@@ -183,7 +191,20 @@ def clean_text(text: str) -> str:
     return text
 
 def main():
+    parser = argparse.ArgumentParser(description="PAN12 XML Dialog Parser")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_workers(),
+        help="Anzahl paralleler Prozesse (1 = seriell)"
+    )
+    args = parser.parse_args()
+
+    print("🔍 PAN12 XML Dialog Parser")
+    print("=" * 60)
+
     all_samples = []
+    all_cleaned = []
     total_stats = {'safe': 0, 'grooming': 0, 'stages': defaultdict(int)}
 
     # Parse beide XML-Dateien
@@ -192,8 +213,9 @@ def main():
             print(f"⚠️ Datei nicht gefunden: {xml_file}")
             continue
 
-        samples, stats = parse_xml_file(xml_file)
+        samples, stats, cleaned_texts = parse_xml_file(xml_file, args.workers)
         all_samples.extend(samples)
+        all_cleaned.extend(cleaned_texts)
 
         total_stats['safe'] += stats['safe']
         total_stats['grooming'] += stats['grooming']
@@ -217,8 +239,8 @@ def main():
     # Clean samples
     print("\n🧹 Reinige Texte...")
     cleaned_samples = []
-    for sample in all_samples:
-        sample['text'] = clean_text(sample['text'])
+    for sample, cleaned in zip(all_samples, all_cleaned):
+        sample['text'] = cleaned  # clean_text() lief bereits in den Workern
         if len(sample['text']) >= 10:  # Nur Texte mit min. 10 Zeichen
             cleaned_samples.append(sample)
 
@@ -228,8 +250,8 @@ def main():
     output_file = 'data/pan12_dialogs_extracted.json'
     os.makedirs('data', exist_ok=True)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_samples, f, indent=2, ensure_ascii=False)
+    # JSON-Export + Arrow-Cache
+    save_dataset(cleaned_samples, output_file)
 
     print(f"\n💾 Gespeichert: {output_file}")
     print(f"   Größe: {os.path.getsize(output_file) / 1024:.1f} KB")
@@ -254,8 +276,7 @@ def main():
         multiclass_samples.append(mc_sample)
 
     output_mc = 'data/pan12_dialogs_multiclass.json'
-    with open(output_mc, 'w', encoding='utf-8') as f:
-        json.dump(multiclass_samples, f, indent=2, ensure_ascii=False)
+    save_dataset(multiclass_samples, output_mc, columns=CACHE_COLUMNS + ['label_numeric'])
 
     print(f"✅ Multi-Class gespeichert: {output_mc}")
 
@@ -274,7 +295,7 @@ def main():
     print("   1. Kombiniere mit bestehendem Dataset:")
     print("      python3 combine_all_datasets.py")
     print("   2. Trainiere Advanced Model:")
-    print("      python3 train_advanced_model.py")
+    print("      python3 training/train_advanced_model.py  (aus dem Repo-Root)")
     print("   3. Teste auf Pixel 10!")
 
 if __name__ == '__main__':
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Stage Matcher - Kompiliertes Multi-Pattern Matching für Grooming-Stages
+=======================================================================
+Ersetzt die Schleifen "für jede Stage, für jedes Pattern: re.search / in"
+durch EINEN kompilierten Automaten, der in einem Durchlauf über den Text die
+Treffer pro Stage liefert.
+
+- Semantik identisch zu den alten Schleifen: jedes Pattern zählt max. 1x
+  (Duplikate in einer Stage-Liste zählen weiterhin mehrfach)
+- literal=False: Regex-Patterns → eine Alternation mit benannten Gruppen
+- literal=True: Substring-Keywords (wie `pattern in text_lower`) → Trie-Regex
+
+Usage:
+    matcher = StageMatcher(stage_patterns)
+    matcher.count("are you alone?")       # {'STAGE_TRUST': 0, ..., 'STAGE_ASSESSMENT': 1}
+    matcher.best_stage("are you alone?")  # 'STAGE_ASSESSMENT'
+
+Texte sollten vorher klein geschrieben werden (text.lower()) - re.IGNORECASE
+schaltet die Literal-Optimierungen des Regex-Engines ab und ist ~3x langsamer.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+
+def trie_regex(keywords: List[str]) -> str:
+    """
+    Baut aus Keywords eine nach gemeinsamen Präfixen faktorisierte Regex
+
+    Pro Position prüft der Engine so jedes Zeichen nur einmal statt jedes
+    Keyword einzeln; greedy "?" liefert immer das LÄNGSTE passende Keyword.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+def _word_bounded(source: str) -> bool:
+    """True für Patterns der Form \\b...\\b"""
+    return source.startswith(r'\b') and source.endswith(r'\b') and not source.endswith(r'\\b')
+
+
+def _starts_with_word_char(inner: str) -> bool:
+    """
+    Konservativer Check: beginnt JEDER Zweig von inner mit einem Wortzeichen?
+
+    Dann ist das führende \\b gleichbedeutend mit (?<!\\w) - und das prüft der
+    Regex-Engine an Positionen mitten im Wort deutlich schneller.
+    Im Zweifel False (dann bleibt es beim \\b).
+    """
+    if inner.startswith('(?:'):
+        body = inner[3:]
+    elif inner.startswith('(') and not inner.startswith('(?'):
+        body = inner[1:]
+    else:
+        body = inner + ')'
+
+    branches, depth, current, escaped = [], 0, '', False
+    for i, char in enumerate(body):
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            if depth == 0:
+                # Gruppe muss das ganze Pattern umfassen
+                if i != len(body) - 1:
+                    return False
+                branches.append(current)
+                break
+            depth -= 1
+        elif char == '|' and depth == 0:
+            branches.append(current)
+            current = ''
+            continue
+        current += char
+    else:
+        return False
+
+    return all(len(branch) > 0 and (branch[0].isalnum() or branch[0] == '_')
+               and branch[1:2] not in ('?', '*', '{')
+               for branch in branches)
+
+
+class StageMatcher:
+    """
+    Kompiliert alle Patterns aller Stages zu einem Automaten
+
+    Der Automat steht in einem Lookahead, matcht also an JEDER Position mit
+    Länge 0 - dadurch gehen auch überlappende Treffer nicht verloren.
+    Mehrere Patterns, die an derselben Position beginnen, werden aufgelöst:
+    - literal: alle kürzeren Keywords, die Präfix des Treffers sind
+    - regex: die übrigen Patterns werden an der Trefferposition einzeln
+      nachgeprüft (Treffer sind selten, das kostet praktisch nichts)
+    """
+
+    def __init__(self, stage_patterns: Dict[str, List[str]], literal: bool = False,
+                 flags: int = 0):
+        """
+        Args:
+            stage_patterns: {stage: [pattern, ...]} - Reihenfolge = Tie-Break
+            literal: Patterns sind Substring-Keywords (case-sensitiv wie `in`)
+            flags: Regex-Flags (nur für literal=False)
+        """
+        self.stages = list(stage_patterns.keys())
+        self.literal = literal
+
+        # Gleiche Patterns nur einmal kompilieren, aber jedes Vorkommen zählen
+        self._sources = []
+        self._pattern_stages = []  # Pattern-Index → Liste von Stages (mit Duplikaten)
+        index = {}
+
+        for stage, patterns in stage_patterns.items():
+            for pattern in patterns:
+                if pattern not in index:
+                    index[pattern] = len(self._sources)
+                    self._sources.append(pattern)
+                    self._pattern_stages.append([])
+                self._pattern_stages[index[pattern]].append(stage)
+
+        if not self._sources:
+            self._automaton = None
+        elif literal:
+            self._keyword_index = index
+            # Keywords, die Präfix eines anderen Keywords sind
+            self._prefixes = [
+                [index[other] for other in self._sources
+                 if other != keyword and keyword.startswith(other)]
+                for keyword in self._sources
+            ]
+            self._automaton = re.compile('(?=(' + trie_regex(self._sources) + '))')
+        else:
+            self._patterns = [re.compile(source, flags) for source in self._sources]
+
+            if all(_word_bounded(source) for source in self._sources):
+                # \b einmal vor die Alternation ziehen statt in jedem Zweig zu prüfen
+                inner = [source[2:-2] for source in self._sources]
+                alternation = '|'.join(f'(?P<p{i}>{source})' for i, source in enumerate(inner))
+                if all(_starts_with_word_char(source) for source in inner):
+                    automaton = rf'(?<!\w)(?=(?:{alternation})\b)'
+                else:
+                    automaton = rf'(?=\b(?:{alternation})\b)'
+            else:
+                alternation = '|'.join(f'(?P<p{i}>{source})'
+                                       for i, source in enumerate(self._sources))
+                automaton = f'(?=(?:{alternation}))'
+
+            self._automaton = re.compile(automaton, flags)
+            self._group_to_index = {f'p{i}': i for i in range(len(self._sources))}
+
+    def matched_patterns(self, text: str) -> set:
+        """Indizes aller Patterns, die im Text vorkommen"""
+        found = set()
+        if not text or self._automaton is None:
+            return found
+
+        if self.literal:
+            for keyword in self._automaton.findall(text):
+                i = self._keyword_index[keyword]
+                found.add(i)
+                found.update(self._prefixes[i])
+            return found
+
+        for match in self._automaton.finditer(text):
+            found.add(self._group_to_index[match.lastgroup])
+            if len(found) == len(self._patterns):
+                break
+
+            # Weitere Patterns, die an derselben Position beginnen
+            position = match.start()
+            for i, pattern in enumerate(self._patterns):
+                if i not in found and pattern.match(text, position):
+                    found.add(i)
+
+        return found
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Treffer pro Stage (alle Stages, in Definitions-Reihenfolge)"""
+        scores = dict.fromkeys(self.stages, 0)
+        for i in self.matched_patterns(text):
+            for stage in self._pattern_stages[i]:
+                scores[stage] += 1
+        return scores
+
+    def best_stage(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Stage mit den meisten Treffern
+
+        Bei Gleichstand gewinnt die zuerst definierte Stage; ohne Treffer
+        wird default zurückgegeben.
+        """
+        scores = self.count(text)
+        max_score = max(scores.values(), default=0)
+        if max_score == 0:
+            return default
+
+        for stage, score in scores.items():
+            if score == max_score:
+                return stage
+
+    def total(self, text: str) -> int:
+        """Summe der Treffer über alle Stages"""
+        return sum(len(self._pattern_stages[i]) for i in self.matched_patterns(text))
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+TFLite Benchmark - Interpreter-Latenz der exportierten Modelle
+===============================================================
+Lädt jedes Modell (Default: alle .tflite in app/src/main/assets) im
+Python-TFLite-Interpreter und spielt einen festen Nachrichten-Korpus ab -
+jede Nachricht einzeln als [1, max_length], wie in der App. Tokenisiert
+wird mit dem word_index aus <stem>_metadata.json bzw. metadata.json
+(FastTokenizer, App-Regeln); ohne Metadata läuft das Modell mit
+Padding-Eingaben (input: 'padding' im Bericht).
+
+Pro Modell und Thread-Anzahl:
+- load_ms:         Interpreter erzeugen + allocate_tensors
+- latency_ms:      p50 / p95 / p99 / mean / min / max pro invoke
+- throughput:      Nachrichten pro Sekunde (sequentiell)
+- peak_rss_mb:     Spitzen-RSS des Benchmark-Prozesses; model_rss_mb ist der
+                   Anteil nach dem Laden (vorher: Python + TensorFlow)
+
+Jedes Modell läuft in einem eigenen Prozess - sonst würde der Spitzen-RSS
+über alle Modelle akkumulieren und ein kaputtes Modell den Lauf beenden.
+Der Bericht (JSON) enthält sha256 + Größe jedes Modells; mit --baseline
+werden p50-Regressionen gegen einen früheren Bericht markiert.
+
+Usage:
+    python3 training/tflite_benchmark.py
+    python3 training/tflite_benchmark.py --threads 1 4 --output benchmarks/v2.json
+    python3 training/tflite_benchmark.py --baseline benchmarks/v1.json --output benchmarks/v2.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import tensorflow as tf
+
+from calibration import encode_messages, load_model_vocabulary, stratified_indices
+from dataset_cache import load_dataset
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_MODELS_DIR = PROJECT_ROOT / 'app' / 'src' / 'main' / 'assets'
+# Fester Korpus (im Repo versioniert) - gleiche Nachrichten für jede Modellversion
+DEFAULT_CORPUS = PROJECT_ROOT / 'ml' / 'data' / 'scientific_augmented_dataset.json'
+
+WARMUP_RUNS = 5
+PERCENTILES = (50, 95, 99)
+
+
+def model_metadata_path(model_path) -> Optional[Path]:
+    """<stem>_metadata.json (assets) oder metadata.json (Trainer-Output) neben dem Modell"""
+    model_path = Path(model_path)
+    for candidate in (model_path.with_name(f"{model_path.stem}_metadata.json"),
+                      model_path.with_name('metadata.json')):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def peak_rss_mb() -> float:
+    """Spitzen-RSS dieses Prozesses (ru_maxrss: Linux KB, macOS Bytes)"""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def summarize_latencies(timings_ms: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/min/max in ms"""
+    timings = np.asarray(timings_ms, dtype=np.float64)
+    summary = {f'p{p}': float(np.percentile(timings, p)) for p in PERCENTILES}
+    summary.update(mean=float(timings.mean()), min=float(timings.min()), max=float(timings.max()))
+    return {key: round(value, 4) for key, value in summary.items()}
+
+
+def load_interpreter(path: str, threads: int = 1):
+    """Returns: (allokierter Interpreter, Ladezeit in ms)"""
+    start = time.perf_counter()
+    interpreter = tf.lite.Interpreter(model_path=str(path), num_threads=threads)
+    interpreter.allocate_tensors()
+    return interpreter, (time.perf_counter() - start) * 1000
+
+
+def time_invocations(interpreter, samples: np.ndarray, runs: int, warmup: int = WARMUP_RUNS) -> List[float]:
+    """
+    Latenz (ms) von runs einzelnen invoke()-Aufrufen, Samples im Kreis
+
+    Gemessen wird invoke + Ausgabe lesen; set_tensor (Kopie der Eingabe) nicht.
+    """
+    input_detail = interpreter.get_input_details()[0]
+    output_index = interpreter.get_output_details()[0]['index']
+    inputs = np.asarray(samples, dtype=input_detail['dtype'])
+
+    for i in range(min(warmup, runs)):
+        interpreter.set_tensor(input_detail['index'], inputs[i % len(inputs)][None, :])
+        interpreter.invoke()
+
+    timings = []
+    for i in range(runs):
+        interpreter.set_tensor(input_detail['index'], inputs[i % len(inputs)][None, :])
+        start = time.perf_counter()
+        interpreter.invoke()
+        interpreter.get_tensor(output_index)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def tflite_latency_ms(path: str, samples: np.ndarray, runs: int = 50, threads: int = 1) -> float:
+    """Median-Latenz (ms) eines TFLite-Modells für einzelne Nachrichten [1, max_length]"""
+    interpreter, _ = load_interpreter(path, threads)
+    return summarize_latencies(time_invocations(interpreter, samples, runs))['p50']
+
+
+def model_inputs(interpreter, texts: Sequence[str], metadata_path: Optional[Path]):
+    """Korpus tokenisiert mit dem word_index des Modells; Returns: (Samples, 'corpus' | 'padding')"""
+    input_length = int(interpreter.get_input_details()[0]['shape'][1])
+    if metadata_path is None:
+        return np.zeros((1, input_length), dtype=np.float32), 'padding'
+
+    word_index, max_length = load_model_vocabulary(str(metadata_path))
+    if max_length != input_length:
+        raise ValueError(f"max_length {max_length} in {metadata_path.name} passt nicht zur "
+                         f"Modell-Eingabe [1, {input_length}]")
+    return encode_messages(texts, word_index, max_length).astype(np.float32), 'corpus'
+
+
+def benchmark_model(path, texts: Sequence[str], threads: int = 1, repeat: int = 1) -> Dict:
+    """
+    Benchmark eines Modells im aktuellen Prozess (isoliert: benchmark_isolated)
+
+    Returns: Bericht-Eintrag (load_ms, latency_ms, throughput, RSS, ...)
+    """
+    rss_before = peak_rss_mb()
+    interpreter, load_ms = load_interpreter(path, threads)
+    samples, input_source = model_inputs(interpreter, texts, model_metadata_path(path))
+    runs = max(1, len(texts) * repeat)
+
+    timings = time_invocations(interpreter, samples, runs)
+    latency = summarize_latencies(timings)
+    peak = peak_rss_mb()
+    return {
+        'threads': threads,
+        'input': input_source,
+        'runs': runs,
+        'load_ms': round(load_ms, 3),
+        'latency_ms': latency,
+        'throughput_per_s': round(1000 / latency['mean'], 1),
+        'peak_rss_mb': round(peak, 1),
+        'model_rss_mb': round(peak - rss_before, 1),
+    }
+
+
+def _error_message(error: Exception) -> str:
+    """Einzeilig + druckbar (TFLite zitiert bei kaputten Dateien Binär-Header)"""
+    text = ' '.join(str(error).split())
+    return f"{type(error).__name__}: " + ''.join(c if c.isprintable() else '?' for c in text)
+
+
+def _benchmark_task(task) -> Dict:
+    """Prozess-Einstieg: ein Modell, eine Thread-Anzahl"""
+    path, texts, threads, repeat = task
+    try:
+        return benchmark_model(path, texts, threads=threads, repeat=repeat)
+    except Exception as e:
+        return {'threads': threads, 'error': _error_message(e)}
+
+
+def benchmark_isolated(path, texts: Sequence[str], threads: int = 1, repeat: int = 1) -> Dict:
+    """benchmark_model in einem frischen Prozess (eigener Spitzen-RSS, Absturz bleibt lokal)"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        try:
+            return executor.submit(_benchmark_task, (str(path), list(texts), threads, repeat)).result()
+        except Exception as e:  # BrokenProcessPool: nativer Absturz im Interpreter
+            return {'threads': threads, 'error': _error_message(e)}
+
+
+def load_corpus(corpus_path, messages: Optional[int] = None, seed: int = 42) -> List[str]:
+    """Fester Nachrichten-Korpus; messages: geschichtete Stichprobe (deterministisch per seed)"""
+    corpus = load_dataset(str(corpus_path))
+    indices = (stratified_indices(corpus['label'], messages, seed=seed)
+               if messages else np.arange(len(corpus['text'])))
+    return [corpus['text'][i] for i in indices]
+
+
+def run_benchmarks(model_paths: Sequence, corpus_path=DEFAULT_CORPUS, messages: Optional[int] = None,
+                   threads: Sequence[int] = (1,), repeat: int = 3, seed: int = 42) -> Dict:
+    """Alle Modelle × Thread-Anzahlen; Returns: Bericht (JSON-serialisierbar)"""
+    texts = load_corpus(corpus_path, messages, seed)
+    print(f"📂 Korpus: {corpus_path} ({len(texts)} Nachrichten × {repeat})")
+
+    results = []
+    for path in model_paths:
+        path = Path(path)
+        print(f"\n⏱️  {path.name}")
+        entry = {
+            'model': path.name,
+            'path': str(path),
+            'size_mb': round(path.stat().st_size / (1024 * 1024), 3),
+            'sha256': file_sha256(path),
+            'runs': [],
+        }
+        for thread_count in threads:
+            result = benchmark_isolated(path, texts, threads=thread_count, repeat=repeat)
+            entry['runs'].append(result)
+            if 'error' in result:
+                print(f"   ❌ {thread_count} Thread(s): {result['error']}")
+            else:
+                latency = result['latency_ms']
+                print(f"   {thread_count} Thread(s): p50 {latency['p50']:.3f} ms, p95 {latency['p95']:.3f} ms, "
+                      f"p99 {latency['p99']:.3f} ms, {result['throughput_per_s']:.0f} msg/s, "
+                      f"Laden {result['load_ms']:.1f} ms, RSS +{result['model_rss_mb']:.1f} MB")
+        results.append(entry)
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'tensorflow': tf.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'corpus': {'path': str(corpus_path), 'messages': len(texts), 'repeat': repeat, 'seed': seed},
+        'models': results,
+    }
+
+
+def compare_reports(report: Dict, baseline: Dict, tolerance: float = 0.10) -> List[Dict]:
+    """
+    p50-Vergleich gegen einen früheren Bericht (gleiches Modell + Threads)
+
+    Returns: Einträge mit ratio = p50 / p50_baseline; regression wenn > 1 + tolerance
+    """
+    def p50_by_key(data):
+        return {(model['model'], run['threads']): run['latency_ms']['p50']
+                for model in data['models'] for run in model['runs'] if 'error' not in run}
+
+    before = p50_by_key(baseline)
+    comparison = []
+    for key, p50 in p50_by_key(report).items():
+        if key not in before:
+            continue
+        ratio = p50 / before[key] if before[key] else float('inf')
+        comparison.append({'model': key[0], 'threads': key[1], 'p50_ms': p50,
+                           'baseline_p50_ms': before[key], 'ratio': round(ratio, 3),
+                           'regression': ratio > 1 + tolerance})
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TFLite-Interpreter-Benchmark der exportierten Modelle')
+    parser.add_argument('--models', nargs='+', help='.tflite-Dateien (Default: alle in --models-dir)')
+    parser.add_argument('--models-dir', default=str(DEFAULT_MODELS_DIR),
+                        help='Verzeichnis mit .tflite-Modellen (Default: app/src/main/assets)')
+    parser.add_argument('--corpus', default=str(DEFAULT_CORPUS), help='Nachrichten-Korpus (JSON mit text/label)')
+    parser.add_argument('--messages', type=int, help='Geschichtete Stichprobe aus dem Korpus (Default: alle)')
+    parser.add_argument('--repeat', type=int, default=3, help='Durchläufe über den Korpus (Default: 3)')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1],
+                        help='Interpreter-Threads, mehrere möglich (Default: 1 wie auf dem Gerät)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='tflite_benchmark.json', help='JSON-Bericht')
+    parser.add_argument('--baseline', help='Früherer Bericht: p50-Regressionen markieren')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Erlaubte p50-Verschlechterung gegen --baseline (Default: 0.10 = 10%%)')
+    args = parser.parse_args()
+
+    model_paths = args.models or sorted(Path(args.models_dir).glob('*.tflite'))
+    if not model_paths:
+        parser.error(f"Keine .tflite-Modelle in {args.models_dir}")
+
+    print('=' * 80)
+    print('⏱️  KidGuard TFLite Benchmark')
+    print('=' * 80)
+    report = run_benchmarks(model_paths, args.corpus, args.messages, args.threads, args.repeat, args.seed)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            comparison = compare_reports(report, json.load(f), args.tolerance)
+        report['baseline'] = {'path': args.baseline, 'tolerance': args.tolerance, 'comparison': comparison}
+        print(f"\n📊 Vergleich mit {args.baseline} (p50):")
+        for row in comparison:
+            marker = '❌' if row['regression'] else '✅'
+            print(f"   {marker} {row['model']:45s} {row['threads']} Thread(s): "
+                  f"{row['baseline_p50_ms']:.3f} → {row['p50_ms']:.3f} ms ({row['ratio']:.2f}x)")
+        if any(row['regression'] for row in comparison):
+            exit_code = 1
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Bericht: {args.output}")
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Token Cache - Tokenisierte + gepaddete Sequenzen als memmap-.npy
+================================================================
+FastTokenizer.fit_on_texts + encode über 190k Texte kosten bei jedem
+Trainingslauf Zeit - auch wenn sich nur die Modell-Architektur geändert
+hat. tokenize_cached() speichert das Ergebnis:
+
+    training/data/cache/tokens/<key>/
+        train.npy, test.npy   (int32, per np.load(mmap_mode='r') geladen)
+        tokenizer.json        (FastTokenizer.to_json())
+        meta.json
+
+Key = sha256 über Inhalt der Texte (Train + Test), Tokenizer-Settings
+(num_words, oov_token, Wort-Muster), max_length, padding, truncating,
+fit-Strategie und TOKEN_CACHE_VERSION.
+Jede Änderung daran → neuer Eintrag; ältere werden per LRU entfernt.
+
+Usage:
+    tokenizer, X_train_pad, X_test_pad = tokenize_cached(
+        X_train, X_test, max_length=CONFIG['max_length'], truncating='post',
+        num_words=CONFIG['vocab_size'], oov_token='<OOV>'
+    )
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from fast_tokenizer import FastTokenizer, tokenizer_from_json
+
+# Erhöhen, wenn sich die Tokenisierung ändert
+TOKEN_CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / 'data' / 'cache' / 'tokens'
+MAX_ENTRIES = 8
+
+
+def dataset_digest(*text_lists: Sequence[str]) -> str:
+    """Content-Hash über alle Texte (Länge + Inhalt, Listen getrennt)"""
+    digest = hashlib.sha256()
+    for texts in text_lists:
+        digest.update(f"[{len(texts)}]".encode('utf-8'))
+        for text in texts:
+            data = str(text).encode('utf-8')
+            digest.update(len(data).to_bytes(8, 'little'))
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def cache_key(train_texts: Sequence[str], test_texts: Sequence[str], settings: dict) -> str:
+    payload = json.dumps({
+        'version': TOKEN_CACHE_VERSION,
+        'settings': settings,
+        'data': dataset_digest(train_texts, test_texts),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def _evict(cache_dir: Path, keep: int = MAX_ENTRIES):
+    """Entfernt die am längsten nicht genutzten Einträge"""
+    entries = sorted((p for p in cache_dir.iterdir() if p.is_dir() and not p.name.startswith('.')),
+                     key=lambda p: p.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry, ignore_errors=True)
+
+
+def tokenize_cached(train_texts: Sequence[str], test_texts: Sequence[str], max_length: int,
+                    padding: str = 'post', truncating: str = 'pre', fit_on_test: bool = True,
+                    cache_dir=DEFAULT_CACHE_DIR,
+                    **tokenizer_kwargs) -> Tuple[FastTokenizer, np.ndarray, np.ndarray]:
+    """
+    Tokenisiert + paddet Train/Test - oder lädt das Ergebnis aus dem Cache
+
+    Args:
+        train_texts, test_texts: Texte
+        max_length, padding, truncating: wie pad_sequences
+        fit_on_test: Tokenizer auf Train + Test fitten (sonst nur Train)
+        cache_dir: Cache-Verzeichnis
+        **tokenizer_kwargs: an FastTokenizer(...) (num_words, oov_token)
+
+    Returns: (tokenizer, X_train_pad, X_test_pad) - Arrays read-only per mmap
+    """
+    # get_config() eines ungefitteten Tokenizers enthält alle Settings inkl. Defaults
+    settings = {
+        'tokenizer': {k: v for k, v in FastTokenizer(**tokenizer_kwargs).get_config().items()
+                      if k not in ('word_counts', 'word_index', 'document_count')},
+        'max_length': max_length,
+        'padding': padding,
+        'truncating': truncating,
+        'fit_on_test': fit_on_test,
+    }
+
+    cache_dir = Path(cache_dir)
+    entry = cache_dir / cache_key(train_texts, test_texts, settings)
+
+    if (entry / 'meta.json').exists():
+        with open(entry / 'tokenizer.json', 'r', encoding='utf-8') as f:
+            tokenizer = tokenizer_from_json(f.read())
+        X_train = np.load(entry / 'train.npy', mmap_mode='r')
+        X_test = np.load(entry / 'test.npy', mmap_mode='r')
+        os.utime(entry)
+        print(f"⚡ Token-Cache: {entry.name[:12]} (Tokenisierung übersprungen)")
+        return tokenizer, X_train, X_test
+
+    start = time.time()
+    tokenizer = FastTokenizer(**tokenizer_kwargs)
+    tokenizer.fit_on_texts(list(train_texts) + list(test_texts) if fit_on_test else train_texts)
+
+    # Direkt in die .npy-Dateien eines temporären Verzeichnisses encoden,
+    # danach atomar umbenennen
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_entry = cache_dir / f".{entry.name}.{os.getpid()}.tmp"
+    tmp_entry.mkdir(exist_ok=True)
+    arrays = []
+    for name, texts in (('train.npy', train_texts), ('test.npy', test_texts)):
+        out = np.lib.format.open_memmap(tmp_entry / name, mode='w+', dtype=np.int32,
+                                        shape=(len(texts), max_length))
+        tokenizer.encode(texts, max_length, padding=padding, truncating=truncating, out=out)
+        out.flush()
+        arrays.append(out)
+    X_train, X_test = arrays
+    with open(tmp_entry / 'tokenizer.json', 'w', encoding='utf-8') as f:
+        f.write(tokenizer.to_json())
+    with open(tmp_entry / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump({**settings, 'train_shape': X_train.shape, 'test_shape': X_test.shape,
+                   'created': time.strftime('%Y-%m-%d %H:%M:%S')}, f, indent=2)
+
+    try:
+        os.replace(tmp_entry, entry)
+    except OSError:
+        # Paralleler Lauf war schneller - dessen Eintrag ist identisch
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    _evict(cache_dir)
+    print(f"💾 Token-Cache gespeichert: {entry.name[:12]} ({time.time() - start:.1f}s Tokenisierung)")
+    return tokenizer, X_train, X_test
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+KidGuard Training - Einstiegspunkt für das Trainer-Paket
+=========================================================
+Usage:
+    python3 training/train.py --config training/configs/pan12_full.json
+    python3 training/train.py --config training/configs/comprehensive.json \
+        --set training.epochs=5 --set model.architecture=conv1d
+
+Konfigurationen: training/configs/*.json (Defaults: trainer/config.py)
+"""
+
+from trainer.cli import main
+
+if __name__ == '__main__':
+    main()
@@ -24,6 +24,8 @@ from sklearn.metrics import classification_report, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from fast_tokenizer import FastTokenizer
+
 # Konfiguration
 np.random.seed(42)
 tf.random.set_seed(42)
@@ -195,11 +197,7 @@ class KidGuardTrainer:
         """Erstellt Tokenizer"""
         print(f"\n🔤 Erstelle Tokenizer (Vocab Size: {vocab_size})...")
 
-        self.tokenizer = tf.keras.preprocessing.text.Tokenizer(
-            num_words=vocab_size,
-            oov_token='<OOV>',
-            filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
-        )
+        self.tokenizer = FastTokenizer(num_words=vocab_size, oov_token='<OOV>')
 
         self.tokenizer.fit_on_texts(texts)
 
@@ -214,14 +212,7 @@ class KidGuardTrainer:
 
     def tokenize_data(self, texts: List[str], maxlen: int = 50) -> np.ndarray:
         """Tokenisiert Texte"""
-        sequences = self.tokenizer.texts_to_sequences(texts)
-        padded = tf.keras.preprocessing.sequence.pad_sequences(
-            sequences,
-            maxlen=maxlen,
-            padding='post',
-            truncating='post'
-        )
-        return padded
+        return self.tokenizer.encode(texts, max_length=maxlen, padding='post', truncating='post')
 
     def build_model(self, vocab_size: int = 5000, embedding_dim: int = 128,
                      maxlen: int = 50, num_classes: int = 6) -> tf.keras.Model:
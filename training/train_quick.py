@@ -44,14 +44,13 @@ print(f"\n✅ Classes: {num_classes}")
 print(f"  {list(le.classes_)}")
 
 # Tokenize
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
+from fast_tokenizer import FastTokenizer
 
-tokenizer = Tokenizer(num_words=5000, oov_token='<OOV>')
+tokenizer = FastTokenizer(num_words=5000, oov_token='<OOV>')
 tokenizer.fit_on_texts(X_train + X_test)
 
-X_train_seq = pad_sequences(tokenizer.texts_to_sequences(X_train), maxlen=50)
-X_test_seq = pad_sequences(tokenizer.texts_to_sequences(X_test), maxlen=50)
+X_train_seq = tokenizer.encode(X_train, max_length=50, padding='pre', truncating='pre')
+X_test_seq = tokenizer.encode(X_test, max_length=50, padding='pre', truncating='pre')
 
 print(f"\n✅ Shapes: Train={X_train_seq.shape}, Test={X_test_seq.shape}")
 
@@ -7,13 +7,23 @@ Incorporating latest research findings (2024-2026):
 - Attention mechanisms for interpretability
 - Few-shot learning for new grooming tactics
 - Cross-lingual capabilities (English + German)
+
+Bleibt bewusst ein eigenes Skript statt eines Trainer-Wrappers
+(training/trainer, vgl. train_advanced_model.py):
+- Multi-Task: der stage_output-Kopf braucht eine zweite Label-Spalte pro
+  Sample. Die geladenen Datasets haben nur ein (binäres) Label - der Kopf
+  wird hier mit denselben Labels trainiert, die App nutzt nur binary_output.
+  Eine Registry-Architektur mit zwei Ausgaben bräuchte zusätzlich
+  Multi-Output-Loss, -Metriken und -Export im Trainer, ohne Stage-Daten
+  zum Trainieren.
+- Daten: mehrere Quellen mit Exakt- + Near-Duplicate-Filter (near_dedup.py)
+  und On-the-fly-Augmentation (TokenAugmenter) - beides kennt der Trainer
+  nicht.
 """
 
 import json
 import numpy as np
 import tensorflow as tf
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import (
     Input, Embedding, LSTM, Bidirectional, Dense, Dropout,
@@ -28,6 +38,10 @@ from collections import Counter
 import os
 import re
 
+from fast_tokenizer import FastTokenizer
+from input_pipeline import TokenAugmenter, make_dataset
+from near_dedup import drop_near_duplicates
+
 print("🚀 KidGuard ULTIMATE Model Training")
 print("Latest Research Integration (2024-2026)")
 print("=" * 70)
@@ -44,7 +58,11 @@ CONFIG = {
     'attention_heads': 4,  # Multi-head attention
     'use_attention': True,  # Transformer-inspired
     'use_multitask': True,  # Stage + Binary prediction
-    'use_augmentation': True,
+    'near_dup_threshold': 0.8,  # MinHash/LSH-Dedup (0 = nur exakt)
+    'use_augmentation': True,  # On-the-fly in tf.data (input_pipeline.py)
+    'augment_class_probs': {1: 0.5},  # Nur Grooming-Samples (Minderheit) augmentieren
+    'synonym_prob': 0.15,
+    'noise_prob': 0.05,
     'cross_validation': False,
     'ensemble_size': 1
 }
@@ -141,45 +159,15 @@ def load_all_datasets():
             seen.add(text)
             unique.append(sample)
 
+    # Near-Duplicates (augmentierte / übersetzte Varianten)
+    if CONFIG['near_dup_threshold'] > 0:
+        keep = drop_near_duplicates((s['text'] for s in unique), CONFIG['near_dup_threshold'])
+        print(f"🔍 Near-Duplicates entfernt: {len(unique) - len(keep)}")
+        unique = [unique[i] for i in keep]
+
     print(f"\n📊 Total unique samples: {len(unique)}")
     return unique
 
-def augment_text(text, label):
-    """
-    Data augmentation techniques:
-    - Synonym replacement
-    - Back-translation simulation
-    - Character-level noise
-    """
-    if not CONFIG['use_augmentation']:
-        return [text]
-
-    augmented = [text]
-
-    # Only augment grooming samples (minority class)
-    if label == 0:
-        return augmented
-
-    # Simple synonym replacement for German
-    synonyms = {
-        'allein': ['alleine', 'ohne jemand', 'für dich'],
-        'treffen': ['sehen', 'besuchen', 'zusammenkommen'],
-        'geheim': ['privat', 'zwischen uns', 'nur für uns'],
-        'robux': ['v-bucks', 'geld', 'coins'],
-    }
-
-    # Create augmented version with synonyms
-    aug_text = text.lower()
-    for word, replacements in synonyms.items():
-        if word in aug_text:
-            for replacement in replacements[:1]:  # Use first synonym
-                new_text = aug_text.replace(word, replacement)
-                if new_text != aug_text:
-                    augmented.append(new_text)
-                    break
-
-    return augmented[:2]  # Return max 2 versions
-
 def create_attention_block(inputs, num_heads=4, key_dim=64, dropout=0.3):
     """
     Multi-head attention block (Transformer-inspired)
@@ -272,11 +260,10 @@ def main():
     print("\n📂 Loading datasets...")
     samples = load_all_datasets()
 
-    # Extract and augment
+    # Extract (Augmentation passiert pro Batch in der tf.data-Pipeline)
     texts = []
     binary_labels = []
 
-    print("\n🔄 Augmenting minority class...")
     for sample in samples:
         text = sample['text']
         label = sample.get('label', 0)
@@ -287,15 +274,12 @@ def main():
         else:
             binary_label = int(label)
 
-        # Augment
-        augmented_texts = augment_text(text, binary_label)
-        for aug_text in augmented_texts:
-            texts.append(aug_text)
-            binary_labels.append(binary_label)
+        texts.append(text)
+        binary_labels.append(binary_label)
 
     labels = np.array(binary_labels)
 
-    print(f"📊 After augmentation: {len(texts)} samples")
+    print(f"📊 Samples: {len(texts)}")
 
     # Label distribution
     counts = Counter(labels)
@@ -309,16 +293,11 @@ def main():
 
     # Tokenizer with increased vocab
     print(f"\n🔤 Creating tokenizer (vocab={CONFIG['vocab_size']})...")
-    tokenizer = Tokenizer(
-        num_words=CONFIG['vocab_size'],
-        oov_token='<OOV>',
-        lower=True
-    )
+    tokenizer = FastTokenizer(num_words=CONFIG['vocab_size'], oov_token='<OOV>')
     tokenizer.fit_on_texts(texts)
 
     # Create sequences
-    sequences = tokenizer.texts_to_sequences(texts)
-    padded = pad_sequences(sequences, maxlen=CONFIG['max_length'], padding='post', truncating='post')
+    padded = tokenizer.encode(texts, max_length=CONFIG['max_length'], padding='post', truncating='post')
 
     print(f"✅ Shape: {padded.shape}")
 
@@ -329,6 +308,27 @@ def main():
 
     print(f"\n📋 Split: Train={len(X_train)}, Test={len(X_test)}")
 
+    # Input-Pipeline: Minderheits-Klasse wird jede Epoche neu augmentiert
+    augmenter = None
+    if CONFIG['use_augmentation']:
+        augmenter = TokenAugmenter(
+            tokenizer.word_index,
+            CONFIG['vocab_size'],
+            class_probs=CONFIG['augment_class_probs'],
+            synonym_prob=CONFIG['synonym_prob'],
+            noise_prob=CONFIG['noise_prob']
+        )
+        print(f"🔄 On-the-fly Augmentation: {augmenter.num_synonym_words} Synonym-Wörter im Vokabular, "
+              f"Klassen {CONFIG['augment_class_probs']}")
+
+    train_dataset = make_dataset(
+        X_train,
+        y_train if not CONFIG['use_multitask'] else {'binary_output': y_train, 'stage_output': y_train},
+        classes=y_train,
+        batch_size=CONFIG['batch_size'],
+        augmenter=augmenter
+    )
+
     # Build model
     print(f"\n🏗️ Building ULTIMATE model...")
     print(f"   Features: BiLSTM + {'Attention' if CONFIG['use_attention'] else 'Standard'}")
@@ -394,8 +394,7 @@ def main():
     print("=" * 70)
 
     history = model.fit(
-        X_train, y_train if not CONFIG['use_multitask'] else {'binary_output': y_train, 'stage_output': y_train},
-        batch_size=CONFIG['batch_size'],
+        train_dataset,
         epochs=CONFIG['epochs'],
         validation_data=(X_test, y_test if not CONFIG['use_multitask'] else {'binary_output': y_test, 'stage_output': y_test}),
         class_weight=class_weight_dict if not CONFIG['use_multitask'] else {'binary_output': class_weight_dict},
@@ -452,7 +451,7 @@ def main():
         'vocab_size': CONFIG['vocab_size'],
         'max_length': CONFIG['max_length'],
         'embedding_dim': CONFIG['embedding_dim'],
-        'word_index': {w: i for w, i in tokenizer.word_index.items() if i < CONFIG['vocab_size']},
+        'word_index': tokenizer.export_word_index(),
         'test_recall': float(recall_value),
         'architecture': 'BiLSTM+Attention' if CONFIG['use_attention'] else 'BiLSTM',
         'features': ['multi_head_attention', 'data_augmentation', 'class_weights'],
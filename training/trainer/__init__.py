@@ -0,0 +1,45 @@
+"""
+KidGuard Trainer - konfigurationsgetriebenes Training
+======================================================
+Ersetzt die kopierten Top-Level-Skripte (train_pan12_full, _labeled,
+_fixed, train_comprehensive, train_advanced_model, ml/scripts/train_*;
+train_ultimate_model bleibt eigenständig, siehe dort): Laden,
+Label-Encoding, Tokenisierung (Token-Cache), Modellbau, fit (tf.data +
+Length Bucketing), Evaluation und TFLite-Export an einer Stelle.
+
+- config:        DEFAULT_CONFIG + JSON/YAML-Datei + Overrides
+- architectures: conv1d | bilstm | bilstm_attention | mlp (Registry)
+- losses:        crossentropy | focal | distillation
+- core:          Trainer (prepare, build_model, fit, evaluate, export_*, run)
+- cross_validation: k-Fold CV, Folds parallel auf einem Prozess-Pool
+- ensemble:      Member parallel trainieren, in einen TFLite-Student destillieren
+- search:        Hyperparameter-Suche mit Median-Pruning, SQLite-Study, TFLite-Kosten
+- performance:   Mixed Precision (bf16/fp16) + XLA, Epochenzeit gegen float32-Baseline
+- checkpoint:    Vollständiger Trainingszustand pro Epoche, --resume
+
+Usage:
+    python3 training/train.py --config training/configs/pan12_full.json
+    python3 training/train.py --config training/configs/comprehensive.json --set training.epochs=5
+    python3 training/train.py --config training/configs/comprehensive.json --cv
+    python3 training/train.py --config training/configs/comprehensive.json --ensemble
+    python3 training/train.py --config training/configs/comprehensive.json --search
+    python3 training/train.py --resume training/models/comprehensive
+"""
+
+from .architectures import ARCHITECTURES, build_model, register_architecture
+from .config import DEFAULT_CONFIG, apply_overrides, apply_params, load_config, save_config
+from .core import Trainer
+from .cross_validation import aggregate_folds, run_cross_validation
+from .data import PreparedData, prepare_data
+from .ensemble import run_ensemble
+from .losses import DistillationLoss, FocalLoss, build_loss
+from .metrics import ClassPrecision, ClassRecall, LabelAccuracy
+from .search import Study, run_search
+
+__all__ = [
+    'ARCHITECTURES', 'build_model', 'register_architecture',
+    'DEFAULT_CONFIG', 'apply_overrides', 'apply_params', 'load_config', 'save_config',
+    'Trainer', 'aggregate_folds', 'run_cross_validation', 'run_ensemble', 'run_search', 'Study',
+    'PreparedData', 'prepare_data',
+    'DistillationLoss', 'FocalLoss', 'build_loss', 'ClassPrecision', 'ClassRecall', 'LabelAccuracy',
+]
@@ -0,0 +1,125 @@
+"""
+Architekturen - Registry für Modell-Builder
+============================================
+Jeder Builder bekommt config['model'], vocab_size und num_classes und gibt
+ein (nicht kompiliertes) Keras-Modell mit Input(shape=(None,)) zurück -
+variable Länge für Length Bucketing, der Export fixiert max_length.
+
+Eigene Architekturen:
+    @register_architecture('meine_arch')
+    def build_meine_arch(model_config, vocab_size, num_classes): ...
+"""
+
+from typing import Callable, Dict
+
+from tensorflow.keras import layers, models
+
+ARCHITECTURES: Dict[str, Callable] = {}
+
+
+def register_architecture(name: str):
+    def decorator(builder: Callable) -> Callable:
+        ARCHITECTURES[name] = builder
+        return builder
+    return decorator
+
+
+def build_model(model_config: dict, vocab_size: int, num_classes: int, name: str = 'kidguard'):
+    architecture = model_config['architecture']
+    if architecture not in ARCHITECTURES:
+        raise ValueError(f"Unbekannte Architektur: {architecture} ({' | '.join(sorted(ARCHITECTURES))})")
+    return ARCHITECTURES[architecture](model_config, vocab_size, num_classes, name=name)
+
+
+def _embedding(inputs, model_config: dict, vocab_size: int, mask_zero: bool = True):
+    return layers.Embedding(
+        input_dim=vocab_size,
+        output_dim=model_config['embedding_dim'],
+        mask_zero=mask_zero,
+        name='embedding'
+    )(inputs)
+
+
+def _dense_head(x, model_config: dict, num_classes: int):
+    """Dense-Stack (+ BatchNorm, Dropout, optional Residual) + Softmax-Ausgabe"""
+    units_list = model_config['dense_units']
+    dropouts = model_config['dense_dropout'] or [model_config['dropout']] * len(units_list)
+
+    for i, (units, dropout) in enumerate(zip(units_list, dropouts)):
+        dense = layers.Dense(units, activation='relu', name=f'dense_{i}')(x)
+        if model_config['batch_norm']:
+            dense = layers.BatchNormalization(name=f'batch_norm_{i}')(dense)
+        if dropout:
+            dense = layers.Dropout(dropout, name=f'dropout_{i}')(dense)
+
+        # Residual connection if dimensions match
+        if model_config['residual'] and i > 0 and units == units_list[i - 1]:
+            x = layers.Add(name=f'residual_{i}')([x, dense])
+        else:
+            x = dense
+
+    # Softmax immer in float32 (numerisch stabil, auch bei Mixed Precision)
+    return layers.Dense(num_classes, activation='softmax', dtype='float32', name='output')(x)
+
+
+@register_architecture('conv1d')
+def build_conv1d(model_config: dict, vocab_size: int, num_classes: int, name: str = 'kidguard'):
+    """Embedding → Conv1D → GlobalMaxPooling (TFLite-freundlich, ml/scripts-Modelle)"""
+    inputs = layers.Input(shape=(None,), name='input')
+    # Conv1D unterstützt keine Masken - Padding-Embeddings lernt das Modell
+    x = _embedding(inputs, model_config, vocab_size, mask_zero=False)
+    x = layers.Conv1D(model_config['conv_filters'], model_config['kernel_size'],
+                      padding='same', activation='relu', name='conv1d')(x)
+    x = layers.GlobalMaxPooling1D(name='max_pool')(x)
+    return models.Model(inputs, _dense_head(x, model_config, num_classes), name=name)
+
+
+@register_architecture('bilstm')
+def build_bilstm(model_config: dict, vocab_size: int, num_classes: int, name: str = 'kidguard'):
+    """Gestapelte BiLSTMs, letzte Schicht ohne Sequenz-Ausgabe (train_pan12_fixed)"""
+    inputs = layers.Input(shape=(None,), name='input')
+    x = _embedding(inputs, model_config, vocab_size)
+    lstm_layers = model_config['lstm_layers'] or [model_config['lstm_units']]
+    for i, units in enumerate(lstm_layers):
+        x = layers.Bidirectional(
+            layers.LSTM(units, return_sequences=i < len(lstm_layers) - 1),
+            name=f'bi_lstm_{i}'
+        )(x)
+    return models.Model(inputs, _dense_head(x, model_config, num_classes), name=name)
+
+
+@register_architecture('bilstm_attention')
+def build_bilstm_attention(model_config: dict, vocab_size: int, num_classes: int, name: str = 'kidguard'):
+    """BiLSTM + Multi-Head Attention (Add & Norm) + Pooling (pan12_full, comprehensive)"""
+    inputs = layers.Input(shape=(None,), name='input')
+    x = _embedding(inputs, model_config, vocab_size)
+    lstm_out = layers.Bidirectional(
+        layers.LSTM(model_config['lstm_units'], return_sequences=True),
+        name='bi_lstm'
+    )(x)
+
+    if model_config['use_attention']:
+        heads = model_config['attention_heads']
+        attention_out = layers.MultiHeadAttention(
+            num_heads=heads,
+            key_dim=model_config['attention_key_dim'] or model_config['embedding_dim'] // heads,
+            name='multi_head_attention'
+        )(lstm_out, lstm_out)
+
+        # Add & Norm (Residual Connection)
+        attention_out = layers.Add(name='attention_residual')([lstm_out, attention_out])
+        sequence = layers.LayerNormalization(name='attention_norm')(attention_out)
+    else:
+        sequence = lstm_out
+
+    pooled = layers.GlobalAveragePooling1D(name='pooling')(sequence)
+    return models.Model(inputs, _dense_head(pooled, model_config, num_classes), name=name)
+
+
+@register_architecture('mlp')
+def build_mlp(model_config: dict, vocab_size: int, num_classes: int, name: str = 'kidguard'):
+    """Bag-of-Embeddings: gemitteltes Embedding (Padding maskiert) → Dense-Stack"""
+    inputs = layers.Input(shape=(None,), name='input')
+    x = _embedding(inputs, model_config, vocab_size)
+    x = layers.GlobalAveragePooling1D(name='pooling')(x)
+    return models.Model(inputs, _dense_head(x, model_config, num_classes), name=name)
@@ -0,0 +1,175 @@
+"""
+Checkpoint/Resume - vollständiger Trainingszustand pro Epoche
+==============================================================
+ModelCheckpoint speichert nur best_model.keras; ein abgebrochener Lauf
+finge bei Epoche 0 an. TrainingState schreibt nach jeder Epoche nach
+<output_dir>/checkpoint/:
+
+- model.npz         alle Modell-Variablen (inkl. Dropout-Seed-Zustände)
+- optimizer.npz     Optimizer-Variablen (Iteration, Learning Rate, Momente)
+- best_weights.npz  Gewichte der besten Epoche (EarlyStopping restore_best_weights)
+- rng.pkl           Python-, NumPy- und TensorFlow-RNG-Zustand
+- state.json        Epoche, Zähler von EarlyStopping / ReduceLROnPlateau /
+                    ModelCheckpoint, completed
+
+Geschrieben wird in ein temporäres Verzeichnis, das dann das alte ersetzt -
+ein Abbruch mitten im Speichern hinterlässt den vorherigen Checkpoint.
+
+Usage:
+    python3 training/train.py --resume training/models/pan12_full
+    python3 training/train_comprehensive.py --resume
+"""
+
+import json
+import os
+import pickle
+import random
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+STATE_FILE = 'state.json'
+
+# Zähler, ohne die EarlyStopping/ReduceLROnPlateau nach dem Resume neu zählen würden
+CALLBACK_STATE = {
+    keras.callbacks.EarlyStopping: ('wait', 'stopped_epoch', 'best', 'best_epoch'),
+    keras.callbacks.ReduceLROnPlateau: ('wait', 'cooldown_counter', 'best'),
+    keras.callbacks.ModelCheckpoint: ('best',),
+}
+
+
+def load_training_state(directory: str) -> Optional[Dict]:
+    """state.json eines Checkpoints oder None"""
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _save_arrays(path: str, arrays: List[np.ndarray]):
+    np.savez(path, *arrays)
+
+
+def _load_arrays(path: str) -> List[np.ndarray]:
+    with np.load(path) as data:
+        return [data[f'arr_{i}'] for i in range(len(data.files))]
+
+
+def _assign(variables, arrays: List[np.ndarray], what: str):
+    if len(variables) != len(arrays):
+        raise ValueError(f"Checkpoint passt nicht zum Modell: {len(arrays)} {what}-Variablen "
+                         f"gespeichert, {len(variables)} erwartet")
+    for variable, array in zip(variables, arrays):
+        variable.assign(array)
+
+
+def _json_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class TrainingState(keras.callbacks.Callback):
+    """
+    Speichert/lädt den vollständigen Trainingszustand (siehe Modul-Docstring)
+
+    Muss NACH den Callbacks in callbacks_list stehen: deren on_train_begin
+    setzt die Zähler zurück, erst danach stellt restore=True sie wieder her.
+    """
+
+    def __init__(self, directory: str, callbacks_list: List[keras.callbacks.Callback],
+                 every: int = 1, restore: bool = False):
+        super().__init__()
+        self.directory = directory
+        self.callbacks_list = [cb for cb in callbacks_list if type(cb) in CALLBACK_STATE]
+        self.every = every
+        self.restore = restore
+        self._last_epoch = 0
+
+    # ------------------------------------------------------------------
+    # Speichern
+    # ------------------------------------------------------------------
+
+    def save(self, epoch: int, completed: bool = False):
+        tmp_dir = self.directory + '.tmp'
+        old_dir = self.directory + '.old'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        _save_arrays(os.path.join(tmp_dir, 'model.npz'),
+                     [keras.ops.convert_to_numpy(v) for v in self.model.variables])
+        _save_arrays(os.path.join(tmp_dir, 'optimizer.npz'),
+                     [keras.ops.convert_to_numpy(v) for v in self.model.optimizer.variables])
+
+        callback_state = {}
+        for callback in self.callbacks_list:
+            callback_state[type(callback).__name__] = {
+                name: _json_value(getattr(callback, name, None)) for name in CALLBACK_STATE[type(callback)]
+            }
+            best_weights = getattr(callback, 'best_weights', None)
+            if best_weights is not None:
+                _save_arrays(os.path.join(tmp_dir, 'best_weights.npz'), best_weights)
+
+        with open(os.path.join(tmp_dir, 'rng.pkl'), 'wb') as f:
+            pickle.dump({
+                'python': random.getstate(),
+                'numpy': np.random.get_state(),
+                'tensorflow': tf.random.get_global_generator().state.numpy(),
+            }, f)
+
+        with open(os.path.join(tmp_dir, STATE_FILE), 'w') as f:
+            json.dump({
+                'epoch': epoch,
+                'completed': completed,
+                'callbacks': callback_state,
+                'saved': datetime.now().isoformat(timespec='seconds'),
+            }, f, indent=2)
+
+        # Austausch: checkpoint → .old, .tmp → checkpoint
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(self.directory):
+            os.replace(self.directory, old_dir)
+        os.replace(tmp_dir, self.directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def on_epoch_end(self, epoch, logs=None):
+        self._last_epoch = epoch + 1
+        if self._last_epoch % self.every == 0:
+            self.save(self._last_epoch)
+
+    def on_train_end(self, logs=None):
+        # Nach EarlyStopping.on_train_end → enthält die wiederhergestellten besten Gewichte
+        self.save(self._last_epoch, completed=True)
+
+    # ------------------------------------------------------------------
+    # Laden
+    # ------------------------------------------------------------------
+
+    def on_train_begin(self, logs=None):
+        if not self.restore:
+            return
+        state = load_training_state(self.directory)
+        if state is None:
+            return
+        self._last_epoch = state['epoch']
+
+        _assign(self.model.variables, _load_arrays(os.path.join(self.directory, 'model.npz')), 'Modell')
+        self.model.optimizer.build(self.model.trainable_variables)
+        _assign(self.model.optimizer.variables,
+                _load_arrays(os.path.join(self.directory, 'optimizer.npz')), 'Optimizer')
+
+        best_weights_path = os.path.join(self.directory, 'best_weights.npz')
+        for callback in self.callbacks_list:
+            for name, value in state['callbacks'].get(type(callback).__name__, {}).items():
+                setattr(callback, name, value)
+            if hasattr(callback, 'best_weights') and os.path.exists(best_weights_path):
+                callback.best_weights = _load_arrays(best_weights_path)
+
+        with open(os.path.join(self.directory, 'rng.pkl'), 'rb') as f:
+            rng = pickle.load(f)
+        random.setstate(rng['python'])
+        np.random.set_state(rng['numpy'])
+        tf.random.get_global_generator().reset(rng['tensorflow'])
@@ -0,0 +1,50 @@
+"""
+Kommandozeile für den Trainer (training/train.py und die Wrapper-Skripte)
+"""
+
+import argparse
+import os
+from typing import Optional
+
+from .config import load_config
+from .core import Trainer
+from .cross_validation import run_cross_validation
+from .ensemble import run_ensemble
+from .search import run_search
+
+
+def parse_args(default_config: Optional[str] = None, argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='KidGuard Trainer')
+    parser.add_argument('--config', default=default_config,
+                        help='Konfigurationsdatei (.json oder .yaml)')
+    parser.add_argument('--set', dest='overrides', action='append', default=[], metavar='KEY=VALUE',
+                        help="Konfigurationswert überschreiben, z.B. training.epochs=5 (mehrfach möglich)")
+    parser.add_argument('--cv', action='store_true',
+                        help='Stratified k-Fold Cross-Validation statt eines Trainingslaufs '
+                             '(Folds parallel, siehe cross_validation.*)')
+    parser.add_argument('--ensemble', action='store_true',
+                        help='Ensemble (parallel) trainieren und in einen Student destillieren '
+                             '(siehe ensemble.*)')
+    parser.add_argument('--search', action='store_true',
+                        help='Hyperparameter-Suche (parallele Trials, Median-Pruning, SQLite-Study; '
+                             'siehe search.*)')
+    parser.add_argument('--resume', nargs='?', const='', default=None, metavar='OUTPUT_DIR',
+                        help='Unterbrochenen Lauf ab <output_dir>/checkpoint fortsetzen; mit OUTPUT_DIR '
+                             'wird dessen config.json verwendet')
+    args = parser.parse_args(argv)
+    if args.config is None and not args.resume:
+        parser.error('--config oder --resume OUTPUT_DIR erforderlich')
+    return args
+
+
+def main(default_config: Optional[str] = None, argv=None):
+    args = parse_args(default_config, argv)
+    config_path = os.path.join(args.resume, 'config.json') if args.resume else args.config
+    config = load_config(config_path, args.overrides)
+    if args.cv:
+        return run_cross_validation(config)
+    if args.ensemble:
+        return run_ensemble(config)
+    if args.search:
+        return run_search(config)
+    return Trainer(config).run(resume=args.resume is not None)
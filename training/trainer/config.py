@@ -0,0 +1,241 @@
+"""
+Trainer-Konfiguration - JSON/YAML mit Defaults
+===============================================
+Eine Konfigurationsdatei beschreibt einen kompletten Trainingslauf in
+Abschnitten (data, model, loss, training, cross_validation, ensemble,
+search, export). Nicht angegebene Werte kommen aus DEFAULT_CONFIG; unbekannte
+Schlüssel sind ein Fehler (Tippfehler sollen nicht stillschweigend
+ignoriert werden).
+
+Usage:
+    config = load_config('training/configs/pan12_full.json',
+                         overrides=['training.epochs=5', 'model.architecture=conv1d'])
+"""
+
+import copy
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+MODEL_DEFAULTS = {
+    'architecture': 'bilstm_attention',   # conv1d | bilstm | bilstm_attention | mlp
+    'embedding_dim': 256,
+    'lstm_units': 128,
+    'lstm_layers': None,         # bilstm: Units pro Schicht (Default: [lstm_units])
+    'use_attention': True,
+    'attention_heads': 4,
+    'attention_key_dim': None,   # Default: embedding_dim // attention_heads
+    'conv_filters': 128,
+    'kernel_size': 5,
+    'dense_units': [256, 128, 64],
+    'dense_dropout': None,       # Dropout pro Dense-Schicht (Default: dropout)
+    'dropout': 0.5,
+    'batch_norm': True,
+    'residual': False,           # Residual-Verbindung zwischen gleich breiten Dense-Schichten
+}
+
+DEFAULT_CONFIG = {
+    'name': 'kidguard',
+
+    'data': {
+        'train': None,               # Pfad oder Liste von Pfaden (werden aneinandergehängt)
+        'test': None,                # Pfad/Liste - oder None mit test_split
+        'test_split': None,          # ohne data.test: stratifizierter Anteil von train als Test-Set
+        'vocab_size': 20000,
+        'max_length': 100,
+        'fit_tokenizer_on_test': True,   # Tokenizer auf Train + Test fitten
+        'positive_label': 'grooming',    # Klasse für Recall/Precision-Metriken
+    },
+
+    'model': dict(MODEL_DEFAULTS),
+
+    'loss': {
+        'type': 'crossentropy',      # crossentropy | focal
+        'focal_alpha': 0.25,
+        'focal_gamma': 2.0,
+    },
+
+    'training': {
+        'epochs': 100,
+        'batch_size': 64,
+        'learning_rate': 0.001,
+        'validation': 'split',       # split (letzte validation_split des Train-Sets) | test
+        'validation_split': 0.15,
+        'class_weights': True,
+        'class_balance': None,       # 0.0-1.0: Minderheitsklassen pro Batch häufiger ziehen (1.0 = gleichverteilt)
+        'length_bucketing': True,
+        'monitor': 'val_recall',
+        'early_stopping_patience': 10,
+        'reduce_lr_patience': 5,
+        'reduce_lr_factor': 0.5,
+        'min_lr': 1e-7,
+        'tensorboard': False,
+        'checkpoint_every': 1,       # Epochen zwischen vollständigen Checkpoints (Resume), 0 = aus
+        'performance_mode': False,   # XLA (jit_compile) + Mixed Precision, siehe performance.py
+        'precision': 'auto',         # im Performance-Modus: auto | mixed_bfloat16 | mixed_float16 | float32
+        'jit_compile': True,         # im Performance-Modus: XLA (eine Kompilierung pro Bucket-Shape)
+        'baseline_epochs': 2,        # float32-Referenzlauf für den Speedup-Bericht (0 = aus)
+        'seed': 42,
+        'verbose': 1,
+    },
+
+    'cross_validation': {
+        'folds': 5,
+        'workers': None,             # parallele Folds (Default: min(folds, CPU-Kerne))
+        'threads_per_worker': None,  # Intra-Op-Threads pro Fold (Default: CPU-Kerne // workers)
+    },
+
+    'ensemble': {
+        'size': 3,
+        'workers': None,             # parallele Member (Default: min(size, CPU-Kerne))
+        'threads_per_worker': None,
+        'temperature': 2.0,          # Distillation: Glättung von Teacher + Student
+        'alpha': 0.3,                # Gewicht der harten Labels (Rest: Teacher-Verteilung)
+        'student_epochs': None,      # Default: training.epochs
+        # Kleines Student-Modell für TFLite (gleiche Schlüssel wie 'model')
+        'student': {**MODEL_DEFAULTS, 'architecture': 'conv1d', 'embedding_dim': 64,
+                    'conv_filters': 64, 'dense_units': [64], 'dropout': 0.3, 'batch_norm': False},
+    },
+
+    'search': {
+        'trials': 20,
+        'workers': None,             # parallele Trials (Default: min(trials, CPU-Kerne))
+        'threads_per_worker': None,
+        'epochs': None,              # Epochs pro Trial (Default: training.epochs)
+        'study': None,               # SQLite-Datei (Default: <output_dir>/search/study.sqlite)
+        'seed': 42,
+        # 'abschnitt.schlüssel': [Werte] oder {'low', 'high', 'log'} (data.* nicht erlaubt)
+        'space': {
+            'model.embedding_dim': [64, 128, 256],
+            'model.lstm_units': [32, 64, 128],
+            'model.dropout': {'low': 0.2, 'high': 0.5},
+            'training.learning_rate': {'low': 1e-4, 'high': 3e-3, 'log': True},
+            # loss.focal_* nur mit loss.type focal (configs/comprehensive.json)
+        },
+        # Median Stopping: Trial stoppen, wenn sein laufender Mittelwert des
+        # Monitors unter dem Median der anderen Trials in derselben Epoche liegt
+        'prune_warmup_epochs': 3,
+        'prune_min_trials': 4,
+        # Score = Recall - parameter_penalty * Mio. Parameter - latency_penalty * ms
+        'parameter_penalty': 0.02,
+        'latency_penalty': 0.01,
+        'max_parameters': None,      # harte Grenzen (Trial gilt als unzulässig)
+        'max_latency_ms': None,
+        'latency_runs': 50,
+        'latency_threads': 1,        # Interpreter-Threads wie auf dem Gerät
+    },
+
+    'export': {
+        'output_dir': 'training/models/kidguard',
+        'tflite_name': 'kidguard.tflite',
+        'float16': True,
+        'saved_model': True,         # Float-SavedModel neben dem .tflite (quantize_model.py --auto)
+        'plots': True,
+    },
+
+    'targets': {
+        'accuracy': None,
+        'recall': None,
+    },
+}
+
+
+# Frei belegbare Abschnitte: werden als Ganzes ersetzt statt gemergt
+FREEFORM_KEYS = {'search.space'}
+
+
+def _merge(base: dict, update: dict, path: str = '') -> dict:
+    """Rekursives Merge; unbekannte Schlüssel → ValueError"""
+    for key, value in update.items():
+        if key not in base:
+            raise ValueError(f"Unbekannter Konfigurationsschlüssel: {path}{key}")
+        if f"{path}{key}" in FREEFORM_KEYS:
+            base[key] = copy.deepcopy(value)
+        elif isinstance(base[key], dict) and isinstance(value, dict):
+            _merge(base[key], value, f"{path}{key}.")
+        else:
+            base[key] = value
+    return base
+
+
+def _parse_value(raw: str):
+    """'5' → 5, 'true' → True, '[64, 32]' → [64, 32], sonst String"""
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return raw
+
+
+def apply_params(config: dict, params: Dict[str, Any]) -> dict:
+    """Setzt Werte per {'abschnitt.schlüssel': wert}"""
+    for dotted, value in params.items():
+        update = value
+        for key in reversed(dotted.strip().split('.')):
+            update = {key: update}
+        _merge(config, update)
+    return config
+
+
+def apply_overrides(config: dict, overrides: Iterable[str]) -> dict:
+    """Überschreibt Werte per 'abschnitt.schlüssel=wert'"""
+    for override in overrides:
+        if '=' not in override:
+            raise ValueError(f"Override muss 'schlüssel=wert' sein: {override}")
+        dotted, raw = override.split('=', 1)
+        apply_params(config, {dotted: _parse_value(raw)})
+    return config
+
+
+def read_config_file(path) -> dict:
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix in ('.yaml', '.yml'):
+            if not HAS_YAML:
+                raise ImportError("YAML-Konfiguration braucht PyYAML: pip3 install pyyaml")
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+
+def load_config(path=None, overrides: Optional[Iterable[str]] = None) -> dict:
+    """
+    DEFAULT_CONFIG + Konfigurationsdatei (.json/.yaml) + Overrides
+
+    Returns: vollständige Konfiguration (tiefe Kopie, darf verändert werden)
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path is not None:
+        _merge(config, read_config_file(path))
+    if overrides:
+        apply_overrides(config, overrides)
+
+    if not config['data']['train']:
+        raise ValueError("data.train muss gesetzt sein")
+    test_split = config['data']['test_split']
+    if not config['data']['test'] and test_split is None:
+        raise ValueError("data.test oder data.test_split muss gesetzt sein")
+    if test_split is not None and not 0.0 < test_split < 1.0:
+        raise ValueError(f"data.test_split muss zwischen 0 und 1 liegen: {test_split}")
+    if config['training']['validation'] not in ('split', 'test'):
+        raise ValueError(f"training.validation muss 'split' oder 'test' sein: {config['training']['validation']}")
+    if config['training']['precision'] not in ('auto', 'float32', 'mixed_bfloat16', 'mixed_float16'):
+        raise ValueError(f"training.precision: auto | float32 | mixed_bfloat16 | mixed_float16 "
+                         f"({config['training']['precision']})")
+    balance = config['training']['class_balance']
+    if balance is not None and not 0.0 <= balance <= 1.0:
+        raise ValueError(f"training.class_balance muss zwischen 0 und 1 liegen: {balance}")
+    if not 0.0 <= config['ensemble']['alpha'] <= 1.0:
+        raise ValueError(f"ensemble.alpha muss zwischen 0 und 1 liegen: {config['ensemble']['alpha']}")
+    if config['cross_validation']['folds'] < 2:
+        raise ValueError(f"cross_validation.folds muss >= 2 sein: {config['cross_validation']['folds']}")
+    return config
+
+
+def save_config(config: dict, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,410 @@
+"""
+Trainer - ein Trainingslauf aus einer Konfiguration
+====================================================
+Daten (Token-Cache) → Modell (Architektur-Registry) → fit (tf.data mit
+Length Bucketing) → Evaluation → TFLite + Metadata.
+
+Die einzelnen Schritte sind Methoden, damit Cross-Validation, Ensembles
+oder Hyperparameter-Suche sie mit eigenen Splits wiederverwenden können.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import callbacks, optimizers
+from sklearn.utils.class_weight import compute_class_weight
+
+from input_pipeline import default_bucket_lengths, fixed_length_model, make_dataset, split_validation
+from model_export import export_saved_model
+
+from .architectures import build_model
+from .checkpoint import TrainingState, load_training_state
+from .config import save_config
+from .data import PreparedData, prepare_data
+from .losses import build_loss
+from .metrics import ClassPrecision, ClassRecall, LabelAccuracy
+from .performance import EpochTimer, steady_epoch_seconds, training_precision
+from .reporting import evaluate_predictions, save_plots
+
+try:
+    import tensorboard  # noqa: F401 - nur für callbacks.TensorBoard
+    HAS_TENSORBOARD = True
+except ImportError:
+    HAS_TENSORBOARD = False
+
+
+class Trainer:
+    """Konfigurationsgetriebener Trainingslauf (siehe config.DEFAULT_CONFIG)"""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.output_dir = config['export']['output_dir']
+        self.data: Optional[PreparedData] = None
+        self.epochs_trained = 0
+
+    # ------------------------------------------------------------------
+    # Daten + Modell
+    # ------------------------------------------------------------------
+
+    def prepare(self) -> PreparedData:
+        if self.data is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.data = prepare_data(self.config, self.output_dir)
+        return self.data
+
+    def build_model(self, loss=None, precision: Optional[str] = None,
+                    jit_compile: Optional[bool] = None) -> keras.Model:
+        """
+        Neues, kompiliertes Modell laut config['model'] + config['loss'] (oder loss)
+
+        precision/jit_compile: Default laut training.performance_mode
+        """
+        data = self.prepare()
+        training = self.config['training']
+        keras.mixed_precision.set_global_policy(precision or training_precision(training))
+        model = build_model(self.config['model'], self.config['data']['vocab_size'],
+                            data.num_classes, name=self.config['name'])
+        model.compile(
+            optimizer=optimizers.Adam(learning_rate=training['learning_rate']),
+            loss=loss or build_loss(self.config['loss'], data.num_classes),
+            metrics=[
+                LabelAccuracy(),
+                ClassPrecision(data.positive_class, name='precision'),
+                ClassRecall(data.positive_class, name='recall'),
+            ],
+            jit_compile=(training['performance_mode'] and training['jit_compile']
+                         if jit_compile is None else jit_compile)
+        )
+        return model
+
+    def float32_model(self, model: keras.Model) -> keras.Model:
+        """Gleiche Gewichte in einem float32-Modell (Export von Mixed-Precision-Modellen)"""
+        if model.dtype_policy.name == 'float32':
+            return model
+        policy = keras.mixed_precision.global_policy()
+        keras.mixed_precision.set_global_policy('float32')
+        try:
+            fp32_model = build_model(self.config['model'], self.config['data']['vocab_size'],
+                                     self.prepare().num_classes, name=model.name)
+        finally:
+            keras.mixed_precision.set_global_policy(policy)
+        fp32_model.set_weights(model.get_weights())
+        return fp32_model
+
+    def validation_split(self) -> Tuple[Tuple, Tuple]:
+        """((X_fit, y_fit), (X_val, y_val)) laut training.validation"""
+        data = self.prepare()
+        if self.config['training']['validation'] == 'test':
+            return (data.X_train, data.y_train), (data.X_test, data.y_test)
+        return split_validation(data.X_train, data.y_train, self.config['training']['validation_split'])
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def make_callbacks(self, output_dir: str, resume: bool = False) -> List[callbacks.Callback]:
+        training = self.config['training']
+        monitor = training['monitor']
+        mode = 'min' if monitor.endswith('loss') else 'max'
+
+        callbacks_list = [
+            callbacks.EarlyStopping(
+                monitor=monitor,
+                patience=training['early_stopping_patience'],
+                restore_best_weights=True,
+                mode=mode,
+                verbose=1
+            ),
+            callbacks.ReduceLROnPlateau(
+                monitor='val_loss',
+                factor=training['reduce_lr_factor'],
+                patience=training['reduce_lr_patience'],
+                min_lr=training['min_lr'],
+                verbose=1
+            ),
+            callbacks.ModelCheckpoint(
+                filepath=os.path.join(output_dir, 'best_model.keras'),
+                monitor=monitor,
+                save_best_only=True,
+                mode=mode,
+                verbose=1
+            ),
+            callbacks.CSVLogger(os.path.join(output_dir, 'training_history.csv'), append=resume),
+        ]
+        if training['tensorboard']:
+            if HAS_TENSORBOARD:
+                callbacks_list.append(callbacks.TensorBoard(log_dir=os.path.join(output_dir, 'logs')))
+            else:
+                print("⚠️  TensorBoard requested but not installed - skipped")
+        return callbacks_list
+
+    def make_datasets(self, train: Tuple[np.ndarray, np.ndarray], validation: Tuple[np.ndarray, np.ndarray],
+                      jit_compile: bool = False,
+                      initial_epoch: int = 0) -> Tuple[tf.data.Dataset, tf.data.Dataset, Optional[Dict]]:
+        """
+        (train_dataset, val_dataset, class_weights) laut config['training']
+
+        initial_epoch: Resume - das Training-Dataset liefert ab der ersten
+        Iteration die Reihenfolge von Epoche initial_epoch + 1 des
+        ununterbrochenen Laufs (statt die von Epoche 1 zu wiederholen)
+        """
+        training = self.config['training']
+        X_fit, y_fit = train
+
+        class_weights = None
+        if training['class_weights']:
+            present = np.unique(y_fit)
+            weights = compute_class_weight('balanced', classes=present, y=y_fit)
+            class_weights = {int(c): float(w) for c, w in zip(present, weights)}
+
+        bucket_lengths = (default_bucket_lengths(self.config['data']['max_length'])
+                          if training['length_bucketing'] else None)
+        # XLA: feste Batch-Shapes im Training (eine Kompilierung pro Bucket)
+        train_dataset = make_dataset(X_fit, y_fit, batch_size=training['batch_size'],
+                                     bucket_lengths=bucket_lengths, seed=training['seed'],
+                                     class_balance=training['class_balance'],
+                                     drop_remainder=jit_compile)
+        # Shuffle/Class-Sampling ziehen pro Iteration (und pro repeat() der Klassen-Ströme)
+        # neue Seeds - die übersprungenen Epochen so iterieren wie fit(): eine Epoche
+        # lesen (nur Daten, kein Modell); bei bekannter Länge legt Keras am Epochenende
+        # zusätzlich schon den nächsten Iterator an
+        spare_iterator = int(train_dataset.cardinality()) > 0
+        for _ in range(initial_epoch):
+            for _ in train_dataset:
+                pass
+            if spare_iterator:
+                iter(train_dataset)
+        val_dataset = make_dataset(validation[0], validation[1], batch_size=training['batch_size'],
+                                   shuffle=False, bucket_lengths=bucket_lengths)
+        return train_dataset, val_dataset, class_weights
+
+    def fit(self, model: keras.Model, train: Tuple[np.ndarray, np.ndarray],
+            validation: Tuple[np.ndarray, np.ndarray], output_dir: Optional[str] = None,
+            extra_callbacks: Optional[List[callbacks.Callback]] = None,
+            verbose: Optional[int] = None, resume: bool = False) -> keras.callbacks.History:
+        """
+        Trainiert model auf train, validiert auf validation
+
+        Args:
+            train, validation: (X, y) - X post-gepaddete Sequenzen
+            output_dir: Ziel für Checkpoint/CSV (Default: export.output_dir)
+            extra_callbacks: Zusätzliche Callbacks (z.B. Pruning)
+            resume: Ab <output_dir>/checkpoint weitertrainieren (falls vorhanden)
+
+        Setzt self.epochs_trained (inkl. Epochen vor dem Resume).
+        """
+        training = self.config['training']
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+        callbacks_list = self.make_callbacks(output_dir, resume=resume)
+        initial_epoch = 0
+        if training['checkpoint_every']:
+            checkpoint_dir = os.path.join(output_dir, 'checkpoint')
+            state = load_training_state(checkpoint_dir) if resume else None
+            if state is not None:
+                initial_epoch = state['epoch']
+                status = 'abgeschlossen' if state['completed'] else f"weiter ab Epoche {initial_epoch + 1}"
+                print(f"♻️  Resume: {checkpoint_dir} ({state['saved']}, {status})")
+                if state['completed']:
+                    initial_epoch = training['epochs']
+            callbacks_list.append(TrainingState(checkpoint_dir, callbacks_list, every=training['checkpoint_every'],
+                                                restore=state is not None))
+
+        train_dataset, val_dataset, class_weights = self.make_datasets(
+            train, validation, jit_compile=bool(model.jit_compile), initial_epoch=initial_epoch)
+
+        history = model.fit(
+            train_dataset,
+            validation_data=val_dataset,
+            epochs=training['epochs'],
+            initial_epoch=initial_epoch,
+            class_weight=class_weights,
+            callbacks=callbacks_list + list(extra_callbacks or []),
+            verbose=training['verbose'] if verbose is None else verbose
+        )
+        self.epochs_trained = history.epoch[-1] + 1 if history.epoch else initial_epoch
+        return history
+
+    def baseline_epoch_seconds(self, train: Tuple[np.ndarray, np.ndarray],
+                               validation: Tuple[np.ndarray, np.ndarray], epochs: int) -> float:
+        """Epochenzeit eines float32-Laufs ohne XLA (Referenz für den Performance-Modus)"""
+        model = self.build_model(precision='float32', jit_compile=False)
+        train_dataset, val_dataset, class_weights = self.make_datasets(train, validation)
+        timer = EpochTimer()
+        model.fit(train_dataset, validation_data=val_dataset, epochs=epochs,
+                  class_weight=class_weights, callbacks=[timer], verbose=0)
+        return steady_epoch_seconds(timer.epoch_seconds)
+
+    # ------------------------------------------------------------------
+    # Evaluation + Export
+    # ------------------------------------------------------------------
+
+    def evaluate(self, model: keras.Model, X: Optional[np.ndarray] = None,
+                 y: Optional[np.ndarray] = None) -> Dict:
+        """Metriken auf dem Test-Set (oder X/y)"""
+        data = self.prepare()
+        X = data.X_test if X is None else X
+        y = data.y_test if y is None else y
+        probs = model.predict(X, batch_size=max(self.config['training']['batch_size'], 128), verbose=0)
+        return evaluate_predictions(y, np.argmax(probs, axis=1), data.classes, data.positive_class)
+
+    def export_tflite(self, model: keras.Model, path: Optional[str] = None,
+                      saved_model: Optional[bool] = None) -> str:
+        """
+        TFLite mit fester Eingabelänge [1, max_length] (App-Format)
+
+        saved_model (Default: export.saved_model): zusätzlich das Float-Modell als
+        <name>_saved_model/ daneben - Quelle für ml_training/quantize_model.py --auto
+        """
+        path = path or os.path.join(self.output_dir, self.config['export']['tflite_name'])
+        max_length = self.config['data']['max_length']
+        fixed = fixed_length_model(self.float32_model(model), max_length)
+        converter = tf.lite.TFLiteConverter.from_keras_model(fixed)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if self.config['export']['float16']:
+            converter.target_spec.supported_types = [tf.float16]
+        tflite_model = converter.convert()
+
+        with open(path, 'wb') as f:
+            f.write(tflite_model)
+        print(f"✅ TFLite Model: {path} ({len(tflite_model) / (1024 * 1024):.2f} MB)")
+
+        if self.config['export']['saved_model'] if saved_model is None else saved_model:
+            print(f"✅ SavedModel: {export_saved_model(fixed, path, max_length)}")
+        return path
+
+    def export_metadata(self, model: keras.Model, metrics: Dict, path: Optional[str] = None) -> str:
+        """Metadata im App-Format (MLGroomingDetector liest word_index)"""
+        data = self.prepare()
+        path = path or os.path.join(self.output_dir, 'metadata.json')
+        metadata = {
+            'vocab_size': self.config['data']['vocab_size'],
+            'max_length': self.config['data']['max_length'],
+            'word_index': data.tokenizer.export_word_index(),
+            'classes': data.classes,
+            'positive_class': data.classes[data.positive_class],
+            'architecture': self.config['model']['architecture'],
+            'parameters': int(model.count_params()),
+            'test_accuracy': metrics['accuracy'],
+            'test_recall': metrics['recall'],
+            'trained_on': datetime.now().strftime('%d.%m.%Y'),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        return path
+
+    # ------------------------------------------------------------------
+    # Kompletter Lauf
+    # ------------------------------------------------------------------
+
+    def run(self, resume: bool = False) -> Dict:
+        """
+        prepare → build → fit → evaluate → export; Returns: Test-Metriken
+
+        resume: Unterbrochenen Lauf ab <output_dir>/checkpoint fortsetzen
+        """
+        start = time.time()
+        keras.utils.set_random_seed(self.config['training']['seed'])
+
+        print("=" * 80)
+        print(f"🚀 KidGuard Training - {self.config['name']}")
+        print("=" * 80)
+        print(f"Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+        data = self.prepare()
+        save_config(self.config, os.path.join(self.output_dir, 'config.json'))
+
+        print("\n🏗️  Building Model...")
+        model = self.build_model()
+        print(f"✅ Architecture: {self.config['model']['architecture']}, "
+              f"Parameters: {model.count_params():,}")
+
+        train, validation = self.validation_split()
+        training = self.config['training']
+        precision = training_precision(training)
+        baseline_seconds = None
+        if training['performance_mode'] and training['baseline_epochs'] and not resume:
+            print(f"\n⏱️  Baseline (float32, ohne XLA, {training['baseline_epochs']} Epochen)...")
+            baseline_seconds = self.baseline_epoch_seconds(train, validation, training['baseline_epochs'])
+            print(f"   {baseline_seconds:.1f}s / Epoche")
+
+        print("\n" + "=" * 80)
+        print("🚀 TRAINING")
+        print("=" * 80)
+        print(f"   Samples: {len(train[0]):,} train / {len(validation[0]):,} val")
+        print(f"   Epochs: {training['epochs']}, Batch Size: {training['batch_size']}, "
+              f"Loss: {self.config['loss']['type']}")
+        if training['performance_mode']:
+            print(f"   Performance-Modus: {precision}, jit_compile={model.jit_compile}")
+        timer = EpochTimer()
+        history = self.fit(model, train, validation, extra_callbacks=[timer], resume=resume)
+
+        print("\n" + "=" * 80)
+        print("📊 EVALUATION ON TEST SET")
+        print("=" * 80)
+        metrics = self.evaluate(model)
+        print(metrics['report'])
+        with open(os.path.join(self.output_dir, 'classification_report.txt'), 'w') as f:
+            f.write(f"Test Accuracy: {metrics['accuracy']:.4f}\n\n")
+            f.write(metrics['report'])
+        if self.config['export']['plots']:
+            save_plots(history.history, metrics['confusion_matrix'], data.classes, self.output_dir)
+
+        print("\n📦 Exporting...")
+        self.export_tflite(model)
+        self.export_metadata(model, metrics)
+
+        summary = {key: metrics[key] for key in ('accuracy', 'precision', 'recall', 'f1', 'per_class_recall')}
+        summary.update({
+            'epochs_trained': self.epochs_trained,
+            'parameters': int(model.count_params()),
+            'training_seconds': round(time.time() - start, 1),
+            'dtype_policy': precision,
+            'jit_compile': bool(model.jit_compile),
+            'epoch_seconds': round(steady_epoch_seconds(timer.epoch_seconds), 2),
+        })
+        if baseline_seconds is not None:
+            summary['baseline_epoch_seconds'] = round(baseline_seconds, 2)
+            summary['speedup'] = round(baseline_seconds / summary['epoch_seconds'], 2)
+        with open(os.path.join(self.output_dir, 'metrics.json'), 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        self.print_summary(summary)
+        return summary
+
+    def print_summary(self, summary: Dict):
+        positive = self.data.classes[self.data.positive_class]
+        print("\n" + "=" * 80)
+        print("🎉 TRAINING COMPLETE!")
+        print("=" * 80)
+        print(f"\n📊 Final Metrics (Test):")
+        print(f"   {'Accuracy:':24s} {summary['accuracy']:.4f} ({summary['accuracy'] * 100:.2f}%)")
+        for key, title in (('precision', 'Precision'), ('recall', 'Recall'), ('f1', 'F1-Score')):
+            print(f"   {positive.capitalize() + ' ' + title + ':':24s} {summary[key]:.4f} ({summary[key] * 100:.2f}%)")
+
+        targets = self.config['targets']
+        missed = [name for name in ('accuracy', 'recall')
+                  if targets[name] is not None and summary[name] < targets[name]]
+        if any(targets[name] is not None for name in ('accuracy', 'recall')):
+            if missed:
+                print(f"\n⚠️  Target not reached: " +
+                      ", ".join(f"{name} {summary[name] * 100:.2f}% < {targets[name] * 100:.0f}%" for name in missed))
+            else:
+                print(f"\n🎯 TARGET ACHIEVED!")
+
+        if 'speedup' in summary:
+            print(f"\n⚡ Performance-Modus ({summary['dtype_policy']}, jit_compile={summary['jit_compile']}): "
+                  f"{summary['epoch_seconds']:.1f}s / Epoche vs. {summary['baseline_epoch_seconds']:.1f}s "
+                  f"float32 → {summary['speedup']:.2f}x")
+
+        print(f"\n📁 Outputs: {self.output_dir}")
+        print(f"⏰ End: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} "
+              f"({summary['training_seconds'] / 60:.1f} min)")
+        print("=" * 80)
@@ -0,0 +1,133 @@
+"""
+Cross-Validation - k Folds parallel auf einem Prozess-Pool
+===========================================================
+Stratified k-Fold über das Train-Set (das Test-Set bleibt unberührt).
+Jeder Fold läuft in einem eigenen Prozess mit begrenzten Intra-Op-Threads,
+damit sich k Folds die CPU-Kerne teilen statt sich gegenseitig zu
+verdrängen - bei genug Kernen dauert k-Fold kaum länger als ein fit.
+
+Usage:
+    python3 training/train.py --config training/configs/comprehensive.json --cv
+    python3 training/train_comprehensive.py --cv --set cross_validation.workers=5
+"""
+
+import copy
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+
+from .core import Trainer
+from .data import PreparedData
+from .parallel import load_shared_arrays, map_parallel, share_arrays, worker_plan
+
+CV_METRICS = ('accuracy', 'precision', 'recall', 'f1')
+
+
+def _run_fold(task: Tuple) -> Dict:
+    """Trainiert + evaluiert einen Fold; Returns: Fold-Metriken"""
+    config, fold, train_idx, val_idx, arrays_dir, classes, positive_class = task
+    from tensorflow import keras
+
+    arrays = load_shared_arrays(arrays_dir, 'X', 'y')
+    X, y = arrays['X'], arrays['y']
+    X_fit, y_fit = np.asarray(X[train_idx]), np.asarray(y[train_idx])
+    X_val, y_val = np.asarray(X[val_idx]), np.asarray(y[val_idx])
+
+    fold_dir = os.path.join(config['export']['output_dir'], 'cv', f'fold_{fold}')
+    trainer = Trainer(config)
+    trainer.data = PreparedData(X_fit, y_fit, X_val, y_val, classes, None, positive_class)
+
+    start = time.time()
+    keras.utils.set_random_seed(config['training']['seed'] + fold)
+    model = trainer.build_model()
+    history = trainer.fit(model, (X_fit, y_fit), (X_val, y_val), output_dir=fold_dir, verbose=0)
+    metrics = trainer.evaluate(model, X_val, y_val)
+
+    result = {key: metrics[key] for key in CV_METRICS}
+    result.update({
+        'fold': fold,
+        'per_class_recall': metrics['per_class_recall'],
+        'epochs_trained': len(history.history['loss']),
+        'training_seconds': round(time.time() - start, 1),
+    })
+    return result
+
+
+def aggregate_folds(results: List[Dict]) -> Dict:
+    """Mittelwert + Standardabweichung je Metrik über alle Folds"""
+    summary = {}
+    for key in CV_METRICS + ('epochs_trained',):
+        values = np.array([result[key] for result in results], dtype=np.float64)
+        summary[key] = {'mean': float(values.mean()), 'std': float(values.std())}
+    return summary
+
+
+def run_cross_validation(config: dict, folds: Optional[int] = None, workers: Optional[int] = None,
+                         threads_per_worker: Optional[int] = None) -> Dict:
+    """
+    Stratified k-Fold CV, Folds parallel in Worker-Prozessen
+
+    Args:
+        config: Vollständige Konfiguration (load_config)
+        folds, workers, threads_per_worker: Überschreiben config['cross_validation']
+
+    Returns: {'folds': [...], 'summary': {metric: {'mean', 'std'}}, ...}
+    """
+    cv_config = config['cross_validation']
+    folds = folds or cv_config['folds']
+    workers, threads = worker_plan(folds, workers or cv_config['workers'],
+                                   threads_per_worker or cv_config['threads_per_worker'])
+
+    print("=" * 80)
+    print(f"🔁 KidGuard Cross-Validation - {config['name']}")
+    print("=" * 80)
+
+    trainer = Trainer(config)
+    data = trainer.prepare()
+    cv_dir = share_arrays(os.path.join(trainer.output_dir, 'cv'), X=data.X_train, y=data.y_train)
+
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=config['training']['seed'])
+    tasks = [
+        (copy.deepcopy(config), fold, train_idx, val_idx, cv_dir, data.classes, data.positive_class)
+        for fold, (train_idx, val_idx) in enumerate(splitter.split(data.X_train, data.y_train), start=1)
+    ]
+
+    print(f"\n🚀 {folds} Folds auf {workers} Worker(n) × {threads} Thread(s) "
+          f"({len(data.X_train):,} Samples, Epochs: {config['training']['epochs']})")
+    start = time.time()
+    results = []
+    for result in map_parallel(_run_fold, tasks, workers, threads):
+        results.append(result)
+        print(f"   ✅ Fold {result['fold']}: accuracy {result['accuracy']:.4f}, "
+              f"recall {result['recall']:.4f} ({result['training_seconds']:.0f}s)")
+    wall_seconds = time.time() - start
+
+    summary = aggregate_folds(results)
+    fold_seconds = sum(result['training_seconds'] for result in results)
+    report = {
+        'folds': results,
+        'summary': summary,
+        'workers': workers,
+        'threads_per_worker': threads,
+        'wall_seconds': round(wall_seconds, 1),
+        'fold_seconds_total': round(fold_seconds, 1),
+    }
+    with open(os.path.join(cv_dir, 'cv_results.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    positive = data.classes[data.positive_class].capitalize()
+    print("\n" + "=" * 80)
+    print(f"📊 CROSS-VALIDATION ({folds} Folds)")
+    print("=" * 80)
+    for key, title in (('accuracy', 'Accuracy'), ('precision', f'{positive} Precision'),
+                       ('recall', f'{positive} Recall'), ('f1', f'{positive} F1-Score')):
+        print(f"   {title + ':':24s} {summary[key]['mean']:.4f} ± {summary[key]['std']:.4f}")
+    print(f"   {'Epochs:':24s} {summary['epochs_trained']['mean']:.1f} ± {summary['epochs_trained']['std']:.1f}")
+    print(f"\n⏱️  Wall: {wall_seconds / 60:.1f} min (Summe Folds: {fold_seconds / 60:.1f} min)")
+    print(f"📁 Results: {os.path.join(cv_dir, 'cv_results.json')}")
+    print("=" * 80)
+    return report
@@ -0,0 +1,114 @@
+"""
+Daten - Laden, Label-Encoding, Tokenisierung
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from dataset_cache import load_dataset
+from token_cache import tokenize_cached
+
+
+class PreparedData:
+    """Tokenisierte Train/Test-Splits eines Laufs"""
+
+    def __init__(self, X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray, y_test: np.ndarray,
+                 classes: List[str], tokenizer, positive_class: int):
+        self.X_train = X_train
+        self.y_train = y_train
+        self.X_test = X_test
+        self.y_test = y_test
+        self.classes = classes
+        self.tokenizer = tokenizer
+        self.positive_class = positive_class
+
+    @property
+    def num_classes(self) -> int:
+        return len(self.classes)
+
+
+def print_distribution(labels, title: str = 'Label Distribution'):
+    print(f"\n📊 {title}:")
+    counts = Counter(labels)
+    for label, count in counts.most_common():
+        print(f"   {str(label):20s}: {count:7,} ({count / len(labels) * 100:5.2f}%)")
+
+
+def load_split(paths: Union[str, Sequence[str]]) -> Dict[str, list]:
+    """Lädt ein oder mehrere Datasets (data.train/data.test) und hängt sie aneinander"""
+    if isinstance(paths, str):
+        return load_dataset(paths)
+    merged = {'text': [], 'label': []}
+    for path in paths:
+        data = load_dataset(path)
+        print(f"   {os.path.basename(path)}: {len(data['text']):,} samples")
+        for name in merged:
+            merged[name].extend(data[name])
+    return merged
+
+
+def prepare_data(config: dict, output_dir: Optional[str] = None) -> PreparedData:
+    """
+    Lädt config['data'], encodet Labels, tokenisiert (Token-Cache)
+
+    Schreibt label_mapping.json + tokenizer.json nach output_dir (falls gesetzt).
+    """
+    data_config = config['data']
+
+    print("📂 Loading Data...")
+    # Arrow-Cache (mmap) wenn vorhanden, sonst JSON
+    train_data = load_split(data_config['train'])
+    X_train, y_train = train_data['text'], train_data['label']
+    if data_config['test']:
+        test_data = load_split(data_config['test'])
+        X_test, y_test = test_data['text'], test_data['label']
+    else:
+        # Ein Dataset ohne eigenes Test-Set (ml/scripts): stratifiziert abspalten
+        X_train, X_test, y_train, y_test = train_test_split(
+            list(X_train), list(y_train), test_size=data_config['test_split'],
+            random_state=config['training']['seed'], stratify=y_train
+        )
+
+    print(f"✅ Training: {len(X_train):,} samples")
+    print(f"✅ Test: {len(X_test):,} samples")
+    print_distribution(y_train)
+
+    # Label Encoding
+    label_encoder = LabelEncoder()
+    label_encoder.fit(list(y_train) + list(y_test))
+    classes = [str(label) for label in label_encoder.classes_]
+    y_train_enc = label_encoder.transform(y_train).astype(np.int64)
+    y_test_enc = label_encoder.transform(y_test).astype(np.int64)
+
+    positive_label = data_config['positive_label']
+    positive_class = classes.index(positive_label) if positive_label in classes else len(classes) - 1
+    print(f"\n✅ Classes: {len(classes)} - {classes} (Recall auf '{classes[positive_class]}')")
+
+    # Tokenization (memmap-Cache - Wiederholungsläufe überspringen die Tokenisierung)
+    print("\n📝 Tokenization...")
+    tokenizer, X_train_pad, X_test_pad = tokenize_cached(
+        X_train, X_test,
+        max_length=data_config['max_length'],
+        padding='post',
+        truncating='post',
+        fit_on_test=data_config['fit_tokenizer_on_test'],
+        num_words=data_config['vocab_size'],
+        oov_token='<OOV>'
+    )
+    print(f"✅ Vocabulary: {len(tokenizer.word_index):,} words")
+    print(f"✅ Train shape: {X_train_pad.shape}")
+    print(f"✅ Test shape: {X_test_pad.shape}")
+
+    if output_dir:
+        with open(os.path.join(output_dir, 'label_mapping.json'), 'w') as f:
+            json.dump({i: label for i, label in enumerate(classes)}, f, indent=2)
+        with open(os.path.join(output_dir, 'tokenizer.json'), 'w') as f:
+            f.write(tokenizer.to_json())
+
+    return PreparedData(X_train_pad, y_train_enc, X_test_pad, y_test_enc, classes, tokenizer, positive_class)
@@ -0,0 +1,225 @@
+"""
+Ensemble + Distillation - mehrere Teacher, ein TFLite-Student
+==============================================================
+1. ensemble.size Member (gleiche Architektur, verschiedene Seeds) trainieren
+   parallel auf einem Prozess-Pool (siehe parallel.py).
+2. Die gemittelten Softmax-Ausgaben der Member sind die Soft-Targets.
+3. Ein kleines Student-Modell (ensemble.student) lernt Labels + Soft-Targets
+   (DistillationLoss) und wird als einziges TFLite exportiert.
+
+Auf dem Gerät läuft damit ein Interpreter pro Nachricht statt size vielen,
+bei (annähernd) Ensemble-Recall.
+
+Usage:
+    python3 training/train.py --config training/configs/comprehensive.json --ensemble
+    python3 training/train_comprehensive.py --ensemble --set ensemble.size=5
+"""
+
+import copy
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from tensorflow import keras
+from sklearn.utils.class_weight import compute_class_weight
+
+from input_pipeline import default_bucket_lengths, make_dataset
+
+from .core import Trainer
+from .data import PreparedData
+from .losses import DistillationLoss
+from .parallel import load_shared_arrays, map_parallel, share_arrays, worker_plan
+from .reporting import evaluate_predictions
+
+ENSEMBLE_METRICS = ('accuracy', 'precision', 'recall', 'f1')
+ARRAY_NAMES = ('X_train', 'y_train', 'X_test', 'y_test')
+
+
+def _train_member(task: Tuple) -> Dict:
+    """Trainiert Member index, speichert member.keras; Returns: Test-Metriken + Pfad"""
+    config, index, arrays_dir, classes, positive_class = task
+    arrays = load_shared_arrays(arrays_dir, *ARRAY_NAMES)
+    X_train, y_train, X_test, y_test = (np.asarray(arrays[name]) for name in ARRAY_NAMES)
+
+    member_dir = os.path.join(config['export']['output_dir'], 'ensemble', f'member_{index}')
+    trainer = Trainer(config)
+    trainer.data = PreparedData(X_train, y_train, X_test, y_test, classes, None, positive_class)
+
+    start = time.time()
+    keras.utils.set_random_seed(config['training']['seed'] + index)
+    model = trainer.build_model()
+    train, validation = trainer.validation_split()
+    history = trainer.fit(model, train, validation, output_dir=member_dir, verbose=0)
+    metrics = trainer.evaluate(model)
+
+    path = os.path.join(member_dir, 'member.keras')
+    model.save(path)
+    result = {key: metrics[key] for key in ENSEMBLE_METRICS}
+    result.update({
+        'member': index,
+        'path': path,
+        'parameters': int(model.count_params()),
+        'epochs_trained': len(history.history['loss']),
+        'training_seconds': round(time.time() - start, 1),
+    })
+    return result
+
+
+def ensemble_predict(members: List[keras.Model], X: np.ndarray, batch_size: int = 256) -> np.ndarray:
+    """Gemittelte Softmax-Ausgabe aller Member"""
+    return np.mean([member.predict(X, batch_size=batch_size, verbose=0) for member in members], axis=0)
+
+
+def distillation_targets(y: np.ndarray, teacher_probs: np.ndarray) -> np.ndarray:
+    """[label, teacher_probs...] pro Sample (Format von DistillationLoss)"""
+    return np.concatenate([np.asarray(y, dtype=np.float32)[:, None],
+                           teacher_probs.astype(np.float32)], axis=1)
+
+
+def train_members(config: dict, data: PreparedData, workers: Optional[int] = None,
+                  threads_per_worker: Optional[int] = None) -> List[Dict]:
+    """ensemble.size Member parallel trainieren; Returns: Member-Ergebnisse"""
+    ensemble_config = config['ensemble']
+    size = ensemble_config['size']
+    workers, threads = worker_plan(size, workers or ensemble_config['workers'],
+                                   threads_per_worker or ensemble_config['threads_per_worker'])
+
+    arrays_dir = share_arrays(os.path.join(config['export']['output_dir'], 'ensemble'),
+                              **{name: getattr(data, name) for name in ARRAY_NAMES})
+
+    tasks = [(copy.deepcopy(config), index, arrays_dir, data.classes, data.positive_class)
+             for index in range(1, size + 1)]
+
+    print(f"\n🚀 {size} Member auf {workers} Worker(n) × {threads} Thread(s) "
+          f"(Architecture: {config['model']['architecture']}, Epochs: {config['training']['epochs']})")
+    results = []
+    for result in map_parallel(_train_member, tasks, workers, threads):
+        results.append(result)
+        print(f"   ✅ Member {result['member']}: accuracy {result['accuracy']:.4f}, "
+              f"recall {result['recall']:.4f} ({result['training_seconds']:.0f}s)")
+    return results
+
+
+def distill_student(trainer: Trainer, teacher: Tuple[np.ndarray, np.ndarray],
+                    train: Tuple[np.ndarray, np.ndarray],
+                    validation: Tuple[np.ndarray, np.ndarray]) -> Tuple[keras.Model, keras.callbacks.History]:
+    """
+    Trainiert trainer.config['model'] (Student) auf Labels + Teacher-Verteilung
+
+    Args:
+        trainer: Trainer mit Student-Konfiguration und gesetzten Daten
+        teacher: Teacher-Wahrscheinlichkeiten für (train, validation)
+        train, validation: (X, y)
+    """
+    config = trainer.config
+    ensemble_config = config['ensemble']
+    training = config['training']
+    data = trainer.prepare()
+    (X_fit, y_fit), (X_val, y_val) = train, validation
+
+    class_weights = None
+    if training['class_weights']:
+        present = np.unique(y_fit)
+        weights = compute_class_weight('balanced', classes=present, y=y_fit)
+        class_weights = [1.0] * data.num_classes
+        for class_id, weight in zip(present, weights):
+            class_weights[int(class_id)] = float(weight)
+
+    model = trainer.build_model(loss=DistillationLoss(
+        alpha=ensemble_config['alpha'],
+        temperature=ensemble_config['temperature'],
+        class_weights=class_weights
+    ))
+
+    bucket_lengths = (default_bucket_lengths(config['data']['max_length'])
+                      if training['length_bucketing'] else None)
+    train_dataset = make_dataset(X_fit, distillation_targets(y_fit, teacher[0]), classes=y_fit,
+                                 batch_size=training['batch_size'], bucket_lengths=bucket_lengths,
+                                 seed=training['seed'], class_balance=training['class_balance'],
+                                 drop_remainder=bool(model.jit_compile))
+    val_dataset = make_dataset(X_val, distillation_targets(y_val, teacher[1]), classes=y_val,
+                               batch_size=training['batch_size'], shuffle=False,
+                               bucket_lengths=bucket_lengths)
+
+    history = model.fit(
+        train_dataset,
+        validation_data=val_dataset,
+        epochs=ensemble_config['student_epochs'] or training['epochs'],
+        callbacks=trainer.make_callbacks(trainer.output_dir),
+        verbose=training['verbose']
+    )
+    return model, history
+
+
+def run_ensemble(config: dict) -> Dict:
+    """
+    Member parallel trainieren → Ensemble evaluieren → Student destillieren → TFLite
+
+    Returns: {'members': [...], 'ensemble': {...}, 'student': {...}}
+    """
+    start = time.time()
+    print("=" * 80)
+    print(f"🧩 KidGuard Ensemble + Distillation - {config['name']}")
+    print("=" * 80)
+    print(f"Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    # Student-Lauf: gleiche Daten/Training, Modell = ensemble.student
+    student_config = copy.deepcopy(config)
+    student_config['model'] = copy.deepcopy(config['ensemble']['student'])
+    trainer = Trainer(student_config)
+    data = trainer.prepare()
+
+    member_results = train_members(config, data)
+    members = [keras.models.load_model(result['path']) for result in member_results]
+
+    print("\n🎓 Teacher-Verteilung (Ensemble-Mittel)...")
+    train, validation = trainer.validation_split()
+    teacher = (ensemble_predict(members, train[0]), ensemble_predict(members, validation[0]))
+    ensemble_metrics = evaluate_predictions(data.y_test, np.argmax(ensemble_predict(members, data.X_test), axis=1),
+                                            data.classes, data.positive_class)
+    teacher_parameters = sum(int(member.count_params()) for member in members)
+
+    print("\n" + "=" * 80)
+    print(f"🎓 DISTILLATION → Student ({student_config['model']['architecture']})")
+    print("=" * 80)
+    keras.utils.set_random_seed(config['training']['seed'])
+    student, history = distill_student(trainer, teacher, train, validation)
+    student_metrics = trainer.evaluate(student)
+    print(student_metrics['report'])
+
+    print("\n📦 Exporting Student...")
+    trainer.export_tflite(student)
+    trainer.export_metadata(student, student_metrics)
+    student.save(os.path.join(trainer.output_dir, 'student.keras'))
+
+    report = {
+        'members': member_results,
+        'ensemble': {key: ensemble_metrics[key] for key in ENSEMBLE_METRICS},
+        'student': {key: student_metrics[key] for key in ENSEMBLE_METRICS},
+        'teacher_parameters': teacher_parameters,
+        'student_parameters': int(student.count_params()),
+        'student_epochs_trained': len(history.history['loss']),
+        'training_seconds': round(time.time() - start, 1),
+    }
+    report['ensemble']['per_class_recall'] = ensemble_metrics['per_class_recall']
+    report['student']['per_class_recall'] = student_metrics['per_class_recall']
+    with open(os.path.join(trainer.output_dir, 'ensemble_results.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    positive = data.classes[data.positive_class].capitalize()
+    print("\n" + "=" * 80)
+    print("🎉 ENSEMBLE + DISTILLATION COMPLETE!")
+    print("=" * 80)
+    print(f"\n📊 Test-Metriken:         {'Ensemble':>12s} {'Student':>12s}")
+    for key, title in (('accuracy', 'Accuracy'), ('precision', f'{positive} Precision'),
+                       ('recall', f'{positive} Recall'), ('f1', f'{positive} F1-Score')):
+        print(f"   {title + ':':24s} {report['ensemble'][key]:12.4f} {report['student'][key]:12.4f}")
+    print(f"   {'Parameters:':24s} {teacher_parameters:12,} {report['student_parameters']:12,}")
+    print(f"\n📁 Outputs: {trainer.output_dir}")
+    print(f"⏰ End: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} "
+          f"({report['training_seconds'] / 60:.1f} min)")
+    print("=" * 80)
+    return report
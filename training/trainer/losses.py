@@ -0,0 +1,99 @@
+"""
+Losses - Crossentropy, Focal Loss, Distillation
+"""
+
+import tensorflow as tf
+from tensorflow import keras
+
+
+@keras.utils.register_keras_serializable(package='kidguard')
+class FocalLoss(keras.losses.Loss):
+    """
+    Focal Loss für Class Imbalance
+    Paper: https://arxiv.org/abs/1708.02002
+
+    Fokussiert Training auf schwierige Samples
+    Reduziert Gewicht von einfachen Samples
+    """
+
+    def __init__(self, alpha=0.25, gamma=2.0, num_classes=6, name='focal_loss', **kwargs):
+        super().__init__(name=name, **kwargs)
+        self.alpha = alpha
+        self.gamma = gamma
+        self.num_classes = num_classes
+
+    def call(self, y_true, y_pred):
+        # One-hot encode if needed
+        y_true = tf.cast(tf.reshape(y_true, [-1]), tf.int32)
+        y_true = tf.one_hot(y_true, depth=self.num_classes)
+
+        # Clip predictions
+        y_pred = tf.clip_by_value(tf.cast(y_pred, tf.float32), 1e-7, 1 - 1e-7)
+
+        # Calculate cross entropy
+        cross_entropy = -y_true * tf.math.log(y_pred)
+
+        # Calculate focal weight
+        weight = self.alpha * tf.pow(1 - y_pred, self.gamma)
+
+        # Pro Sample (Reduktion + class_weight übernimmt Keras)
+        return tf.reduce_sum(weight * cross_entropy, axis=1)
+
+    def get_config(self):
+        config = super().get_config()
+        config.update({'alpha': self.alpha, 'gamma': self.gamma, 'num_classes': self.num_classes})
+        return config
+
+
+@keras.utils.register_keras_serializable(package='kidguard')
+class DistillationLoss(keras.losses.Loss):
+    """
+    Knowledge Distillation (Hinton et al. 2015, https://arxiv.org/abs/1503.02531)
+
+    y_true = [label, teacher_probs...] (Spalte 0 = hartes Label):
+        alpha * CE(label, p) + (1 - alpha) * T² * KL(teacher_T || student_T)
+
+    Die Temperatur T glättet Teacher und Student über log(p) / T (das Modell
+    gibt Softmax-Wahrscheinlichkeiten aus, keine Logits). class_weights
+    gewichten den Label-Term wie class_weight in fit().
+    """
+
+    def __init__(self, alpha=0.3, temperature=2.0, class_weights=None, name='distillation_loss', **kwargs):
+        super().__init__(name=name, **kwargs)
+        self.alpha = alpha
+        self.temperature = temperature
+        self.class_weights = class_weights
+
+    def call(self, y_true, y_pred):
+        y_true = tf.cast(y_true, tf.float32)
+        labels = tf.cast(y_true[:, 0], tf.int32)
+        teacher = y_true[:, 1:]
+        y_pred = tf.clip_by_value(tf.cast(y_pred, tf.float32), 1e-7, 1.0)
+
+        hard = -tf.math.log(tf.gather(y_pred, labels, axis=1, batch_dims=1))
+        if self.class_weights is not None:
+            hard = hard * tf.gather(tf.constant(self.class_weights, tf.float32), labels)
+
+        teacher_t = tf.nn.softmax(tf.math.log(tf.clip_by_value(teacher, 1e-7, 1.0)) / self.temperature)
+        student_log_t = tf.nn.log_softmax(tf.math.log(y_pred) / self.temperature)
+        kl = tf.reduce_sum(teacher_t * (tf.math.log(tf.clip_by_value(teacher_t, 1e-7, 1.0)) - student_log_t), axis=1)
+        soft = kl * self.temperature ** 2
+
+        return self.alpha * hard + (1.0 - self.alpha) * soft
+
+    def get_config(self):
+        config = super().get_config()
+        config.update({'alpha': self.alpha, 'temperature': self.temperature,
+                       'class_weights': self.class_weights})
+        return config
+
+
+def build_loss(loss_config: dict, num_classes: int):
+    """Loss aus config['loss']"""
+    loss_type = loss_config['type']
+    if loss_type == 'focal':
+        return FocalLoss(alpha=loss_config['focal_alpha'], gamma=loss_config['focal_gamma'],
+                         num_classes=num_classes)
+    if loss_type == 'crossentropy':
+        return 'sparse_categorical_crossentropy'
+    raise ValueError(f"Unbekannter Loss: {loss_type} (crossentropy | focal)")
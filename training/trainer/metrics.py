@@ -0,0 +1,91 @@
+"""
+Metriken für Softmax-Ausgaben mit Integer-Labels
+
+keras.metrics.Precision/Recall erwarten Wahrscheinlichkeiten mit der
+gleichen Shape wie y_true - bei sparse Labels + Softmax messen sie nicht
+den Recall einer Klasse. ClassRecall/ClassPrecision vergleichen
+argmax(y_pred) mit dem Label für eine Zielklasse (z.B. grooming).
+
+Das Label steht in Spalte 0 von y_true - das deckt [n]- und [n, 1]-Labels
+ebenso ab wie Distillation-Targets [label, teacher_probs...].
+"""
+
+import tensorflow as tf
+from tensorflow import keras
+
+
+def _labels(y_true):
+    """Integer-Label pro Sample (Spalte 0 bei 2D-Targets)"""
+    if len(y_true.shape) > 1:
+        y_true = y_true[:, 0]
+    return tf.cast(y_true, tf.int64)
+
+
+class _ClassMetric(keras.metrics.Metric):
+    def __init__(self, class_id: int, name: str, **kwargs):
+        super().__init__(name=name, **kwargs)
+        self.class_id = class_id
+        self.true_positives = self.add_weight(name='tp', initializer='zeros')
+        self.reference = self.add_weight(name='reference', initializer='zeros')
+
+    def _counts(self, y_true, y_pred):
+        y_pred = tf.argmax(y_pred, axis=-1)
+        return tf.equal(_labels(y_true), self.class_id), tf.equal(y_pred, self.class_id)
+
+    def _update(self, hits, reference, sample_weight):
+        hits = tf.cast(hits, self.dtype)
+        reference = tf.cast(reference, self.dtype)
+        if sample_weight is not None:
+            sample_weight = tf.cast(tf.reshape(sample_weight, [-1]), self.dtype)
+            hits, reference = hits * sample_weight, reference * sample_weight
+        self.true_positives.assign_add(tf.reduce_sum(hits))
+        self.reference.assign_add(tf.reduce_sum(reference))
+
+    def result(self):
+        return tf.math.divide_no_nan(self.true_positives, self.reference)
+
+    def reset_state(self):
+        self.true_positives.assign(0.0)
+        self.reference.assign(0.0)
+
+    def get_config(self):
+        return {**super().get_config(), 'class_id': self.class_id}
+
+
+@keras.utils.register_keras_serializable(package='kidguard')
+class ClassRecall(_ClassMetric):
+    """Recall einer Klasse: TP / (TP + FN)"""
+
+    def __init__(self, class_id: int, name: str = 'recall', **kwargs):
+        super().__init__(class_id, name=name, **kwargs)
+
+    def update_state(self, y_true, y_pred, sample_weight=None):
+        actual, predicted = self._counts(y_true, y_pred)
+        self._update(actual & predicted, actual, sample_weight)
+
+
+@keras.utils.register_keras_serializable(package='kidguard')
+class ClassPrecision(_ClassMetric):
+    """Precision einer Klasse: TP / (TP + FP)"""
+
+    def __init__(self, class_id: int, name: str = 'precision', **kwargs):
+        super().__init__(class_id, name=name, **kwargs)
+
+    def update_state(self, y_true, y_pred, sample_weight=None):
+        actual, predicted = self._counts(y_true, y_pred)
+        self._update(actual & predicted, predicted, sample_weight)
+
+
+@keras.utils.register_keras_serializable(package='kidguard')
+class LabelAccuracy(keras.metrics.MeanMetricWrapper):
+    """Accuracy argmax(y_pred) == Label (auch für Distillation-Targets)"""
+
+    def __init__(self, name: str = 'accuracy', **kwargs):
+        super().__init__(fn=_label_accuracy, name=name, **kwargs)
+
+    def get_config(self):
+        return {'name': self.name, 'dtype': self.dtype}
+
+
+def _label_accuracy(y_true, y_pred):
+    return tf.cast(tf.equal(_labels(y_true), tf.argmax(y_pred, axis=-1)), tf.float32)
@@ -0,0 +1,64 @@
+"""
+Parallele Trainingsläufe - Prozess-Pool mit begrenzten TensorFlow-Threads
+==========================================================================
+Für unabhängige Läufe (CV-Folds, Ensemble-Member, Such-Trials): jeder
+Worker bekommt cpu_count // workers Intra-Op-Threads, damit sich die Läufe
+die Kerne teilen statt sie k-fach zu überbuchen.
+
+Die tokenisierten Arrays werden einmal als .npy geschrieben (share_arrays)
+und von den Workern per mmap gelesen (kein Pickling großer Arrays).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _init_worker(threads: int):
+    """Thread-Limits setzen, bevor TensorFlow im Worker Ops ausführt"""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(min(2, threads))
+
+
+def share_arrays(directory: str, **arrays: np.ndarray) -> str:
+    """Schreibt arrays als <name>.npy nach directory; Returns: directory"""
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f'{name}.npy'), np.asarray(array))
+    return directory
+
+
+def load_shared_arrays(directory: str, *names: str) -> Dict[str, np.ndarray]:
+    """Liest die von share_arrays geschriebenen Arrays (mmap, read-only)"""
+    return {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in names}
+
+
+def worker_plan(tasks: int, workers: Optional[int] = None,
+                threads_per_worker: Optional[int] = None) -> Tuple[int, int]:
+    """(workers, threads_per_worker) - Default: min(tasks, CPU-Kerne) × Kerne // workers"""
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(tasks, workers or cpu_count))
+    threads = threads_per_worker or max(1, cpu_count // workers)
+    return workers, threads
+
+
+def map_parallel(function: Callable, tasks: Sequence, workers: int, threads: int) -> Iterator:
+    """
+    Wie map(function, tasks), aber in workers Prozessen (Ergebnisse in Task-Reihenfolge)
+
+    workers == 1 läuft im aktuellen Prozess (ohne Thread-Limit).
+    function und tasks müssen picklebar sein.
+    """
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+
+    # spawn: TensorFlow ist im Elternprozess bereits initialisiert (fork wäre unsicher)
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(threads,)) as executor:
+        yield from executor.map(function, tasks)
@@ -0,0 +1,85 @@
+"""
+Performance-Modus - XLA + Mixed Precision
+==========================================
+training.performance_mode schaltet Mixed Precision und jit_compile (XLA,
+training.jit_compile) ein. precision 'auto' wählt:
+- GPU:                           mixed_float16 (Loss Scaling macht Keras)
+- CPU mit AVX512_BF16 / AMX_BF16: mixed_bfloat16
+- sonst:                         float32 (bf16 ohne Hardware-Support ist langsamer)
+
+Gewichte bleiben float32; die Softmax-Ausgabe (dtype='float32' im
+Dense-Head) und die Losses (FocalLoss, DistillationLoss casten y_pred)
+rechnen in float32. Der TFLite-Export baut das Modell in float32 nach.
+
+XLA kompiliert pro Input-Shape: mit Length Bucketing einmal pro Bucket
+(Trainings-Batches ohne Rest, drop_remainder). Die Epochenzeit ist der
+Median ohne die erste Epoche (Tracing + Kompilierung); bei kurzen Läufen
+oder LSTM-lastigen Modellen auf wenigen CPU-Kernen kann XLA trotzdem
+langsamer sein - deshalb der Bericht.
+
+Für den Speedup-Bericht misst ein kurzer float32-Referenzlauf ohne XLA
+(baseline_epochs) die Epochenzeit auf denselben Daten.
+"""
+
+import time
+from typing import List
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+PRECISIONS = ('auto', 'float32', 'mixed_bfloat16', 'mixed_float16')
+BF16_CPU_FLAGS = ('avx512_bf16', 'amx_bf16')
+
+
+def cpu_supports_bfloat16() -> bool:
+    """bfloat16-Befehle auf der CPU (Linux: /proc/cpuinfo)"""
+    try:
+        with open('/proc/cpuinfo') as f:
+            flags = set(f.read().split())
+    except OSError:
+        return False
+    return any(flag in flags for flag in BF16_CPU_FLAGS)
+
+
+def resolve_precision(precision: str) -> str:
+    """'auto' → mixed_float16 | mixed_bfloat16 | float32 je nach Hardware"""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unbekannte precision: {precision} ({' | '.join(PRECISIONS)})")
+    if precision != 'auto':
+        return precision
+    if tf.config.list_physical_devices('GPU'):
+        return 'mixed_float16'
+    if cpu_supports_bfloat16():
+        return 'mixed_bfloat16'
+    return 'float32'
+
+
+def training_precision(training_config: dict) -> str:
+    """Policy für das Training laut training.performance_mode / precision"""
+    if not training_config['performance_mode']:
+        return 'float32'
+    return resolve_precision(training_config['precision'])
+
+
+class EpochTimer(keras.callbacks.Callback):
+    """Misst die Wall-Zeit pro Epoche (inkl. Validierung)"""
+
+    def __init__(self):
+        super().__init__()
+        self.epoch_seconds: List[float] = []
+        self._start = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_seconds.append(time.perf_counter() - self._start)
+
+
+def steady_epoch_seconds(epoch_seconds: List[float]) -> float:
+    """Median ohne die erste Epoche (Tracing + XLA-Kompilierung), falls es mehr gibt"""
+    if not epoch_seconds:
+        return 0.0
+    steady = epoch_seconds[1:] if len(epoch_seconds) > 1 else epoch_seconds
+    return float(np.median(steady))
@@ -0,0 +1,77 @@
+"""
+Reporting - Classification Report, Confusion Matrix, Trainingsverlauf
+"""
+
+import os
+from typing import Dict, List
+
+import numpy as np
+from sklearn.metrics import classification_report, confusion_matrix, precision_recall_fscore_support
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    HAS_PLOTS = True
+except ImportError:
+    HAS_PLOTS = False
+
+
+def evaluate_predictions(y_true: np.ndarray, y_pred: np.ndarray, classes: List[str],
+                         positive_class: int) -> Dict:
+    """Accuracy + Precision/Recall/F1 der Zielklasse + Report-Text"""
+    labels = list(range(len(classes)))
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        y_true, y_pred, labels=labels, zero_division=0
+    )
+    return {
+        'accuracy': float(np.mean(y_true == y_pred)),
+        'precision': float(precision[positive_class]),
+        'recall': float(recall[positive_class]),
+        'f1': float(f1[positive_class]),
+        'per_class_recall': {classes[i]: float(recall[i]) for i in labels},
+        'confusion_matrix': confusion_matrix(y_true, y_pred, labels=labels).tolist(),
+        'report': classification_report(y_true, y_pred, labels=labels, target_names=classes,
+                                        digits=4, zero_division=0),
+    }
+
+
+def save_plots(history: Dict[str, list], confusion: List[List[int]], classes: List[str], output_dir: str):
+    """confusion_matrix.png + training_history.png (ohne matplotlib übersprungen)"""
+    if not HAS_PLOTS:
+        print("⚠️  matplotlib nicht installiert - Plots übersprungen")
+        return
+
+    cm = np.asarray(confusion)
+    plt.figure(figsize=(10, 8))
+    plt.imshow(cm, interpolation='nearest', cmap='Blues')
+    plt.title('Confusion Matrix')
+    plt.colorbar()
+    tick_marks = np.arange(len(classes))
+    plt.xticks(tick_marks, classes, rotation=45)
+    plt.yticks(tick_marks, classes)
+    plt.xlabel('Predicted')
+    plt.ylabel('True')
+    for i in range(len(classes)):
+        for j in range(len(classes)):
+            plt.text(j, i, str(cm[i, j]), ha='center', va='center')
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'confusion_matrix.png'), dpi=150)
+    plt.close()
+
+    panels = [name for name in ('accuracy', 'loss', 'recall') if name in history]
+    plt.figure(figsize=(5 * len(panels), 4))
+    for i, name in enumerate(panels, start=1):
+        plt.subplot(1, len(panels), i)
+        plt.plot(history[name], label='Train')
+        if f'val_{name}' in history:
+            plt.plot(history[f'val_{name}'], label='Val')
+        plt.title(name.capitalize())
+        plt.xlabel('Epoch')
+        plt.ylabel(name.capitalize())
+        plt.legend()
+        plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, 'training_history.png'), dpi=150)
+    plt.close()
+    print("✅ Plots saved (confusion_matrix.png, training_history.png)")
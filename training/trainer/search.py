@@ -0,0 +1,406 @@
+"""
+Hyperparameter-Suche - parallele Trials, Median Stopping, SQLite-Study
+=======================================================================
+Trials (Zufallsstichproben aus search.space) laufen parallel auf dem
+Prozess-Pool (parallel.py) auf denselben tokenisierten Arrays. Nach jeder
+Epoche meldet ein Trial den Monitor-Wert an die Study; liegt sein
+laufender Mittelwert unter dem Median der anderen Trials in derselben
+Epoche, wird er gestoppt (Median Stopping Rule, Golovin et al. 2017).
+
+Bewertet wird nicht nur der Recall: jeder fertige Trial wird als TFLite
+exportiert und auf der CPU gemessen.
+    Score = Recall - parameter_penalty * Mio. Parameter - latency_penalty * ms
+
+Die Study (SQLite) speichert Parameter, Zwischenwerte und Ergebnisse aller
+Trials; ein abgebrochener Lauf setzt mit denselben Trials fort. Neue Suche
+(anderer space) = neue Study-Datei.
+
+Usage:
+    python3 training/train.py --config training/configs/comprehensive.json --search
+    python3 training/train_comprehensive.py --search --set search.trials=40 --set search.epochs=15
+"""
+
+import copy
+import json
+import math
+import os
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from tensorflow import keras
+
+from tflite_benchmark import tflite_latency_ms
+
+from .config import apply_params, save_config
+from .core import Trainer
+from .data import PreparedData
+from .parallel import load_shared_arrays, map_parallel, share_arrays, worker_plan
+
+TRIAL_STATES = ('queued', 'running', 'complete', 'pruned', 'failed')
+
+
+# ----------------------------------------------------------------------
+# Suchraum
+# ----------------------------------------------------------------------
+
+def sample_params(space: Dict[str, Any], rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Eine Stichprobe aus dem Suchraum
+
+    space: {'abschnitt.schlüssel': [Werte]} (Auswahl) oder
+           {'abschnitt.schlüssel': {'low': a, 'high': b, 'log': bool}}
+           (ganzzahlig, wenn low und high ganzzahlig sind)
+    """
+    params = {}
+    for key, spec in space.items():
+        if isinstance(spec, list):
+            params[key] = spec[int(rng.integers(len(spec)))]
+            continue
+
+        low, high, log = spec['low'], spec['high'], spec.get('log', False)
+        if log:
+            value = math.exp(rng.uniform(math.log(low), math.log(high)))
+        else:
+            value = rng.uniform(low, high)
+        if isinstance(low, int) and isinstance(high, int):
+            params[key] = int(min(high, max(low, round(value))))
+        else:
+            params[key] = float(f'{value:.6g}')
+    return params
+
+
+def validate_space(config: dict, space: Dict[str, Any]):
+    """
+    Unbekannte Schlüssel / data.* (bräuchte neue Tokenisierung) / loss.focal_*
+    ohne Focal Loss (tote Dimension) → ValueError
+    """
+    loss_types = space.get('loss.type')
+    focal = config['loss']['type'] == 'focal' or (isinstance(loss_types, list) and 'focal' in loss_types)
+    for key, spec in space.items():
+        if key.startswith('data.'):
+            raise ValueError(f"search.space darf data.* nicht variieren (Token-Cache): {key}")
+        if key.startswith('loss.focal_') and not focal:
+            raise ValueError(f"search.space.{key} wirkt nur mit loss.type focal "
+                             f"(aktuell: {config['loss']['type']})")
+        if not isinstance(spec, list) and not (isinstance(spec, dict) and {'low', 'high'} <= set(spec)):
+            raise ValueError(f"search.space.{key}: Liste oder {{'low', 'high'}} erwartet")
+    apply_params(copy.deepcopy(config), sample_params(space, np.random.default_rng(0)))
+
+
+# ----------------------------------------------------------------------
+# Study (SQLite)
+# ----------------------------------------------------------------------
+
+class Study:
+    """
+    Trials + Zwischenwerte in SQLite
+
+    Jeder Prozess öffnet eine eigene Connection auf dieselbe Datei (WAL-Modus).
+    Zwischenwerte sind immer "größer = besser" (Loss-Monitore negiert).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS trials (
+                trial_id INTEGER PRIMARY KEY,
+                params TEXT NOT NULL,
+                state TEXT NOT NULL,
+                score REAL,
+                results TEXT,
+                started REAL,
+                finished REAL
+            )
+        ''')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS intermediate (
+                trial_id INTEGER NOT NULL,
+                epoch INTEGER NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (trial_id, epoch)
+            )
+        ''')
+        self._conn.commit()
+
+    def add_trials(self, trials: List[Tuple[int, Dict[str, Any]]]):
+        """Legt Trials an (vorhandene bleiben unverändert)"""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO trials (trial_id, params, state) VALUES (?, ?, 'queued')",
+            [(trial_id, json.dumps(params)) for trial_id, params in trials]
+        )
+        self._conn.commit()
+
+    def pending(self, trial_ids: List[int]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Noch nicht abgeschlossene Trials aus trial_ids (queued, running)"""
+        rows = self._conn.execute(
+            "SELECT trial_id, params FROM trials WHERE state IN ('queued', 'running') ORDER BY trial_id"
+        ).fetchall()
+        wanted = set(trial_ids)
+        return [(trial_id, json.loads(params)) for trial_id, params in rows if trial_id in wanted]
+
+    def start(self, trial_id: int):
+        # Neustart eines abgebrochenen Trials: alte Zwischenwerte verwerfen
+        self._conn.execute('DELETE FROM intermediate WHERE trial_id = ?', (trial_id,))
+        self._conn.execute("UPDATE trials SET state = 'running', started = ? WHERE trial_id = ?",
+                           (time.time(), trial_id))
+        self._conn.commit()
+
+    def report(self, trial_id: int, epoch: int, value: float):
+        self._conn.execute('INSERT OR REPLACE INTO intermediate (trial_id, epoch, value) VALUES (?, ?, ?)',
+                           (trial_id, epoch, float(value)))
+        self._conn.commit()
+
+    def should_prune(self, trial_id: int, epoch: int, min_trials: int) -> bool:
+        """
+        Median Stopping: laufender Mittelwert (Epochen 0..epoch) dieses Trials
+        < Median der laufenden Mittelwerte aller anderen Trials, die epoch erreicht haben
+        """
+        rows = self._conn.execute('''
+            SELECT trial_id, AVG(value) FROM intermediate
+            WHERE epoch <= ? AND trial_id IN (SELECT trial_id FROM intermediate WHERE epoch = ?)
+            GROUP BY trial_id
+        ''', (epoch, epoch)).fetchall()
+        own = [mean for other_id, mean in rows if other_id == trial_id]
+        others = [mean for other_id, mean in rows if other_id != trial_id]
+        if not own or len(others) < min_trials:
+            return False
+        return own[0] < statistics.median(others)
+
+    def finish(self, trial_id: int, state: str, score: Optional[float] = None,
+               results: Optional[Dict] = None):
+        self._conn.execute(
+            'UPDATE trials SET state = ?, score = ?, results = ?, finished = ? WHERE trial_id = ?',
+            (state, score, json.dumps(results or {}), time.time(), trial_id)
+        )
+        self._conn.commit()
+
+    def trials(self) -> List[Dict]:
+        rows = self._conn.execute(
+            'SELECT trial_id, params, state, score, results, started, finished FROM trials ORDER BY trial_id'
+        ).fetchall()
+        return [{
+            'trial_id': trial_id,
+            'params': json.loads(params),
+            'state': state,
+            'score': score,
+            'results': json.loads(results) if results else {},
+            'seconds': round(finished - started, 1) if started and finished else None,
+        } for trial_id, params, state, score, results, started, finished in rows]
+
+    def close(self):
+        self._conn.close()
+
+
+class MedianStoppingCallback(keras.callbacks.Callback):
+    """Meldet den Monitor-Wert pro Epoche an die Study, stoppt bei Median-Pruning"""
+
+    def __init__(self, study: Study, trial_id: int, monitor: str, warmup_epochs: int, min_trials: int):
+        super().__init__()
+        self.study = study
+        self.trial_id = trial_id
+        self.monitor = monitor
+        self.sign = -1.0 if monitor.endswith('loss') else 1.0
+        self.warmup_epochs = warmup_epochs
+        self.min_trials = min_trials
+        self.pruned_at = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        value = (logs or {}).get(self.monitor)
+        if value is None:
+            return
+        self.study.report(self.trial_id, epoch, self.sign * float(value))
+        if epoch + 1 >= self.warmup_epochs and self.study.should_prune(self.trial_id, epoch, self.min_trials):
+            self.pruned_at = epoch + 1
+            self.model.stop_training = True
+
+
+# ----------------------------------------------------------------------
+# On-Device-Kosten
+# ----------------------------------------------------------------------
+
+def score_trial(recall: float, parameters: int, latency_ms: float, search_config: dict) -> Optional[float]:
+    """Recall minus On-Device-Kosten; None wenn eine harte Grenze verletzt ist"""
+    if search_config['max_parameters'] is not None and parameters > search_config['max_parameters']:
+        return None
+    if search_config['max_latency_ms'] is not None and latency_ms > search_config['max_latency_ms']:
+        return None
+    return (recall
+            - search_config['parameter_penalty'] * parameters / 1e6
+            - search_config['latency_penalty'] * latency_ms)
+
+
+def pareto_front(trials: List[Dict]) -> List[Dict]:
+    """Abgeschlossene Trials, die von keinem anderen in Recall, Parametern und Latenz dominiert werden"""
+    complete = [trial for trial in trials if trial['state'] == 'complete']
+
+    def dominates(a, b):
+        ra, rb = a['results'], b['results']
+        no_worse = (ra['recall'] >= rb['recall'] and ra['parameters'] <= rb['parameters']
+                    and ra['latency_ms'] <= rb['latency_ms'])
+        better = (ra['recall'] > rb['recall'] or ra['parameters'] < rb['parameters']
+                  or ra['latency_ms'] < rb['latency_ms'])
+        return no_worse and better
+
+    return [trial for trial in complete if not any(dominates(other, trial) for other in complete)]
+
+
+# ----------------------------------------------------------------------
+# Trials
+# ----------------------------------------------------------------------
+
+def _run_trial(task: Tuple) -> Dict:
+    """Trainiert einen Trial, misst TFLite-Kosten; Ergebnis steht in der Study"""
+    config, trial_id, params, arrays_dir, classes, positive_class, study_path = task
+    search_config = config['search']
+    trial_dir = os.path.join(config['export']['output_dir'], 'search', f'trial_{trial_id:03d}')
+
+    study = Study(study_path)
+    study.start(trial_id)
+    start = time.time()
+    try:
+        trial_config = apply_params(copy.deepcopy(config), params)
+        trial_config['training']['epochs'] = search_config['epochs'] or config['training']['epochs']
+
+        names = ('X_fit', 'y_fit', 'X_val', 'y_val')
+        arrays = load_shared_arrays(arrays_dir, *names)
+        X_fit, y_fit, X_val, y_val = (np.asarray(arrays[name]) for name in names)
+        trainer = Trainer(trial_config)
+        trainer.data = PreparedData(X_fit, y_fit, X_val, y_val, classes, None, positive_class)
+
+        keras.utils.set_random_seed(config['training']['seed'])
+        model = trainer.build_model()
+        pruner = MedianStoppingCallback(study, trial_id, trial_config['training']['monitor'],
+                                        search_config['prune_warmup_epochs'], search_config['prune_min_trials'])
+        history = trainer.fit(model, (X_fit, y_fit), (X_val, y_val), output_dir=trial_dir,
+                              extra_callbacks=[pruner], verbose=0)
+        epochs = len(history.history['loss'])
+
+        if pruner.pruned_at is not None:
+            study.finish(trial_id, 'pruned', results={'epochs_trained': epochs})
+            return {'trial_id': trial_id, 'state': 'pruned', 'epochs_trained': epochs}
+
+        metrics = trainer.evaluate(model, X_val, y_val)
+        tflite_path = trainer.export_tflite(model, os.path.join(trial_dir, 'trial.tflite'), saved_model=False)
+        latency = tflite_latency_ms(tflite_path, X_val, runs=search_config['latency_runs'],
+                                    threads=search_config['latency_threads'])
+        results = {
+            'accuracy': metrics['accuracy'],
+            'precision': metrics['precision'],
+            'recall': metrics['recall'],
+            'f1': metrics['f1'],
+            'parameters': int(model.count_params()),
+            'latency_ms': round(latency, 3),
+            'tflite_bytes': os.path.getsize(tflite_path),
+            'epochs_trained': epochs,
+        }
+        score = score_trial(results['recall'], results['parameters'], latency, search_config)
+        study.finish(trial_id, 'complete', score=score, results=results)
+        return {'trial_id': trial_id, 'state': 'complete', 'score': score, **results}
+    except Exception as e:
+        study.finish(trial_id, 'failed', results={'error': f"{type(e).__name__}: {e}",
+                                                  'seconds': round(time.time() - start, 1)})
+        return {'trial_id': trial_id, 'state': 'failed', 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        study.close()
+
+
+def _print_trial(result: Dict):
+    trial = f"   Trial {result['trial_id']:3d}"
+    if result['state'] == 'complete':
+        score = 'unzulässig' if result['score'] is None else f"{result['score']:.4f}"
+        print(f"{trial}: ✅ recall {result['recall']:.4f}, {result['parameters']:,} params, "
+              f"{result['latency_ms']:.2f} ms → score {score}")
+    elif result['state'] == 'pruned':
+        print(f"{trial}: ✂️  pruned nach {result['epochs_trained']} Epochen")
+    else:
+        print(f"{trial}: ⚠️  failed - {result['error']}")
+
+
+def run_search(config: dict) -> Dict:
+    """
+    Parallele Zufallssuche über search.space mit Median-Pruning
+
+    Returns: {'best': Trial oder None, 'trials': [...], 'pareto_front': [...]}
+    """
+    search_config = config['search']
+    space = search_config['space']
+    validate_space(config, space)
+
+    start = time.time()
+    print("=" * 80)
+    print(f"🔍 KidGuard Hyperparameter Search - {config['name']}")
+    print("=" * 80)
+    print(f"Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    trainer = Trainer(config)
+    data = trainer.prepare()
+    search_dir = os.path.join(trainer.output_dir, 'search')
+    (X_fit, y_fit), (X_val, y_val) = trainer.validation_split()
+    arrays_dir = share_arrays(search_dir, X_fit=X_fit, y_fit=y_fit, X_val=X_val, y_val=y_val)
+
+    study_path = search_config['study'] or os.path.join(search_dir, 'study.sqlite')
+    study = Study(study_path)
+    rng = np.random.default_rng(search_config['seed'])
+    trial_ids = list(range(1, search_config['trials'] + 1))
+    study.add_trials([(trial_id, sample_params(space, rng)) for trial_id in trial_ids])
+    pending = study.pending(trial_ids)
+
+    workers, threads = worker_plan(max(1, len(pending)), search_config['workers'],
+                                   search_config['threads_per_worker'])
+    print(f"\n🚀 {len(pending)} von {len(trial_ids)} Trials offen - {workers} Worker(n) × {threads} Thread(s)")
+    print(f"   Study: {study_path}")
+    print(f"   Space: {', '.join(space)}")
+
+    tasks = [(copy.deepcopy(config), trial_id, params, arrays_dir, data.classes, data.positive_class, study_path)
+             for trial_id, params in pending]
+    for result in map_parallel(_run_trial, tasks, workers, threads):
+        _print_trial(result)
+
+    trials = [trial for trial in study.trials() if trial['trial_id'] in set(trial_ids)]
+    study.close()
+    scored = sorted((trial for trial in trials if trial['state'] == 'complete' and trial['score'] is not None),
+                    key=lambda trial: trial['score'], reverse=True)
+    front = pareto_front(trials)
+    best = scored[0] if scored else None
+
+    report = {
+        'best': best,
+        'pareto_front': [trial['trial_id'] for trial in front],
+        'trials': trials,
+        'study': study_path,
+        'wall_seconds': round(time.time() - start, 1),
+    }
+    with open(os.path.join(search_dir, 'search_results.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    if best is not None:
+        save_config(apply_params(copy.deepcopy(config), best['params']),
+                    os.path.join(search_dir, 'best_config.json'))
+
+    counts = {state: sum(trial['state'] == state for trial in trials) for state in TRIAL_STATES}
+    print("\n" + "=" * 80)
+    print("📊 SEARCH RESULTS")
+    print("=" * 80)
+    print(f"   Trials: {counts['complete']} complete, {counts['pruned']} pruned, {counts['failed']} failed")
+    if scored:
+        print(f"\n   {'Trial':>5s} {'Score':>8s} {'Recall':>8s} {'Params':>11s} {'ms':>8s}")
+        for trial in scored[:5]:
+            results = trial['results']
+            marker = ' ◆' if trial in front else ''
+            print(f"   {trial['trial_id']:5d} {trial['score']:8.4f} {results['recall']:8.4f} "
+                  f"{results['parameters']:11,} {results['latency_ms']:8.2f}{marker}")
+        print("   (◆ = Pareto-optimal in Recall / Parameter / Latenz)")
+        print(f"\n🏆 Best Trial {best['trial_id']}: {json.dumps(best['params'])}")
+        print(f"   Config: {os.path.join(search_dir, 'best_config.json')}")
+    else:
+        print("\n⚠️  Kein zulässiger Trial abgeschlossen")
+    print(f"\n⏰ End: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ({report['wall_seconds'] / 60:.1f} min)")
+    print("=" * 80)
+    return report
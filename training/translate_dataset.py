@@ -5,23 +5,48 @@ KidGuard Dataset Translation: EN → DE
 Übersetzt alle englischen Texte ins Deutsche für deutschsprachige Zielgruppe (7-11 Jahre)
 
 PRIORITÄT: PAN12-Daten sind auf Englisch und müssen übersetzt werden!
+
+Output-Felder: text, label, source, language ('de'), original_text (nur bei
+übersetzten Samples) + alle weiteren Input-Felder. sample_id ist nur der
+Resume-Schlüssel der Arbeitsdatei und fehlt im Export (JSON und JSONL).
+
+Samples, deren Übersetzung fehlschlägt, werden zunächst nicht geschrieben;
+--resume versucht sie erneut. Nach MAX_TRANSLATION_ATTEMPTS Versuchen (bzw.
+sofort mit --keep-failed) wird das Original übernommen (language 'en',
+translation_failed: true) und im Fehler-Log vermerkt.
 """
 
+import argparse
 import json
 import time
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional
 from tqdm import tqdm
 import re
 
+from jsonl_dataset import (iter_records, write_records, JsonlWriter,
+                           iter_with_ids, write_json_atomic, SAMPLE_ID_KEY)
+from translation_cache import TranslationCache
+from translation_engine import (TranslationEngine, TranslationAborted, create_backend,
+                                TRANSLATOR_AVAILABLE)
+from language_id import LanguageIdentifier
+
 # Translation Library (installiere mit: pip install deep-translator)
-try:
-    from deep_translator import GoogleTranslator
-    TRANSLATOR_AVAILABLE = True
-except ImportError:
+if not TRANSLATOR_AVAILABLE:
     print("⚠️  deep-translator nicht gefunden!")
     print("   Installiere mit: pip install deep-translator")
-    TRANSLATOR_AVAILABLE = False
+
+# Samples pro Übersetzungs-Runde (englische Texte daraus laufen parallel)
+CHUNK_SIZE = 200
+# Default: alle N geschriebenen Samples fsync + State-Datei
+CHECKPOINT_EVERY = 500
+# Abbruch nach so vielen fehlgeschlagenen Requests in Folge (Backend down / gesperrt)
+MAX_CONSECUTIVE_FAILURES = 5
+# Versuche pro Sample (über --resume-Läufe), danach wird das Original übernommen
+MAX_TRANSLATION_ATTEMPTS = 3
+# Markiert Samples, die im Original (Englisch) übernommen wurden
+FAILED_KEY = 'translation_failed'
 
 
 class DatasetTranslator:
@@ -29,41 +54,60 @@ class DatasetTranslator:
     Übersetzt Dataset von Englisch nach Deutsch
 
     Features:
-    - Batch-Processing mit Rate-Limiting
+    - Parallele Multi-Satz-Requests mit Token-Bucket Rate-Limiting
+    - Retry mit Backoff (translation_engine.py)
     - Jugendsprache beibehalten
     - Fehlerbehandlung mit Fallback
     - Progress Tracking
+    - Persistenter Cache (SQLite) - Re-Runs zahlen nur für neue Texte
     """
 
-    def __init__(self, rate_limit_delay: float = 0.5):
+    def __init__(self, rate_limit_delay: float = 0.5, cache: TranslationCache = None,
+                 backend: str = 'google', max_workers: int = 4, batch_size: int = 20):
         """
         Args:
-            rate_limit_delay: Pause zwischen Requests (Sekunden)
+            rate_limit_delay: Mittlerer Abstand zwischen Requests (Sekunden)
+            cache: Übersetzungs-Cache (Default: gemeinsamer Cache in training/data/cache)
+            backend: 'google' oder 'local' (offline Stand-in)
+            max_workers: Parallele Requests
+            batch_size: Max. Texte pro Request
         """
         self.rate_limit_delay = rate_limit_delay
-        self.translator = GoogleTranslator(source='en', target='de') if TRANSLATOR_AVAILABLE else None
         self.translation_errors = []
-        self.cache = {}  # Cache für bereits übersetzte Texte
+        self.language_id = LanguageIdentifier()  # Batch-Erkennung mit Cache pro Sample
+
+        translator_backend = create_backend(backend, 'en', 'de')
+        if cache is None:
+            # Cache für bereits übersetzte Texte (Key enthält die Backend-Version)
+            cache = TranslationCache(translator_version=translator_backend.version) \
+                if translator_backend else TranslationCache()
+        self.cache = cache
+
+        self.engine = None
+        if translator_backend:
+            self.engine = TranslationEngine(
+                translator_backend, self.cache,
+                requests_per_second=1.0 / rate_limit_delay,
+                max_workers=max_workers,
+                batch_size=batch_size,
+                errors=self.translation_errors,
+                max_consecutive_failures=MAX_CONSECUTIVE_FAILURES
+            )
 
     def is_english(self, text: str) -> bool:
         """
         Prüft ob Text wahrscheinlich Englisch ist
 
-        Heuristik: Häufige englische Wörter
+        Heuristik: Häufige englische Wörter - mindestens 2 verschiedene
+        Indikator-Wörter → wahrscheinlich Englisch (siehe language_id.py)
         """
-        english_indicators = [
-            r'\byou\b', r'\bare\b', r'\byour\b', r'\bthe\b',
-            r'\bis\b', r'\bdo\b', r'\bdid\b', r'\bcan\b',
-            r'\bwhat\b', r'\bwhere\b', r'\bwhen\b', r'\bhow\b'
-        ]
-
-        text_lower = text.lower()
-        matches = sum(1 for pattern in english_indicators if re.search(pattern, text_lower))
+        return self.language_id.is_english(text)
 
-        # Wenn mindestens 2 englische Indikator-Wörter → wahrscheinlich Englisch
-        return matches >= 2
+    def english_mask(self, texts: List[str]):
+        """is_english für viele Texte auf einmal → np.ndarray[bool]"""
+        return self.language_id.english_mask(texts)
 
-    def translate_text(self, text: str) -> str:
+    def translate_text(self, text: str) -> Optional[str]:
         """
         Übersetzt einzelnen Text EN → DE
 
@@ -71,41 +115,40 @@ class DatasetTranslator:
             text: Englischer Text
 
         Returns:
-            Deutscher Text (oder Original bei Fehler)
+            Deutscher Text (None bei Fehler)
         """
-        if not text or len(text.strip()) < 2:
-            return text
-
-        # Prüfe Cache
-        if text in self.cache:
-            return self.cache[text]
+        return self.translate_texts([text])[0]
 
-        # Wenn kein Translator verfügbar → Original zurückgeben
-        if not TRANSLATOR_AVAILABLE or not self.translator:
-            return text
-
-        try:
-            # Rate Limiting
-            time.sleep(self.rate_limit_delay)
-
-            # Übersetze
-            translated = self.translator.translate(text)
-
-            # Jugendsprache-Optimierungen
-            translated = self.optimize_youth_language(translated)
+    def translate_texts(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Übersetzt mehrere Texte EN → DE (parallel, gebatcht, gecacht)
 
-            # Cache speichern
-            self.cache[text] = translated
+        Returns:
+            Deutsche Texte (None bei Fehler)
 
+        Raises:
+            TranslationAborted: MAX_CONSECUTIVE_FAILURES Requests in Folge fehlgeschlagen
+        """
+        if self.engine is None:
+            # Kein Translator verfügbar → nur Cache, sonst nicht übersetzbar
+            translated = []
+            for text in texts:
+                if not text or len(text.strip()) < 2:
+                    translated.append(text)
+                    continue
+                cached = self.cache.get(text, 'en', 'de')
+                translated.append(self.optimize_youth_language(cached) if cached is not None else None)
             return translated
 
-        except Exception as e:
-            self.translation_errors.append({
-                'text': text,
-                'error': str(e)
-            })
-            print(f"\n⚠️  Übersetzungsfehler: {text[:50]}... → {str(e)}")
-            return text  # Fallback: Original behalten
+        results = []
+        for text, translated in zip(texts, self.engine.translate_many(texts)):
+            # Engine liefert leere Texte als Original-Objekt, Fehler als None
+            if translated is None or translated is text:
+                results.append(translated)
+            else:
+                # Jugendsprache-Optimierungen (Cache enthält die rohe Übersetzung)
+                results.append(self.optimize_youth_language(translated))
+        return results
 
     def optimize_youth_language(self, text: str) -> str:
         """
@@ -134,84 +177,238 @@ class DatasetTranslator:
 
         return result
 
-    def translate_dataset(self, input_file: str, output_file: str):
+    def iter_translated(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Übersetzt Samples (Generator, Reihenfolge bleibt erhalten)
+
+        Liest jeweils CHUNK_SIZE Samples und übersetzt deren englische Texte
+        gemeinsam über die TranslationEngine. Samples mit fehlgeschlagener
+        Übersetzung kommen im Original mit translation_failed=True.
         """
-        Übersetzt komplettes Dataset
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, CHUNK_SIZE))
+            if not chunk:
+                return
+
+            # Prüfe ob Übersetzung nötig
+            texts = [item.get('text', '') for item in chunk]
+            english = [text for text, is_en in zip(texts, self.english_mask(texts)) if is_en]
+            translations = dict(zip(english, self.translate_texts(english)))
+
+            for item in chunk:
+                yield self._translated_item(item, translations)
+
+    def _translated_item(self, item: Dict, translations: Dict[str, Optional[str]]) -> Dict:
+        """Baut das Output-Sample (mit original_text, falls übersetzt)"""
+        text = item.get('text', '')
+
+        needs_translation = text in translations
+
+        if needs_translation and translations[text] is None:
+            # Übersetzung fehlgeschlagen → Original, als solches markiert
+            translated_item = {
+                'text': text,
+                'label': item.get('label', 'STAGE_SAFE'),
+                'source': item.get('source', 'unknown'),
+                'language': 'en',
+                FAILED_KEY: True
+            }
+        elif needs_translation:
+            translated_text = translations[text]
+
+            # Erstelle neues Item mit Translation
+            translated_item = {
+                'text': translated_text,
+                'original_text': text,  # Original für Referenz
+                'label': item.get('label', 'STAGE_SAFE'),
+                'source': item.get('source', 'unknown'),
+                'language': 'de'
+            }
+        else:
+            # Text bereits deutsch
+            translated_item = {
+                'text': text,
+                'label': item.get('label', 'STAGE_SAFE'),
+                'source': item.get('source', 'unknown'),
+                'language': 'de'
+            }
+
+        # Kopiere zusätzliche Felder (stage, context, etc.)
+        for key, value in item.items():
+            if key not in ['text', 'label', 'source', 'language']:
+                translated_item[key] = value
+
+        return translated_item
+
+    def _checkpoint(self, writer: JsonlWriter, state_path: Path, input_file: str,
+                    attempts: Dict[str, int]):
+        """Sichert den Fortschritt: Samples per fsync, danach State-Datei atomar"""
+        write_json_atomic({
+            'input_file': str(input_file),
+            'output_file': str(writer.path),
+            'samples_done': writer.count,
+            'bytes_done': writer.checkpoint(),
+            'failed_attempts': attempts,
+            'updated': time.strftime('%Y-%m-%d %H:%M:%S')
+        }, state_path)
+
+    def _check_state(self, state_path: Path, input_file: str) -> Dict[str, int]:
+        """Zeigt den letzten Checkpoint → bisherige Fehlversuche pro sample_id"""
+        if not state_path.exists():
+            return {}
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        print(f"   Letzter Checkpoint: {state['samples_done']} Samples ({state['updated']})")
+        if state['input_file'] != str(input_file):
+            print(f"⚠️  Checkpoint stammt von anderem Input: {state['input_file']}")
+            return {}
+        return state.get('failed_attempts', {})
+
+    def translate_dataset(self, input_file: str, output_file: str, resume: bool = False,
+                          checkpoint_every: int = CHECKPOINT_EVERY, keep_failed: bool = False):
+        """
+        Übersetzt komplettes Dataset (streamend, .json oder .jsonl)
+
+        Fortschritt wird laufend in eine .jsonl-Arbeitsdatei
+        (<output>.partial.jsonl) geschrieben und alle checkpoint_every
+        Samples per fsync + atomarer State-Datei gesichert. Der Export
+        (.json oder .jsonl, ohne sample_id) entsteht erst am Ende.
+
+        Samples mit fehlgeschlagener Übersetzung werden nicht geschrieben;
+        die Fehlversuche pro sample_id stehen in der State-Datei. Gab es
+        solche, bleiben Arbeitsdatei + State-Datei liegen (kein Export) und
+        resume=True übersetzt genau diese Samples erneut. Nach
+        MAX_TRANSLATION_ATTEMPTS Versuchen bzw. mit keep_failed wird das
+        Original übernommen, damit der Export nicht an einzelnen Samples hängt.
+        Nach MAX_CONSECUTIVE_FAILURES fehlgeschlagenen Requests in Folge
+        bricht der Lauf mit TranslationAborted ab (Fortschritt ist gesichert).
 
         Args:
-            input_file: Pfad zur JSON-Datei (EN)
+            input_file: Pfad zur JSON/JSONL-Datei (EN)
             output_file: Pfad zur Ausgabe-Datei (DE)
+            resume: Bereits übersetzte Samples (per sample_id) überspringen
+            checkpoint_every: Checkpoint-Intervall in Samples
+            keep_failed: Fehlgeschlagene Samples sofort im Original übernehmen
         """
+        # Fehler-Report gilt pro Dataset (Liste wird mit der Engine geteilt)
+        self.translation_errors.clear()
+
         print(f"\n{'='*70}")
         print(f"📥 Lade Dataset: {input_file}")
         print(f"{'='*70}")
 
-        # Lade JSON
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        print(f"✅ {len(data)} Samples geladen")
-
-        # Zähle englische Texte
-        english_count = sum(1 for item in data if self.is_english(item.get('text', '')))
+        # Zähle Samples + englische Texte (ohne das Dataset im Speicher zu halten)
+        total_count = 0
+        english_count = 0
+        records = iter_records(input_file)
+        while True:
+            texts = [item.get('text', '') for item in islice(records, CHUNK_SIZE * 10)]
+            if not texts:
+                break
+            total_count += len(texts)
+            english_count += int(self.english_mask(texts).sum())
+
+        print(f"✅ {total_count} Samples geladen")
         print(f"📊 {english_count} englische Texte erkannt → Übersetzung erforderlich")
 
         if english_count == 0:
             print("✅ Keine Übersetzung nötig - alle Texte bereits deutsch!")
             return
 
-        # Übersetze mit Progress Bar
-        print(f"\n🔄 Übersetze {english_count} Texte ins Deutsche...")
-        translated_data = []
-
-        for item in tqdm(data, desc="Übersetzung", unit="samples"):
-            text = item.get('text', '')
-
-            # Prüfe ob Übersetzung nötig
-            needs_translation = self.is_english(text)
-
-            if needs_translation:
-                translated_text = self.translate_text(text)
-
-                # Erstelle neues Item mit Translation
-                translated_item = {
-                    'text': translated_text,
-                    'original_text': text,  # Original für Referenz
-                    'label': item.get('label', 'STAGE_SAFE'),
-                    'source': item.get('source', 'unknown'),
-                    'language': 'de'
-                }
-            else:
-                # Text bereits deutsch
-                translated_item = {
-                    'text': text,
-                    'label': item.get('label', 'STAGE_SAFE'),
-                    'source': item.get('source', 'unknown'),
-                    'language': 'de'
-                }
-
-            # Kopiere zusätzliche Felder (stage, context, etc.)
-            for key, value in item.items():
-                if key not in ['text', 'label', 'source']:
-                    translated_item[key] = value
-
-            translated_data.append(translated_item)
-
-        # Speichere übersetztes Dataset
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, indent=2, ensure_ascii=False)
+        # Statistiken werden beim Durchlauf gesammelt
+        with_original = 0
+        failed = 0
+        kept_original = 0
+        attempts: Dict[str, int] = {}
+        examples = []
+
+        def tracked(items):
+            nonlocal with_original, failed, kept_original
+            for item in items:
+                if item.get(FAILED_KEY):
+                    sample_id = item[SAMPLE_ID_KEY]
+                    attempts[sample_id] = attempts.get(sample_id, 0) + 1
+                    if not keep_failed and attempts[sample_id] < MAX_TRANSLATION_ATTEMPTS:
+                        failed += 1
+                        continue
+                    kept_original += 1
+                    self.translation_errors.append({
+                        SAMPLE_ID_KEY: sample_id,
+                        'text': item['text'],
+                        'error': f"Original übernommen nach {attempts.pop(sample_id)} Versuch(en)"
+                    })
+                elif 'original_text' in item:
+                    with_original += 1
+                    if len(examples) < 3:
+                        examples.append(item)
+                yield item
 
-        print(f"\n✅ Übersetzung abgeschlossen!")
-        print(f"💾 Gespeichert: {output_file}")
-        print(f"📊 {len(translated_data)} Samples")
+        # Übersetze mit Progress Bar
+        print(f"\n🔄 Übersetze {english_count} Texte ins Deutsche...")
 
-        # Statistiken
-        with_original = sum(1 for item in translated_data if 'original_text' in item)
+        work_path = output_path.with_name(output_path.name + '.partial.jsonl')
+        state_path = output_path.with_name(output_path.name + '.state.json')
+        error_log_path = output_path.parent / f"{output_path.stem}_errors.json"
+
+        with JsonlWriter(work_path, resume=resume) as writer:
+            done_ids = set()
+            if writer.count:
+                done_ids = {record.get(SAMPLE_ID_KEY) for record in iter_records(work_path)}
+                print(f"⏩ Resume: {len(done_ids)} Samples bereits übersetzt")
+            if resume:
+                attempts.update(self._check_state(state_path, input_file))
+
+            progress = tqdm(iter_records(input_file), desc="Übersetzung", unit="samples",
+                            total=total_count)
+            pending = (item for item in iter_with_ids(progress)
+                       if item[SAMPLE_ID_KEY] not in done_ids)
+
+            skip = writer.count
+            aborted = None
+            try:
+                for item in tracked(self.iter_translated(pending)):
+                    writer.write(item)
+                    if writer.count % checkpoint_every == 0:
+                        self._checkpoint(writer, state_path, input_file, attempts)
+            except TranslationAborted as e:
+                aborted = e
+
+            written = writer.count - skip
+            saved = writer.count
+            if aborted or failed:
+                self._checkpoint(writer, state_path, input_file, attempts)
+
+        if aborted or failed:
+            if aborted:
+                print(f"\n❌ Übersetzung abgebrochen: {aborted}")
+            else:
+                print(f"\n⚠️  Übersetzung unvollständig: {failed} Samples fehlgeschlagen")
+            print(f"💾 Fortschritt: {work_path} ({saved} Samples)")
+            print(f"   → Erneut mit --resume starten (übersetzt nur die fehlenden Samples; "
+                  f"nach {MAX_TRANSLATION_ATTEMPTS} Versuchen oder mit --keep-failed wird das Original übernommen)")
+        else:
+            # sample_id ist nur der Resume-Schlüssel der Arbeitsdatei
+            write_records(({key: value for key, value in record.items() if key != SAMPLE_ID_KEY}
+                           for record in iter_records(work_path)), output_path)
+            work_path.unlink()
+            if state_path.exists():
+                state_path.unlink()
+
+            print(f"\n✅ Übersetzung abgeschlossen!")
+            print(f"💾 Gespeichert: {output_file}")
+            print(f"📊 {saved} Samples")
+
+        # Statistiken (dieser Lauf)
         print(f"📊 {with_original} Texte übersetzt")
-        print(f"📊 {len(translated_data) - with_original} Texte bereits deutsch")
+        print(f"📊 {written - with_original - kept_original} Texte bereits deutsch")
+        if kept_original:
+            print(f"📊 {kept_original} Texte im Original übernommen (translation_failed)")
+
+        self.cache.print_stats()
 
         # Fehler-Report
         if self.translation_errors:
@@ -220,22 +417,68 @@ class DatasetTranslator:
                 print(f"   - {error['text'][:50]}... → {error['error']}")
 
             # Speichere Fehler-Log
-            error_log_path = output_path.parent / f"{output_path.stem}_errors.json"
             with open(error_log_path, 'w', encoding='utf-8') as f:
                 json.dump(self.translation_errors, f, indent=2, ensure_ascii=False)
             print(f"📄 Fehler-Log: {error_log_path}")
+        elif not (aborted or failed) and error_log_path.exists():
+            # Log eines früheren Laufs gilt nicht mehr
+            error_log_path.unlink()
 
         # Beispiele zeigen
         print(f"\n📝 Beispiele:")
-        examples = [item for item in translated_data if 'original_text' in item][:3]
         for i, ex in enumerate(examples, 1):
             print(f"\n{i}. EN: {ex['original_text'][:60]}...")
             print(f"   DE: {ex['text'][:60]}...")
             print(f"   Label: {ex['label']}")
 
+        if aborted:
+            raise aborted
+
 
 def main():
     """Hauptfunktion - Übersetzt Train und Test Datasets"""
+    parser = argparse.ArgumentParser(description="KidGuard Dataset Translation EN → DE")
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Dateiformat für Input und Output (jsonl = streambar + resumable)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Abgebrochene Übersetzung fortsetzen (überspringt fertige Samples per sample_id)"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=CHECKPOINT_EVERY,
+        help="Fortschritt alle N Samples sichern (fsync + State-Datei)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["google", "local"],
+        default="google",
+        help="Übersetzungs-Backend (local = offline Stand-in zum Testen)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Parallele Übersetzungs-Requests"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="Max. Texte pro Request"
+    )
+    parser.add_argument(
+        "--keep-failed",
+        action="store_true",
+        help="Nicht übersetzbare Samples sofort im Original übernehmen (statt Retry per --resume)"
+    )
+    args = parser.parse_args()
 
     print("="*70)
     print("🌍 KIDGUARD DATASET TRANSLATION: EN → DE")
@@ -244,39 +487,48 @@ def main():
     print("Quelle: PAN12 (Englisch) + Scientific Papers (Mixed)")
     print("Ziel: Alle Texte auf Deutsch für On-Device-KI\n")
 
-    if not TRANSLATOR_AVAILABLE:
+    if args.backend == "google" and not TRANSLATOR_AVAILABLE:
         print("❌ deep-translator nicht installiert!")
         print("\nInstalliere mit:")
         print("   pip install deep-translator")
         return
 
     # Initialisiere Translator
-    translator = DatasetTranslator(rate_limit_delay=0.5)
+    translator = DatasetTranslator(
+        rate_limit_delay=0.5,
+        backend=args.backend,
+        max_workers=args.workers,
+        batch_size=args.batch_size
+    )
 
     # Pfade
     base_dir = Path("training/data/combined")
 
     # 1. Training Dataset übersetzen
-    train_input = base_dir / "kidguard_train.json"
-    train_output = base_dir / "kidguard_german_train.json"
-
-    if train_input.exists():
-        translator.translate_dataset(str(train_input), str(train_output))
-    else:
-        print(f"⚠️  Training-Datei nicht gefunden: {train_input}")
-
-    # Reset für Test-Set
-    translator.translation_errors = []
-
-    # 2. Test Dataset übersetzen
-    test_input = base_dir / "kidguard_test.json"
-    test_output = base_dir / "kidguard_german_test.json"
-
-    if test_input.exists():
-        print("\n" + "="*70)
-        translator.translate_dataset(str(test_input), str(test_output))
-    else:
-        print(f"⚠️  Test-Datei nicht gefunden: {test_input}")
+    train_input = base_dir / f"kidguard_train.{args.format}"
+    train_output = base_dir / f"kidguard_german_train.{args.format}"
+
+    # 2. Test Dataset
+    test_input = base_dir / f"kidguard_test.{args.format}"
+    test_output = base_dir / f"kidguard_german_test.{args.format}"
+
+    try:
+        if train_input.exists():
+            translator.translate_dataset(str(train_input), str(train_output),
+                                         args.resume, args.checkpoint_every, args.keep_failed)
+        else:
+            print(f"⚠️  Training-Datei nicht gefunden: {train_input}")
+
+        if test_input.exists():
+            print("\n" + "="*70)
+            translator.translate_dataset(str(test_input), str(test_output),
+                                         args.resume, args.checkpoint_every, args.keep_failed)
+        else:
+            print(f"⚠️  Test-Datei nicht gefunden: {test_input}")
+    except TranslationAborted:
+        translator.cache.close()
+        print("\n❌ Übersetzungs-Backend nicht erreichbar - später mit --resume fortsetzen")
+        return
 
     print("\n" + "="*70)
     print("✅ ÜBERSETZUNG ABGESCHLOSSEN")
@@ -284,6 +536,8 @@ def main():
     print(f"\n📂 Output:")
     print(f"   - {train_output}")
     print(f"   - {test_output}")
+    translator.cache.close()
+
     print(f"\n🎯 Nächster Schritt: python3 training/augment_data.py")
 
 
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Translation Cache - Persistenter Übersetzungs-Cache (SQLite)
+============================================================
+Gemeinsamer Cache für DatasetTranslator (translate_dataset.py),
+DataAugmenter.back_translate (augment_data.py) und
+translate_batch (ml/scripts/prepare_pasyda.py).
+
+- Key: sha256 über Quellsprache, Zielsprache, Translator-Version und Text
+  → neue Translator-Version = neue Einträge, alte altern per LRU heraus
+- Gespeichert wird die ROHE Übersetzung (ohne Nachbearbeitung wie
+  optimize_youth_language), damit Änderungen daran keinen Re-Run kosten
+- Größenbasierte Eviction: überschreitet der Cache max_size_mb, werden die
+  am längsten nicht genutzten Einträge gelöscht
+
+Usage:
+    cache = TranslationCache()
+    translated = cache.get(text, 'en', 'de')
+    if translated is None:
+        translated = translator.translate(text)
+        cache.put(text, translated, 'en', 'de')
+"""
+
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+try:
+    import deep_translator
+    TRANSLATOR_VERSION = f"google/deep-translator-{deep_translator.__version__}"
+except (ImportError, AttributeError):
+    TRANSLATOR_VERSION = "google/deep-translator"
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent / 'data' / 'cache' / 'translations.sqlite'
+DEFAULT_MAX_SIZE_MB = 512
+
+# Eviction nur alle N Schreibzugriffe prüfen (SUM() über die Tabelle)
+EVICTION_CHECK_INTERVAL = 1000
+# Nach Eviction auf diesen Anteil von max_size schrumpfen
+EVICTION_TARGET_RATIO = 0.9
+
+
+class TranslationCache:
+    """
+    Content-Hash-basierter Übersetzungs-Cache auf SQLite
+
+    Thread-sicher (eine Connection + Lock); mehrere Prozesse können dieselbe
+    Datei nutzen (WAL-Modus).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+                 translator_version: str = TRANSLATOR_VERSION):
+        """
+        Args:
+            path: SQLite-Datei
+            max_size_mb: Obergrenze für Quell- + Zieltexte im Cache
+            translator_version: Wird in den Key gehasht und mitgespeichert
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.translator_version = translator_version
+
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_check = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                translator_version TEXT NOT NULL,
+                source_text TEXT NOT NULL,
+                translated_text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)')
+        self._conn.commit()
+
+    def _key(self, text: str, source: str, target: str) -> str:
+        payload = '\0'.join([source, target, self.translator_version, text])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, text: str, source: str, target: str) -> Optional[str]:
+        """Gecachte Übersetzung oder None"""
+        key = self._key(text, source, target)
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT translated_text FROM translations WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE translations SET last_used = ? WHERE key = ?',
+                               (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, text: str, translated: str, source: str, target: str):
+        """Speichert eine Übersetzung (überschreibt vorhandene)"""
+        if not isinstance(translated, str):
+            return
+
+        key = self._key(text, source, target)
+        now = time.time()
+        size = len(text.encode('utf-8')) + len(translated.encode('utf-8'))
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, source, target, self.translator_version, text, translated, size, now, now)
+            )
+            self._conn.commit()
+
+            self._writes_since_check += 1
+            if self._writes_since_check >= EVICTION_CHECK_INTERVAL:
+                self._evict()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._size_bytes()
+
+    def _size_bytes(self) -> int:
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM translations').fetchone()[0]
+
+    def _evict(self):
+        """Löscht die am längsten ungenutzten Einträge, bis der Cache unter dem Limit ist"""
+        self._writes_since_check = 0
+        total = self._size_bytes()
+        if total <= self.max_size_bytes:
+            return
+
+        to_free = total - int(self.max_size_bytes * EVICTION_TARGET_RATIO)
+        freed = 0
+        keys = []
+        for key, size in self._conn.execute('SELECT key, size FROM translations ORDER BY last_used'):
+            keys.append((key,))
+            freed += size
+            if freed >= to_free:
+                break
+
+        self._conn.executemany('DELETE FROM translations WHERE key = ?', keys)
+        self._conn.commit()
+        print(f"\n🧹 Translation-Cache: {len(keys)} alte Einträge entfernt ({freed / 1024 / 1024:.1f} MB)")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def print_stats(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0.0
+        print(f"📊 Translation-Cache: {self.hits} Hits / {self.misses} Misses ({hit_rate:.1f}% Hit-Rate)")
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Translation Engine - Parallele, rate-limitierte Übersetzung mit Batching
+========================================================================
+Ersetzt "ein Request pro Satz + time.sleep(0.5)" durch:
+
+- Pluggable Backend: GoogleBackend (deep-translator) oder LocalBackend
+  (offline Stand-in mit Wörterbuch, für Tests ohne Netzwerk)
+- Token-Bucket Rate-Limiter: Requests/Sekunde + Burst statt fixer Pause
+- Multi-Satz-Batches: mehrere Texte pro Request (zeilenweise verbunden)
+- Zu lange Texte (>= max_batch_chars) werden an Satzgrenzen geteilt und
+  nach der Übersetzung wieder zusammengesetzt
+- Begrenzte Parallelität (Thread-Pool)
+- Retry mit exponentiellem Backoff + Jitter, danach Fallback auf Einzeltexte
+- Dauerhaft fehlgeschlagene Texte → None (nie stillschweigend das Original),
+  optional Abbruch nach N fehlgeschlagenen Batches in Folge
+- Persistenter Cache (translation_cache.py): nur neue Texte kosten Requests
+
+Usage:
+    engine = TranslationEngine(GoogleBackend('en', 'de'))
+    german = engine.translate_many(english_texts)
+
+Offline-Check:
+    python3 training/translation_engine.py
+"""
+
+import re
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from translation_cache import TranslationCache, TRANSLATOR_VERSION
+
+try:
+    from deep_translator import GoogleTranslator
+    TRANSLATOR_AVAILABLE = True
+except ImportError:
+    TRANSLATOR_AVAILABLE = False
+
+# Google Translate akzeptiert max. 5000 Zeichen pro Request
+MAX_BATCH_CHARS = 4500
+BATCH_SEPARATOR = '\n'
+# Satzende (mit folgendem Whitespace) oder Zeilenumbrüche
+SENTENCE_BOUNDARY = re.compile(r'((?<=[.!?])\s+|\n+)')
+
+
+def split_long_text(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """
+    Teilt text an Satzgrenzen in Stücke < max_chars
+
+    Sätze, die allein zu lang sind, werden an Wortgrenzen (notfalls hart)
+    geteilt; benachbarte Sätze werden wieder bis max_chars zusammengefasst.
+
+    Returns: [(stück, trenner), ...] mit ''.join(stück + trenner) == text
+    """
+    parts = SENTENCE_BOUNDARY.split(text)
+    pieces = []
+    for sentence, separator in zip(parts[0::2], parts[1::2] + ['']):
+        while len(sentence) >= max_chars:
+            cut = sentence.rfind(' ', 0, max_chars - 1)
+            if cut > 0:
+                pieces.append((sentence[:cut], ' '))
+                sentence = sentence[cut + 1:]
+            else:
+                pieces.append((sentence[:max_chars - 1], ''))
+                sentence = sentence[max_chars - 1:]
+        pieces.append((sentence, separator))
+
+    chunks = []
+    current, current_separator = '', ''
+    for piece, separator in pieces:
+        if current and len(current) + len(current_separator) + len(piece) >= max_chars:
+            chunks.append((current, current_separator))
+            current = piece
+        else:
+            current = current + current_separator + piece
+        current_separator = separator
+    chunks.append((current, current_separator))
+    return chunks
+
+
+class TranslationAborted(RuntimeError):
+    """Zu viele fehlgeschlagene Batches in Folge - Backend vermutlich dauerhaft gestört"""
+
+
+class TranslationBackend:
+    """
+    Interface für Übersetzungs-Backends
+
+    translate_batch() bekommt Texte ohne Zeilenumbrüche und muss gleich
+    viele Übersetzungen in derselben Reihenfolge liefern.
+    """
+
+    name = 'base'
+    version = 'base'
+
+    def __init__(self, source: str, target: str):
+        self.source = source
+        self.target = target
+
+    def translate(self, text: str) -> str:
+        raise NotImplementedError
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        return [self.translate(text) for text in texts]
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate über deep-translator (ein Request pro Batch)"""
+
+    name = 'google'
+    version = TRANSLATOR_VERSION
+
+    def __init__(self, source: str, target: str):
+        super().__init__(source, target)
+        if not TRANSLATOR_AVAILABLE:
+            raise ImportError("deep-translator nicht installiert (pip install deep-translator)")
+        self._local = threading.local()
+
+    def _translator(self):
+        # GoogleTranslator hält eine Session → eine Instanz pro Thread
+        if not hasattr(self._local, 'translator'):
+            self._local.translator = GoogleTranslator(source=self.source, target=self.target)
+        return self._local.translator
+
+    def translate(self, text: str) -> str:
+        return self._translator().translate(text)
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        if len(texts) == 1:
+            return [self.translate(texts[0])]
+
+        # Mehrere Sätze in EINEM Request, zeilenweise getrennt
+        joined = self._translator().translate(BATCH_SEPARATOR.join(texts))
+        parts = joined.split(BATCH_SEPARATOR) if joined else []
+
+        if len(parts) != len(texts):
+            # Zeilen wurden zusammengezogen/aufgeteilt → einzeln übersetzen
+            return [self.translate(text) for text in texts]
+
+        return [part.strip() for part in parts]
+
+
+class LocalBackend(TranslationBackend):
+    """
+    Offline Stand-in: Wort-für-Wort über ein kleines Wörterbuch
+
+    Simuliert optional Latenz pro Request und zufällige Fehler, um
+    Rate-Limiting, Parallelität und Retry ohne Netzwerk zu prüfen.
+    """
+
+    name = 'local'
+    version = 'local-1'
+
+    EN_DE = {
+        'you': 'du', 'are': 'bist', 'your': 'dein', 'the': 'der', 'is': 'ist',
+        'do': 'machst', 'did': 'hast', 'can': 'kannst', 'what': 'was',
+        'where': 'wo', 'when': 'wann', 'how': 'wie', 'alone': 'allein',
+        'secret': 'geheimnis', 'picture': 'bild', 'photo': 'foto',
+        'parents': 'eltern', 'home': 'zuhause', 'old': 'alt', 'friend': 'freund',
+    }
+
+    def __init__(self, source: str, target: str, latency: float = 0.0,
+                 failure_rate: float = 0.0, seed: int = 42):
+        super().__init__(source, target)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        if (source, target) == ('en', 'de'):
+            self.dictionary = self.EN_DE
+        elif (source, target) == ('de', 'en'):
+            self.dictionary = {de: en for en, de in self.EN_DE.items()}
+        else:
+            self.dictionary = {}
+
+    def _request(self):
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise ConnectionError("LocalBackend: simulierter Fehler")
+
+    def _translate_words(self, text: str) -> str:
+        return ' '.join(self.dictionary.get(word.lower(), word) for word in text.split())
+
+    def translate(self, text: str) -> str:
+        self._request()
+        return self._translate_words(text)
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        self._request()
+        return [self._translate_words(text) for text in texts]
+
+
+def create_backend(name: str, source: str, target: str) -> Optional[TranslationBackend]:
+    """Backend nach Name ('google' oder 'local'); None wenn nicht verfügbar"""
+    if name == 'local':
+        return LocalBackend(source, target)
+    if name == 'google':
+        return GoogleBackend(source, target) if TRANSLATOR_AVAILABLE else None
+    raise ValueError(f"Unbekanntes Backend: {name}")
+
+
+class TokenBucket:
+    """
+    Thread-sicherer Token-Bucket
+
+    rate Tokens pro Sekunde, max. capacity auf Vorrat (Burst).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Blockiert, bis tokens verfügbar sind"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class TranslationEngine:
+    """
+    Übersetzt viele Texte parallel, gebatcht, rate-limitiert und gecacht
+
+    Fehlgeschlagene Texte (nach allen Retries) werden zu None und landen
+    in self.errors. Mit max_consecutive_failures bricht translate_many()
+    nach so vielen fehlgeschlagenen Batches in Folge mit
+    TranslationAborted ab, statt den Rest ohne Übersetzung durchzureichen.
+    """
+
+    def __init__(self, backend: TranslationBackend, cache: TranslationCache = None,
+                 requests_per_second: float = 2.0, burst: int = 4, max_workers: int = 4,
+                 batch_size: int = 20, max_batch_chars: int = MAX_BATCH_CHARS,
+                 max_retries: int = 4, backoff_base: float = 1.0, errors: List = None,
+                 max_consecutive_failures: Optional[int] = None):
+        """
+        Args:
+            backend: Übersetzungs-Backend (bestimmt Quell-/Zielsprache)
+            cache: Persistenter Cache (Default: gemeinsamer Cache mit backend.version)
+            requests_per_second: Mittlere Request-Rate an das Backend
+            burst: Max. Requests auf Vorrat
+            max_workers: Parallele Requests
+            batch_size: Max. Texte pro Request
+            max_batch_chars: Max. Zeichen pro Request
+            max_retries: Wiederholungen pro Batch bei Fehlern
+            backoff_base: Wartezeit vor dem 1. Retry (verdoppelt sich)
+            errors: Liste, in die Fehler geschrieben werden
+            max_consecutive_failures: Abbruch nach so vielen fehlgeschlagenen
+                Batches in Folge (None = nie abbrechen)
+        """
+        self.backend = backend
+        self.cache = cache if cache is not None else TranslationCache(translator_version=backend.version)
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.errors = errors if errors is not None else []
+        self.max_consecutive_failures = max_consecutive_failures
+        self.consecutive_failures = 0
+        self._failure_lock = threading.Lock()
+
+    @property
+    def aborted(self) -> bool:
+        return (self.max_consecutive_failures is not None and
+                self.consecutive_failures >= self.max_consecutive_failures)
+
+    def translate(self, text: str) -> Optional[str]:
+        return self.translate_many([text])[0]
+
+    def translate_many(self, texts: List[str],
+                       progress: Callable[[int], None] = None) -> List[Optional[str]]:
+        """
+        Übersetzt texts (Reihenfolge bleibt erhalten)
+
+        Args:
+            texts: Quelltexte
+            progress: Optional - wird mit der Anzahl fertiger Texte aufgerufen
+
+        Returns: Übersetzungen (Originale bei leeren Texten, None bei Fehlern)
+
+        Raises:
+            TranslationAborted: max_consecutive_failures Batches in Folge fehlgeschlagen
+        """
+        source, target = self.backend.source, self.backend.target
+        results: Dict[str, Optional[str]] = {}
+        pending = []
+
+        # Leere Texte, Duplikate und Cache-Treffer kosten keinen Request
+        for text in dict.fromkeys(texts):
+            if not text or len(text.strip()) < 2:
+                results[text] = text
+                continue
+            results[text] = self.cache.get(text, source, target)
+            if results[text] is None:
+                pending.append(text)
+
+        if progress:
+            pending_set = set(pending)
+            progress(sum(1 for text in texts if text not in pending_set))
+
+        # Zu lange Texte → Stücke an Satzgrenzen (Requests gehen pro Stück)
+        pieces = {text: split_long_text(text, self.max_batch_chars)
+                  for text in pending if len(text) >= self.max_batch_chars}
+        requests: Dict[str, List[str]] = {}
+        for text in pending:
+            for piece, _ in pieces.get(text, [(text, '')]):
+                if len(piece.strip()) >= 2:
+                    requests.setdefault(piece, []).append(text)
+        remaining = {text: sum(1 for piece, _ in pieces.get(text, [(text, '')])
+                               if len(piece.strip()) >= 2)
+                     for text in pending}
+        translations: Dict[str, Optional[str]] = {}
+
+        batches = self._make_batches(list(requests))
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for batch, translated in zip(batches, executor.map(self._translate_batch, batches)):
+                    # Fehlgeschlagene Batches bleiben None (und ungecacht)
+                    translations.update(zip(batch, translated or [None] * len(batch)))
+                    for piece, translation in zip(batch, translated or ()):
+                        self.cache.put(piece, translation, source, target)
+
+                    finished = 0
+                    for piece in batch:
+                        for text in requests[piece]:
+                            remaining[text] -= 1
+                            finished += remaining[text] == 0
+                    if progress:
+                        progress(finished)
+
+        for text in pending:
+            if text not in pieces:
+                results[text] = translations.get(text)
+                continue
+            chunks = [(translations.get(piece) if len(piece.strip()) >= 2 else piece, separator)
+                      for piece, separator in pieces[text]]
+            if all(chunk is not None for chunk, _ in chunks):
+                results[text] = ''.join(chunk + separator for chunk, separator in chunks)
+                self.cache.put(text, results[text], source, target)
+
+        if self.aborted:
+            raise TranslationAborted(f"{self.consecutive_failures} Batches in Folge fehlgeschlagen")
+
+        return [results[text] for text in texts]
+
+    def _make_batches(self, texts: List[str]) -> List[List[str]]:
+        """Gruppiert Texte (< max_batch_chars) nach Anzahl + Zeichen; Texte mit Zeilenumbruch einzeln"""
+        batches = []
+        current, current_chars = [], 0
+
+        for text in texts:
+            if BATCH_SEPARATOR in text or len(text) >= self.max_batch_chars:
+                batches.append([text])
+                continue
+
+            if current and (len(current) >= self.batch_size or
+                            current_chars + len(text) + 1 > self.max_batch_chars):
+                batches.append(current)
+                current, current_chars = [], 0
+
+            current.append(text)
+            current_chars += len(text) + 1
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def _translate_batch(self, batch: List[str]) -> Optional[List[str]]:
+        """Ein Request (mit Retry + Backoff); bei Dauerfehler oder Abbruch: None"""
+        for attempt in range(self.max_retries + 1):
+            if self.aborted:
+                return None
+            self.bucket.acquire()
+            try:
+                translated = self.backend.translate_batch(batch)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    for text in batch:
+                        self.errors.append({'text': text, 'error': str(e)})
+                    print(f"\n⚠️  Übersetzungsfehler ({len(batch)} Texte): {str(e)}")
+                    with self._failure_lock:
+                        self.consecutive_failures += 1
+                    return None
+
+                # Exponentieller Backoff mit Jitter
+                time.sleep(self.backoff_base * (2 ** attempt) * (0.5 + random.random()))
+            else:
+                with self._failure_lock:
+                    self.consecutive_failures = 0
+                return translated
+
+        return None
+
+
+def main():
+    """Offline-Check gegen das LocalBackend (kein Netzwerk nötig)"""
+    import tempfile
+    from pathlib import Path
+
+    print("=" * 70)
+    print("🌐 TRANSLATION ENGINE - OFFLINE CHECK")
+    print("=" * 70)
+
+    texts = [f"where are you {i} are you alone" for i in range(400)] + ["", "x"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = LocalBackend('en', 'de', latency=0.05, failure_rate=0.1)
+        cache = TranslationCache(Path(tmp) / 'cache.sqlite', translator_version=backend.version)
+        engine = TranslationEngine(backend, cache, requests_per_second=20, burst=4,
+                                   max_workers=4, batch_size=20, backoff_base=0.05)
+
+        start = time.time()
+        translated = engine.translate_many(texts)
+        elapsed = time.time() - start
+
+        print(f"✅ {len(texts)} Texte in {elapsed:.2f}s ({backend.requests} Requests)")
+        print(f"   Naiv (0.5s pro Text): {len(texts) * 0.5:.0f}s")
+        print(f"   Beispiel: {texts[0]!r} → {translated[0]!r}")
+        print(f"   Fehler nach Retries: {len(engine.errors)}")
+
+        requests_before = backend.requests
+        engine.translate_many(texts)
+        print(f"✅ Zweiter Lauf: {backend.requests - requests_before} Requests (Cache)")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()